@@ -0,0 +1,114 @@
+"""initial schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _base_columns():
+    return [
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    ]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'systems',
+        *_base_columns(),
+        sa.Column('name', sa.String(), nullable=False, unique=True),
+        sa.Column('description', sa.Text(), nullable=True),
+    )
+    op.create_index('ix_systems_id', 'systems', ['id'])
+
+    op.create_table(
+        'parties',
+        *_base_columns(),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('system_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('systems.id'), nullable=False),
+    )
+    op.create_index('ix_parties_id', 'parties', ['id'])
+
+    op.create_table(
+        'player_characters',
+        *_base_columns(),
+        sa.Column('user_id', sa.String(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('system_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('systems.id'), nullable=False),
+        sa.Column('party_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('parties.id'), nullable=True),
+    )
+    op.create_index('ix_player_characters_id', 'player_characters', ['id'])
+    op.create_index('ix_player_characters_user_id', 'player_characters', ['user_id'])
+
+    op.create_table(
+        'inventories',
+        *_base_columns(),
+        sa.Column('player_character_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('player_characters.id'), nullable=False),
+    )
+    op.create_index('ix_inventories_id', 'inventories', ['id'])
+
+    op.create_table(
+        'item_templates',
+        *_base_columns(),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('system_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('systems.id'), nullable=False),
+        sa.Column('party_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('parties.id'), nullable=True),
+        sa.Column('weight', sa.Numeric(precision=10, scale=2), nullable=True),
+        sa.Column('value', sa.Numeric(precision=10, scale=2), nullable=True),
+        sa.Column('rarity', sa.String(), nullable=True),
+        sa.Column('type', sa.String(), nullable=True),
+        sa.Column('tags', postgresql.JSONB(), nullable=True),
+    )
+    op.create_index('ix_item_templates_id', 'item_templates', ['id'])
+
+    op.create_table(
+        'inventory_items',
+        *_base_columns(),
+        sa.Column('inventory_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('inventories.id'), nullable=False),
+        sa.Column('item_template_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('item_templates.id'), nullable=False),
+        sa.Column('quantity', sa.Integer(), nullable=True),
+    )
+    op.create_index('ix_inventory_items_id', 'inventory_items', ['id'])
+
+    op.create_table(
+        'change_logs',
+        *_base_columns(),
+        sa.Column('user_id', sa.String(), nullable=False),
+        sa.Column('player_character_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('player_characters.id'), nullable=True),
+        sa.Column('inventory_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('inventories.id'), nullable=True),
+        sa.Column('inventory_item_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('inventory_items.id'), nullable=True),
+        sa.Column('action', sa.String(), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+    )
+    op.create_index('ix_change_logs_id', 'change_logs', ['id'])
+    op.create_index('ix_change_logs_user_id', 'change_logs', ['user_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('change_logs')
+    op.drop_table('inventory_items')
+    op.drop_table('item_templates')
+    op.drop_table('inventories')
+    op.drop_table('player_characters')
+    op.drop_table('parties')
+    op.drop_table('systems')
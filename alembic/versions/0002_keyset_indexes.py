@@ -0,0 +1,30 @@
+"""keyset pagination indexes on (created_at, id)
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 09:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, Sequence[str], None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_change_logs_created_at_id', 'change_logs', ['created_at', 'id'])
+    op.create_index('ix_inventory_items_created_at_id', 'inventory_items', ['created_at', 'id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_inventory_items_created_at_id', table_name='inventory_items')
+    op.drop_index('ix_change_logs_created_at_id', table_name='change_logs')
@@ -0,0 +1,32 @@
+"""item template catalog and inventory item lookup indexes
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, Sequence[str], None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_item_templates_system_id_updated_at', 'item_templates', ['system_id', 'updated_at'])
+    op.create_index('ix_item_templates_system_id_party_id', 'item_templates', ['system_id', 'party_id'])
+    op.create_index('ix_inventory_items_inventory_id', 'inventory_items', ['inventory_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_inventory_items_inventory_id', table_name='inventory_items')
+    op.drop_index('ix_item_templates_system_id_party_id', table_name='item_templates')
+    op.drop_index('ix_item_templates_system_id_updated_at', table_name='item_templates')
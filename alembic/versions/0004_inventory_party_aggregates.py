@@ -0,0 +1,66 @@
+"""inventory and party aggregate tables
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, Sequence[str], None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _aggregate_table(name: str, key: str, target: str) -> None:
+    op.create_table(
+        name,
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column(key, postgresql.UUID(as_uuid=True), sa.ForeignKey(target, ondelete='CASCADE'), nullable=False, unique=True),
+        sa.Column('total_weight', sa.Numeric(precision=14, scale=2), nullable=False, server_default='0'),
+        sa.Column('total_value', sa.Numeric(precision=14, scale=2), nullable=False, server_default='0'),
+        sa.Column('item_count', sa.Integer(), nullable=False, server_default='0'),
+    )
+    op.create_index(f'ix_{name}_id', name, ['id'])
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _aggregate_table('inventory_aggregates', 'inventory_id', 'inventories.id')
+    _aggregate_table('party_aggregates', 'party_id', 'parties.id')
+
+    # Backfill from the existing items, afterwards `python -m app.aggregates verify` should be clean
+    op.execute("""
+        INSERT INTO inventory_aggregates (id, inventory_id, total_weight, total_value, item_count)
+        SELECT gen_random_uuid(), ii.inventory_id,
+               sum(coalesce(ii.quantity, 0) * coalesce(t.weight, 0)),
+               sum(coalesce(ii.quantity, 0) * coalesce(t.value, 0)),
+               sum(coalesce(ii.quantity, 0))
+        FROM inventory_items ii JOIN item_templates t ON t.id = ii.item_template_id
+        GROUP BY ii.inventory_id
+    """)
+    op.execute("""
+        INSERT INTO party_aggregates (id, party_id, total_weight, total_value, item_count)
+        SELECT gen_random_uuid(), pc.party_id,
+               sum(ia.total_weight), sum(ia.total_value), sum(ia.item_count)
+        FROM inventory_aggregates ia
+        JOIN inventories i ON i.id = ia.inventory_id
+        JOIN player_characters pc ON pc.id = i.player_character_id
+        WHERE pc.party_id IS NOT NULL
+        GROUP BY pc.party_id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('party_aggregates')
+    op.drop_table('inventory_aggregates')
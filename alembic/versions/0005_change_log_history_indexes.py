@@ -0,0 +1,32 @@
+"""change log history indexes per character and inventory
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, Sequence[str], None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_change_logs_player_character_id_created_at', 'change_logs', ['player_character_id', 'created_at', 'id']
+    )
+    op.create_index('ix_change_logs_inventory_id_created_at', 'change_logs', ['inventory_id', 'created_at', 'id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_change_logs_inventory_id_created_at', table_name='change_logs')
+    op.drop_index('ix_change_logs_player_character_id_created_at', table_name='change_logs')
@@ -0,0 +1,161 @@
+"""optional monthly range partitioning of change_logs
+
+Only applied when asked for, the revision is a no-op otherwise:
+
+    alembic -x change_log_partitions=monthly upgrade head
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17 13:30:00.000000
+
+"""
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+from alembic import context, op
+from sqlalchemy import Connection, text
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, Sequence[str], None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# change_logs as of this revision. Frozen, down to the partition names and helpers below, which
+# app/changelog/change_log_partitions.py has its own copies of: later revisions change the table
+# with their own operations, which apply to the partitioned table just the same
+TABLE = "change_logs"
+
+# Same columns as ChangeLog, but the primary key has to include the partition key
+_CREATE_PARTITIONED_TABLE = """
+    CREATE TABLE change_logs (
+        id uuid NOT NULL,
+        created_at timestamptz NOT NULL DEFAULT now(),
+        updated_at timestamptz NOT NULL DEFAULT now(),
+        user_id varchar NOT NULL,
+        player_character_id uuid REFERENCES player_characters (id),
+        inventory_id uuid REFERENCES inventories (id),
+        inventory_item_id uuid REFERENCES inventory_items (id),
+        action varchar NOT NULL,
+        description text,
+        PRIMARY KEY (id, created_at)
+    ) PARTITION BY RANGE (created_at)
+"""
+
+_CREATE_UNPARTITIONED_TABLE = """
+    CREATE TABLE change_logs (
+        id uuid PRIMARY KEY,
+        created_at timestamptz NOT NULL DEFAULT now(),
+        updated_at timestamptz NOT NULL DEFAULT now(),
+        user_id varchar NOT NULL,
+        player_character_id uuid REFERENCES player_characters (id),
+        inventory_id uuid REFERENCES inventories (id),
+        inventory_item_id uuid REFERENCES inventory_items (id),
+        action varchar NOT NULL,
+        description text
+    )
+"""
+
+_COLUMN_LIST = ", ".join([
+    "id", "created_at", "updated_at", "user_id", "player_character_id", "inventory_id",
+    "inventory_item_id", "action", "description"
+])
+
+_INDEXES = [
+    "CREATE INDEX ix_change_logs_id ON change_logs (id)",
+    "CREATE INDEX ix_change_logs_user_id ON change_logs (user_id)",
+    "CREATE INDEX ix_change_logs_created_at_id ON change_logs (created_at, id)",
+    "CREATE INDEX ix_change_logs_player_character_id_created_at ON change_logs (player_character_id, created_at, id)",
+    "CREATE INDEX ix_change_logs_inventory_id_created_at ON change_logs (inventory_id, created_at, id)",
+]
+
+
+def _month_start(moment: datetime) -> datetime:
+    return datetime(moment.year, moment.month, 1, tzinfo=timezone.utc)
+
+
+def _next_month(moment: datetime) -> datetime:
+    return datetime(moment.year + moment.month // 12, moment.month % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def _add_months(moment: datetime, months: int) -> datetime:
+    for _ in range(months):
+        moment = _next_month(moment)
+    return moment
+
+
+def _is_partitioned(connection: Connection) -> bool:
+    return bool(connection.scalar(text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:table))"
+    ), {"table": TABLE}))
+
+
+def _create_monthly_partitions(connection: Connection, first: datetime, last: datetime) -> None:
+    """Partitions change_logs_yYYYYmMM of the freshly created table, the month of first to the month of last"""
+    start = _month_start(first)
+    while start <= last:
+        end = _next_month(start)
+        connection.execute(text(
+            f"CREATE TABLE {TABLE}_y{start.year:04d}m{start.month:02d} PARTITION OF {TABLE} "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        ))
+        start = end
+
+
+def _rename_out_of_the_way(connection: Connection, new_name: str) -> None:
+    """Rename change_logs and free the index names the rebuilt table is going to use"""
+    connection.execute(text(f"ALTER TABLE {TABLE} RENAME TO {new_name}"))
+    connection.execute(text(f"ALTER INDEX {TABLE}_pkey RENAME TO {new_name}_pkey"))
+    for index in _INDEXES:
+        connection.execute(text(f"DROP INDEX IF EXISTS {index.split()[2]}"))
+
+
+def _convert_to_partitioned(connection: Connection, months_ahead: int = 3) -> None:
+    """
+    Rebuild change_logs as a table range-partitioned by month on created_at, copying the rows over.
+    Rows outside the created partitions land in change_logs_default, so inserts never fail when
+    'python -m app.changelog create-partitions' has not run in time.
+    """
+    _rename_out_of_the_way(connection, f"{TABLE}_unpartitioned")
+    connection.execute(text(_CREATE_PARTITIONED_TABLE))
+
+    now = datetime.now(timezone.utc)
+    oldest = connection.scalar(text(f"SELECT min(created_at) FROM {TABLE}_unpartitioned")) or now
+    _create_monthly_partitions(connection, oldest, _add_months(now, months_ahead))
+    connection.execute(text(f"CREATE TABLE {TABLE}_default PARTITION OF {TABLE} DEFAULT"))
+
+    connection.execute(text(
+        f"INSERT INTO {TABLE} ({_COLUMN_LIST}) SELECT {_COLUMN_LIST} FROM {TABLE}_unpartitioned"
+    ))
+    connection.execute(text(f"DROP TABLE {TABLE}_unpartitioned"))
+    for index in _INDEXES:
+        connection.execute(text(index))
+
+
+def _convert_to_unpartitioned(connection: Connection) -> None:
+    """Undo _convert_to_partitioned, copying the rows of every partition back into a plain table"""
+    _rename_out_of_the_way(connection, f"{TABLE}_partitioned")
+    connection.execute(text(_CREATE_UNPARTITIONED_TABLE))
+    connection.execute(text(
+        f"INSERT INTO {TABLE} ({_COLUMN_LIST}) SELECT {_COLUMN_LIST} FROM {TABLE}_partitioned"
+    ))
+    connection.execute(text(f"DROP TABLE {TABLE}_partitioned"))  # Drops the partitions with it
+    for index in _INDEXES:
+        connection.execute(text(index))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if context.get_x_argument(as_dictionary=True).get('change_log_partitions') != 'monthly':
+        return
+    connection = op.get_bind()
+    if not _is_partitioned(connection):
+        _convert_to_partitioned(connection)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    connection = op.get_bind()
+    if _is_partitioned(connection):
+        _convert_to_unpartitioned(connection)
@@ -0,0 +1,46 @@
+"""item template search indexes: tags GIN, name/description trigram, range filters
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, Sequence[str], None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.create_index(
+        'ix_item_templates_tags', 'item_templates', ['tags'],
+        postgresql_using='gin', postgresql_ops={'tags': 'jsonb_path_ops'}
+    )
+    op.create_index(
+        'ix_item_templates_name_trgm', 'item_templates', ['name'],
+        postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}
+    )
+    op.create_index(
+        'ix_item_templates_description_trgm', 'item_templates', ['description'],
+        postgresql_using='gin', postgresql_ops={'description': 'gin_trgm_ops'}
+    )
+    op.create_index('ix_item_templates_system_id_type_weight', 'item_templates', ['system_id', 'type', 'weight'])
+    op.create_index('ix_item_templates_system_id_value', 'item_templates', ['system_id', 'value'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_item_templates_system_id_value', table_name='item_templates')
+    op.drop_index('ix_item_templates_system_id_type_weight', table_name='item_templates')
+    op.drop_index('ix_item_templates_description_trgm', table_name='item_templates')
+    op.drop_index('ix_item_templates_name_trgm', table_name='item_templates')
+    op.drop_index('ix_item_templates_tags', table_name='item_templates')
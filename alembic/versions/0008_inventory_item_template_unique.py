@@ -0,0 +1,56 @@
+"""one inventory item per template: merge duplicates, unique (inventory_id, item_template_id)
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0008'
+down_revision: Union[str, Sequence[str], None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Every item with the oldest item of its (inventory, template) pair and the pair's total quantity
+_RANKED = """
+    WITH ranked AS (
+        SELECT id,
+               first_value(id) OVER pair AS keep_id,
+               row_number() OVER pair AS position,
+               count(*) OVER (PARTITION BY inventory_id, item_template_id) AS items,
+               sum(coalesce(quantity, 0)) OVER (PARTITION BY inventory_id, item_template_id) AS total
+        FROM inventory_items
+        WINDOW pair AS (PARTITION BY inventory_id, item_template_id ORDER BY created_at, id)
+    )
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The totals stay the same, so the aggregates (and their triggers, when installed) remain correct
+    op.execute(_RANKED + """
+        UPDATE change_logs SET inventory_item_id = ranked.keep_id
+        FROM ranked WHERE change_logs.inventory_item_id = ranked.id AND ranked.position > 1
+    """)
+    op.execute(_RANKED + """
+        UPDATE inventory_items SET quantity = ranked.total
+        FROM ranked WHERE inventory_items.id = ranked.id AND ranked.position = 1 AND ranked.items > 1
+    """)
+    op.execute(_RANKED + """
+        DELETE FROM inventory_items USING ranked
+        WHERE inventory_items.id = ranked.id AND ranked.position > 1
+    """)
+    op.create_unique_constraint(
+        'uq_inventory_items_inventory_id_item_template_id', 'inventory_items', ['inventory_id', 'item_template_id']
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('uq_inventory_items_inventory_id_item_template_id', 'inventory_items', type_='unique')
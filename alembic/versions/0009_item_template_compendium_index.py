@@ -0,0 +1,32 @@
+"""item template (system_id, name) index for compendium import and export
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0009'
+down_revision: Union[str, Sequence[str], None] = '0008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Compendium imports match system-wide templates by name, exports read them in name order
+    op.create_index(
+        'ix_item_templates_system_id_name', 'item_templates', ['system_id', 'name'],
+        postgresql_where=sa.text('party_id IS NULL')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_item_templates_system_id_name', table_name='item_templates')
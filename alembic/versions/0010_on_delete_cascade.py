@@ -0,0 +1,66 @@
+"""ON DELETE CASCADE / SET NULL foreign keys and indexes on the referencing columns
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-17 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0010'
+down_revision: Union[str, Sequence[str], None] = '0009'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, column, referenced table, ondelete); the constraints have PostgreSQL's default names.
+# change_logs keep the entries of removed items, like apply_quantity_deltas does
+_FOREIGN_KEYS = [
+    ('parties', 'system_id', 'systems', 'CASCADE'),
+    ('player_characters', 'system_id', 'systems', 'CASCADE'),
+    ('player_characters', 'party_id', 'parties', 'CASCADE'),
+    ('inventories', 'player_character_id', 'player_characters', 'CASCADE'),
+    ('item_templates', 'system_id', 'systems', 'CASCADE'),
+    ('item_templates', 'party_id', 'parties', 'CASCADE'),
+    ('inventory_items', 'inventory_id', 'inventories', 'CASCADE'),
+    ('inventory_items', 'item_template_id', 'item_templates', 'CASCADE'),
+    ('change_logs', 'player_character_id', 'player_characters', 'CASCADE'),
+    ('change_logs', 'inventory_id', 'inventories', 'CASCADE'),
+    ('change_logs', 'inventory_item_id', 'inventory_items', 'SET NULL'),
+]
+
+# Without them every cascaded delete scans the referencing table
+_INDEXES = [
+    ('parties', 'system_id'),
+    ('player_characters', 'system_id'),
+    ('player_characters', 'party_id'),
+    ('inventories', 'player_character_id'),
+    ('item_templates', 'party_id'),
+    ('inventory_items', 'item_template_id'),
+    ('change_logs', 'inventory_item_id'),
+]
+
+
+def _replace_foreign_keys(ondelete: bool) -> None:
+    # Also fine when change_logs is partitioned (0006): the constraints of the parent cover its partitions
+    for table, column, referenced, action in _FOREIGN_KEYS:
+        name = f'{table}_{column}_fkey'
+        op.drop_constraint(name, table, type_='foreignkey')
+        op.create_foreign_key(name, table, referenced, [column], ['id'], ondelete=action if ondelete else None)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, column in _INDEXES:
+        op.create_index(f'ix_{table}_{column}', table, [column])
+    _replace_foreign_keys(ondelete=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _replace_foreign_keys(ondelete=False)
+    for table, column in _INDEXES:
+        op.drop_index(f'ix_{table}_{column}', table_name=table)
@@ -0,0 +1,57 @@
+"""structured change log deltas and inventory snapshots
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-17 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0011'
+down_revision: Union[str, Sequence[str], None] = '0010'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Also fine when change_logs is partitioned (0006): the partitions get the columns of the parent
+    op.add_column('change_logs', sa.Column('item_template_id', postgresql.UUID(as_uuid=True), nullable=True))
+    op.add_column('change_logs', sa.Column('quantity_delta', sa.Integer(), nullable=True))
+
+    op.create_table(
+        'inventory_snapshots',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('inventory_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('inventories.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('taken_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('kind', sa.String(), nullable=False),
+        sa.Column('items', postgresql.JSONB(), nullable=False),
+        sa.Column('change_count', sa.Integer(), nullable=False, server_default='0'),
+    )
+    op.create_index('ix_inventory_snapshots_id', 'inventory_snapshots', ['id'])
+    op.create_index('ix_inventory_snapshots_inventory_id_taken_at', 'inventory_snapshots', ['inventory_id', 'taken_at'])
+
+    # The existing entries carry no deltas, so reconstruction starts from the current contents
+    op.execute("""
+        INSERT INTO inventory_snapshots (id, inventory_id, taken_at, kind, items, change_count)
+        SELECT gen_random_uuid(), i.id, now(), 'baseline',
+               coalesce(jsonb_object_agg(ii.item_template_id::text, ii.quantity) FILTER (WHERE ii.quantity > 0), '{}'::jsonb),
+               0
+        FROM inventories i LEFT JOIN inventory_items ii ON ii.inventory_id = i.id
+        GROUP BY i.id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('inventory_snapshots')
+    op.drop_column('change_logs', 'quantity_delta')
+    op.drop_column('change_logs', 'item_template_id')
@@ -0,0 +1,25 @@
+from .aggregate_deltas import (
+    AggregateDelta,
+    apply_inventory_deltas,
+    apply_party_deltas,
+    apply_item_quantity_deltas,
+    apply_item_template_deltas
+)
+from .aggregate_hooks import register_aggregate_hooks, unregister_aggregate_hooks, aggregate_hooks_registered
+from .aggregate_triggers import install_triggers, drop_triggers
+from .aggregate_rebuild import verify_aggregates, rebuild_aggregates
+
+__all__ = [
+    "AggregateDelta",
+    "apply_inventory_deltas",
+    "apply_party_deltas",
+    "apply_item_quantity_deltas",
+    "apply_item_template_deltas",
+    "register_aggregate_hooks",
+    "unregister_aggregate_hooks",
+    "aggregate_hooks_registered",
+    "install_triggers",
+    "drop_triggers",
+    "verify_aggregates",
+    "rebuild_aggregates"
+]
@@ -0,0 +1,47 @@
+"""
+Maintenance commands for the inventory/party aggregates.
+
+    python -m app.aggregates verify            # report drift, exit code 1 when there is any
+    python -m app.aggregates rebuild           # recompute every aggregate from the items
+    python -m app.aggregates install-triggers  # for aggregate_mode=trigger
+    python -m app.aggregates drop-triggers
+"""
+import argparse
+import sys
+
+from app.db import get_engine
+from app.aggregates import verify_aggregates, rebuild_aggregates, install_triggers, drop_triggers
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.aggregates")
+    parser.add_argument("command", choices=["verify", "rebuild", "install-triggers", "drop-triggers"])
+    args = parser.parse_args()
+    engine = get_engine()
+
+    if args.command == "verify":
+        with engine.connect() as connection:
+            drift = verify_aggregates(connection)
+        labels = {"inventories": "inventory", "parties": "party"}
+        for kind, rows in drift.items():
+            for row in rows:
+                print(f"❌ {labels[kind]} {row['id']}: expected {row['expected']}, stored {row['stored']}")
+        total = sum(len(rows) for rows in drift.values())
+        print("✅ Aggregates are consistent" if total == 0 else f"⚠️  {total} aggregate rows drifted, run 'rebuild'")
+        return 0 if total == 0 else 1
+
+    with engine.begin() as connection:
+        if args.command == "rebuild":
+            counts = rebuild_aggregates(connection)
+            print(f"✅ Rebuilt {counts['inventories']} inventory and {counts['parties']} party aggregates")
+        elif args.command == "install-triggers":
+            install_triggers(connection)
+            print("✅ Aggregate triggers installed (set aggregate_mode=trigger)")
+        else:
+            drop_triggers(connection)
+            print("✅ Aggregate triggers dropped")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+import uuid
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Dict, Iterable, Mapping, Optional, Tuple, Type
+from uuid import UUID
+
+from sqlalchemy import Connection, select, func
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.dbmodels import BaseModel, Inventory, InventoryItem, ItemTemplate, PlayerCharacter, InventoryAggregate, PartyAggregate
+
+ZERO = Decimal("0")
+
+
+@dataclass
+class AggregateDelta:
+    """Change to apply to one aggregate row"""
+    weight: Decimal = ZERO
+    value: Decimal = ZERO
+    count: int = 0
+
+    def add(self, quantity: Optional[int], weight: Optional[Decimal], value: Optional[Decimal]) -> None:
+        quantity = quantity or 0
+        self.weight += quantity * (weight or ZERO)
+        self.value += quantity * (value or ZERO)
+        self.count += quantity
+
+    def merge(self, other: "AggregateDelta", sign: int = 1) -> None:
+        self.weight += sign * other.weight
+        self.value += sign * other.value
+        self.count += sign * other.count
+
+    def is_zero(self) -> bool:
+        return self.weight == ZERO and self.value == ZERO and self.count == 0
+
+
+def _upsert(connection: Connection, model: Type[BaseModel], key: str, deltas: Mapping[UUID, AggregateDelta]) -> None:
+    rows = [
+        {"id": uuid.uuid4(), key: target_id, "total_weight": delta.weight, "total_value": delta.value, "item_count": delta.count}
+        # Sorted so concurrent transactions lock aggregate rows in the same order
+        for target_id, delta in sorted(deltas.items(), key=lambda item: str(item[0]))
+        if not delta.is_zero()
+    ]
+    if not rows:
+        return
+    dialect_insert = sqlite.insert if connection.dialect.name == "sqlite" else postgresql.insert
+    stmt = dialect_insert(model).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[key],
+        set_={
+            "total_weight": model.total_weight + stmt.excluded.total_weight,
+            "total_value": model.total_value + stmt.excluded.total_value,
+            "item_count": model.item_count + stmt.excluded.item_count,
+            "updated_at": func.now(),
+        },
+    )
+    connection.execute(stmt)
+
+
+def parties_of_inventories(connection: Connection, inventory_ids: Iterable[UUID]) -> Dict[UUID, UUID]:
+    """Map inventory ids to the party of the owning character, inventories without a party are left out"""
+    stmt = (
+        select(Inventory.id, PlayerCharacter.party_id)
+        .join(PlayerCharacter, Inventory.player_character_id == PlayerCharacter.id)
+        .where(Inventory.id.in_(list(inventory_ids)), PlayerCharacter.party_id.is_not(None))
+    )
+    return {inventory_id: party_id for inventory_id, party_id in connection.execute(stmt)}
+
+
+def apply_party_deltas(connection: Connection, deltas: Mapping[UUID, AggregateDelta]) -> None:
+    _upsert(connection, PartyAggregate, "party_id", deltas)
+
+
+def apply_inventory_deltas(connection: Connection, deltas: Mapping[UUID, AggregateDelta]) -> None:
+    """Add the deltas to the inventory aggregates and roll them up into the party aggregates"""
+    deltas = {inventory_id: delta for inventory_id, delta in deltas.items() if not delta.is_zero()}
+    if not deltas:
+        return
+    _upsert(connection, InventoryAggregate, "inventory_id", deltas)
+
+    party_deltas: Dict[UUID, AggregateDelta] = {}
+    for inventory_id, party_id in parties_of_inventories(connection, deltas).items():
+        party_deltas.setdefault(party_id, AggregateDelta()).merge(deltas[inventory_id])
+    apply_party_deltas(connection, party_deltas)
+
+
+def apply_item_quantity_deltas(connection: Connection, deltas: Mapping[Tuple[UUID, UUID], int]) -> None:
+    """
+    Aggregate bookkeeping for quantity changes written with Core statements, which the flush hooks
+    never see. Keys are (inventory_id, item_template_id), values the quantity added (negative: removed)
+    """
+    item_template_ids = {item_template_id for _, item_template_id in deltas}
+    if not item_template_ids:
+        return
+    templates = {
+        item_template_id: (weight, value)
+        for item_template_id, weight, value in connection.execute(
+            select(ItemTemplate.id, ItemTemplate.weight, ItemTemplate.value).where(ItemTemplate.id.in_(item_template_ids))
+        )
+    }
+    inventory_deltas: Dict[UUID, AggregateDelta] = {}
+    for (inventory_id, item_template_id), quantity in deltas.items():
+        weight, value = templates.get(item_template_id, (None, None))
+        inventory_deltas.setdefault(inventory_id, AggregateDelta()).add(quantity, weight, value)
+    apply_inventory_deltas(connection, inventory_deltas)
+
+
+def apply_item_template_deltas(connection: Connection, deltas: Mapping[UUID, Tuple[Decimal, Decimal]]) -> None:
+    """
+    Aggregate bookkeeping for template weight/value changes written with Core statements. Keys are
+    item_template_ids, values the (weight, value) change, which applies to every item of the template
+    """
+    if not deltas:
+        return
+    stmt = (
+        select(InventoryItem.inventory_id, InventoryItem.item_template_id, func.sum(func.coalesce(InventoryItem.quantity, 0)))
+        .where(InventoryItem.item_template_id.in_(list(deltas)))
+        .group_by(InventoryItem.inventory_id, InventoryItem.item_template_id)
+    )
+    inventory_deltas: Dict[UUID, AggregateDelta] = {}
+    for inventory_id, item_template_id, quantity in connection.execute(stmt):
+        weight_change, value_change = deltas[item_template_id]
+        delta = inventory_deltas.setdefault(inventory_id, AggregateDelta())
+        delta.weight += quantity * weight_change
+        delta.value += quantity * value_change
+    apply_inventory_deltas(connection, inventory_deltas)
@@ -0,0 +1,155 @@
+import uuid
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Set, Tuple
+from uuid import UUID
+
+from sqlalchemy import event, inspect, select, func
+from sqlalchemy.orm import Session
+
+from app.aggregates.aggregate_deltas import AggregateDelta, apply_inventory_deltas, apply_party_deltas, ZERO
+from app.dbmodels import Inventory, InventoryItem, ItemTemplate, PlayerCharacter, InventoryAggregate
+
+_PENDING_KEY = "pending_aggregate_changes"
+
+
+@dataclass
+class _PendingAggregateChanges:
+    inventory_deltas: Dict[UUID, AggregateDelta] = field(default_factory=dict)
+    template_changes: Dict[UUID, Tuple[Decimal, Decimal]] = field(default_factory=dict)
+    changed_item_ids: Set[UUID] = field(default_factory=set)
+    party_moves: List[Tuple[UUID, Optional[UUID], Optional[UUID]]] = field(default_factory=list)
+
+    def delta(self, inventory_id: UUID) -> AggregateDelta:
+        return self.inventory_deltas.setdefault(inventory_id, AggregateDelta())
+
+    def __bool__(self) -> bool:
+        return bool(self.inventory_deltas or self.template_changes or self.party_moves)
+
+
+def _committed(obj: Any, attr: str) -> Any:
+    """Value of an attribute as it is in the database, before the pending changes"""
+    history = inspect(obj).attrs[attr].history
+    if history.deleted:
+        return history.deleted[0]
+    if history.unchanged:
+        return history.unchanged[0]
+    return getattr(obj, attr)
+
+
+def _template_values(session: Session, item_template_id: UUID, committed: bool) -> Tuple[Optional[Decimal], Optional[Decimal]]:
+    item_template = session.get(ItemTemplate, item_template_id)
+    if item_template is None:
+        return None, None
+    if committed:
+        return _committed(item_template, "weight"), _committed(item_template, "value")
+    return item_template.weight, item_template.value
+
+
+def _subtract_committed_item(session: Session, pending: _PendingAggregateChanges, inventory_item: InventoryItem) -> None:
+    weight, value = _template_values(session, _committed(inventory_item, "item_template_id"), committed=True)
+    quantity = _committed(inventory_item, "quantity") or 0
+    pending.delta(_committed(inventory_item, "inventory_id")).add(-quantity, weight, value)
+
+
+def _before_flush(session: Session, flush_context, instances) -> None:
+    """Collect the aggregate deltas of this flush while the old attribute values are still known"""
+    pending = _PendingAggregateChanges()
+
+    for obj in session.new:
+        if isinstance(obj, InventoryItem):
+            weight, value = _template_values(session, obj.item_template_id, committed=False)
+            quantity = 1 if obj.quantity is None else obj.quantity  # Column default
+            pending.delta(obj.inventory_id).add(quantity, weight, value)
+            # Already counted at its template's new weight/value. The id column default only fires
+            # on insert, so give it the id now to keep it out of the template changes below
+            if obj.id is None:
+                obj.id = uuid.uuid4()
+            pending.changed_item_ids.add(obj.id)
+
+    for obj in session.dirty:
+        if not session.is_modified(obj, include_collections=False):
+            continue
+        if isinstance(obj, InventoryItem):
+            _subtract_committed_item(session, pending, obj)
+            weight, value = _template_values(session, obj.item_template_id, committed=False)
+            pending.delta(obj.inventory_id).add(obj.quantity, weight, value)
+            pending.changed_item_ids.add(obj.id)
+        elif isinstance(obj, ItemTemplate):
+            weight_change = (obj.weight or ZERO) - (_committed(obj, "weight") or ZERO)
+            value_change = (obj.value or ZERO) - (_committed(obj, "value") or ZERO)
+            if weight_change != ZERO or value_change != ZERO:
+                pending.template_changes[obj.id] = (weight_change, value_change)
+        elif isinstance(obj, PlayerCharacter):
+            old_party_id = _committed(obj, "party_id")
+            if old_party_id != obj.party_id:
+                pending.party_moves.append((obj.id, old_party_id, obj.party_id))
+
+    for obj in session.deleted:
+        if isinstance(obj, InventoryItem):
+            _subtract_committed_item(session, pending, obj)
+            pending.changed_item_ids.add(obj.id)
+
+    if pending:
+        session.info[_PENDING_KEY] = pending
+
+
+def _after_flush(session: Session, flush_context) -> None:
+    """Write the collected deltas in the same transaction as the flush"""
+    pending: Optional[_PendingAggregateChanges] = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    connection = session.connection()
+
+    # Party moves first: the stored inventory totals do not include this flush's item deltas yet,
+    # which are rolled up into the character's new party below
+    for player_character_id, old_party_id, new_party_id in pending.party_moves:
+        totals = connection.execute(
+            select(InventoryAggregate.total_weight, InventoryAggregate.total_value, InventoryAggregate.item_count)
+            .join(Inventory, Inventory.id == InventoryAggregate.inventory_id)
+            .where(Inventory.player_character_id == player_character_id)
+        ).first()
+        if totals is None:
+            continue
+        moved = AggregateDelta(*totals)
+        party_deltas: Dict[UUID, AggregateDelta] = {}
+        if old_party_id is not None:
+            party_deltas[old_party_id] = AggregateDelta()
+            party_deltas[old_party_id].merge(moved, sign=-1)
+        if new_party_id is not None:
+            party_deltas.setdefault(new_party_id, AggregateDelta()).merge(moved)
+        apply_party_deltas(connection, party_deltas)
+
+    # Template weight/value changes apply to every item of that template not already counted above
+    for item_template_id, (weight_change, value_change) in pending.template_changes.items():
+        stmt = (
+            select(InventoryItem.inventory_id, func.sum(func.coalesce(InventoryItem.quantity, 0)))
+            .where(InventoryItem.item_template_id == item_template_id)
+            .group_by(InventoryItem.inventory_id)
+        )
+        if pending.changed_item_ids:
+            stmt = stmt.where(InventoryItem.id.not_in(pending.changed_item_ids))
+        for inventory_id, quantity in connection.execute(stmt):
+            delta = pending.delta(inventory_id)
+            delta.weight += quantity * weight_change
+            delta.value += quantity * value_change
+
+    apply_inventory_deltas(connection, pending.inventory_deltas)
+
+
+def register_aggregate_hooks() -> None:
+    """Maintain the aggregates from flush events of every Session (async sessions included)"""
+    if not event.contains(Session, "before_flush", _before_flush):
+        event.listen(Session, "before_flush", _before_flush)
+        event.listen(Session, "after_flush", _after_flush)
+
+
+def aggregate_hooks_registered() -> bool:
+    """Whether writes that bypass the ORM have to apply their aggregate deltas themselves"""
+    return event.contains(Session, "before_flush", _before_flush)
+
+
+def unregister_aggregate_hooks() -> None:
+    if event.contains(Session, "before_flush", _before_flush):
+        event.remove(Session, "before_flush", _before_flush)
+        event.remove(Session, "after_flush", _after_flush)
@@ -0,0 +1,83 @@
+import uuid
+from decimal import Decimal
+from typing import Dict, List, Tuple, Type
+from uuid import UUID
+
+from sqlalchemy import Connection, select, func, delete, insert, text
+
+from app.dbmodels import BaseModel, Inventory, InventoryItem, ItemTemplate, PlayerCharacter, InventoryAggregate, PartyAggregate
+
+Totals = Tuple[Decimal, Decimal, int]
+
+
+def _item_totals_select():
+    quantity = func.coalesce(InventoryItem.quantity, 0)
+    return select(
+        func.coalesce(func.sum(quantity * func.coalesce(ItemTemplate.weight, 0)), 0),
+        func.coalesce(func.sum(quantity * func.coalesce(ItemTemplate.value, 0)), 0),
+        func.coalesce(func.sum(quantity), 0),
+    ).join(ItemTemplate, InventoryItem.item_template_id == ItemTemplate.id)
+
+
+def compute_inventory_totals(connection: Connection) -> Dict[UUID, Totals]:
+    """Totals per inventory computed from scratch with one GROUP BY"""
+    stmt = _item_totals_select().add_columns(InventoryItem.inventory_id).group_by(InventoryItem.inventory_id)
+    return {row[3]: (Decimal(row[0]), Decimal(row[1]), int(row[2])) for row in connection.execute(stmt)}
+
+
+def compute_party_totals(connection: Connection) -> Dict[UUID, Totals]:
+    """Totals per party computed from scratch with one GROUP BY"""
+    stmt = (
+        _item_totals_select()
+        .add_columns(PlayerCharacter.party_id)
+        .join(Inventory, InventoryItem.inventory_id == Inventory.id)
+        .join(PlayerCharacter, Inventory.player_character_id == PlayerCharacter.id)
+        .where(PlayerCharacter.party_id.is_not(None))
+        .group_by(PlayerCharacter.party_id)
+    )
+    return {row[3]: (Decimal(row[0]), Decimal(row[1]), int(row[2])) for row in connection.execute(stmt)}
+
+
+def _stored_totals(connection: Connection, model: Type[BaseModel], key: str) -> Dict[UUID, Totals]:
+    stmt = select(getattr(model, key), model.total_weight, model.total_value, model.item_count)
+    return {row[0]: (Decimal(row[1]), Decimal(row[2]), int(row[3])) for row in connection.execute(stmt)}
+
+
+def _drift(expected: Dict[UUID, Totals], stored: Dict[UUID, Totals]) -> List[Dict]:
+    zero: Totals = (Decimal(0), Decimal(0), 0)
+    drift = []
+    for target_id in sorted(set(expected) | set(stored), key=str):
+        want, have = expected.get(target_id, zero), stored.get(target_id, zero)
+        if want != have:
+            drift.append({"id": str(target_id), "expected": want, "stored": have})
+    return drift
+
+
+def verify_aggregates(connection: Connection) -> Dict[str, List[Dict]]:
+    """Compare the stored aggregates with freshly computed totals, returning every row that drifted"""
+    return {
+        "inventories": _drift(compute_inventory_totals(connection), _stored_totals(connection, InventoryAggregate, "inventory_id")),
+        "parties": _drift(compute_party_totals(connection), _stored_totals(connection, PartyAggregate, "party_id")),
+    }
+
+
+def _replace(connection: Connection, model: Type[BaseModel], key: str, totals: Dict[UUID, Totals]) -> None:
+    connection.execute(delete(model))
+    rows = [
+        {"id": uuid.uuid4(), key: target_id, "total_weight": weight, "total_value": value, "item_count": count}
+        for target_id, (weight, value, count) in totals.items()
+    ]
+    if rows:
+        connection.execute(insert(model), rows)
+
+
+def rebuild_aggregates(connection: Connection) -> Dict[str, int]:
+    """Recompute all aggregates; run inside a transaction so readers never see them half rebuilt"""
+    if connection.dialect.name == "postgresql":
+        # Block concurrent item writes (and their aggregate updates) until the rebuild commits
+        connection.execute(text("LOCK TABLE inventory_items, inventory_aggregates, party_aggregates IN SHARE ROW EXCLUSIVE MODE"))
+    inventory_totals = compute_inventory_totals(connection)
+    party_totals = compute_party_totals(connection)
+    _replace(connection, InventoryAggregate, "inventory_id", inventory_totals)
+    _replace(connection, PartyAggregate, "party_id", party_totals)
+    return {"inventories": len(inventory_totals), "parties": len(party_totals)}
@@ -0,0 +1,165 @@
+from sqlalchemy import Connection, text
+
+# PostgreSQL triggers doing the same bookkeeping as aggregate_hooks, for writes that do not go
+# through the ORM (psql, COPY, other services). Use them instead of the hooks, not together with them.
+INSTALL_STATEMENTS = [
+    """
+    CREATE OR REPLACE FUNCTION party_aggregates_apply(p_party_id uuid, p_weight numeric, p_value numeric, p_count integer)
+    RETURNS void AS $$
+    BEGIN
+        IF p_party_id IS NULL OR (p_weight = 0 AND p_value = 0 AND p_count = 0) THEN
+            RETURN;
+        END IF;
+        -- Deleted in this statement (ON DELETE CASCADE), its aggregate went with it
+        IF NOT EXISTS (SELECT 1 FROM parties WHERE id = p_party_id) THEN
+            RETURN;
+        END IF;
+        INSERT INTO party_aggregates (id, party_id, total_weight, total_value, item_count, created_at, updated_at)
+        VALUES (gen_random_uuid(), p_party_id, p_weight, p_value, p_count, now(), now())
+        ON CONFLICT (party_id) DO UPDATE SET
+            total_weight = party_aggregates.total_weight + EXCLUDED.total_weight,
+            total_value = party_aggregates.total_value + EXCLUDED.total_value,
+            item_count = party_aggregates.item_count + EXCLUDED.item_count,
+            updated_at = now();
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION inventory_aggregates_apply(p_inventory_id uuid, p_weight numeric, p_value numeric, p_count integer)
+    RETURNS void AS $$
+    DECLARE
+        v_party_id uuid;
+    BEGIN
+        IF p_weight = 0 AND p_value = 0 AND p_count = 0 THEN
+            RETURN;
+        END IF;
+        -- Deleted in this statement (ON DELETE CASCADE), its aggregate went with it
+        IF NOT EXISTS (SELECT 1 FROM inventories WHERE id = p_inventory_id) THEN
+            RETURN;
+        END IF;
+        INSERT INTO inventory_aggregates (id, inventory_id, total_weight, total_value, item_count, created_at, updated_at)
+        VALUES (gen_random_uuid(), p_inventory_id, p_weight, p_value, p_count, now(), now())
+        ON CONFLICT (inventory_id) DO UPDATE SET
+            total_weight = inventory_aggregates.total_weight + EXCLUDED.total_weight,
+            total_value = inventory_aggregates.total_value + EXCLUDED.total_value,
+            item_count = inventory_aggregates.item_count + EXCLUDED.item_count,
+            updated_at = now();
+
+        SELECT pc.party_id INTO v_party_id
+        FROM inventories i JOIN player_characters pc ON pc.id = i.player_character_id
+        WHERE i.id = p_inventory_id;
+        PERFORM party_aggregates_apply(v_party_id, p_weight, p_value, p_count);
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION inventory_items_aggregate_trigger() RETURNS trigger AS $$
+    DECLARE
+        v_weight numeric;
+        v_value numeric;
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            SELECT coalesce(weight, 0), coalesce(value, 0) INTO v_weight, v_value
+            FROM item_templates WHERE id = OLD.item_template_id;
+            PERFORM inventory_aggregates_apply(
+                OLD.inventory_id,
+                -coalesce(OLD.quantity, 0) * coalesce(v_weight, 0),
+                -coalesce(OLD.quantity, 0) * coalesce(v_value, 0),
+                -coalesce(OLD.quantity, 0)
+            );
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            SELECT coalesce(weight, 0), coalesce(value, 0) INTO v_weight, v_value
+            FROM item_templates WHERE id = NEW.item_template_id;
+            PERFORM inventory_aggregates_apply(
+                NEW.inventory_id,
+                coalesce(NEW.quantity, 0) * coalesce(v_weight, 0),
+                coalesce(NEW.quantity, 0) * coalesce(v_value, 0),
+                coalesce(NEW.quantity, 0)
+            );
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION item_templates_aggregate_trigger() RETURNS trigger AS $$
+    DECLARE
+        r record;
+    BEGIN
+        FOR r IN
+            SELECT inventory_id, sum(coalesce(quantity, 0)) AS quantity
+            FROM inventory_items WHERE item_template_id = NEW.id
+            GROUP BY inventory_id ORDER BY inventory_id
+        LOOP
+            PERFORM inventory_aggregates_apply(
+                r.inventory_id,
+                r.quantity * (coalesce(NEW.weight, 0) - coalesce(OLD.weight, 0)),
+                r.quantity * (coalesce(NEW.value, 0) - coalesce(OLD.value, 0)),
+                0
+            );
+        END LOOP;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION player_characters_aggregate_trigger() RETURNS trigger AS $$
+    DECLARE
+        a record;
+    BEGIN
+        SELECT ia.total_weight, ia.total_value, ia.item_count INTO a
+        FROM inventory_aggregates ia JOIN inventories i ON i.id = ia.inventory_id
+        WHERE i.player_character_id = NEW.id;
+        IF FOUND THEN
+            PERFORM party_aggregates_apply(OLD.party_id, -a.total_weight, -a.total_value, -a.item_count);
+            PERFORM party_aggregates_apply(NEW.party_id, a.total_weight, a.total_value, a.item_count);
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS inventory_items_aggregate ON inventory_items",
+    """
+    CREATE TRIGGER inventory_items_aggregate
+    AFTER INSERT OR DELETE OR UPDATE OF quantity, inventory_id, item_template_id ON inventory_items
+    FOR EACH ROW EXECUTE FUNCTION inventory_items_aggregate_trigger()
+    """,
+    "DROP TRIGGER IF EXISTS item_templates_aggregate ON item_templates",
+    """
+    CREATE TRIGGER item_templates_aggregate
+    AFTER UPDATE OF weight, value ON item_templates
+    FOR EACH ROW
+    WHEN (OLD.weight IS DISTINCT FROM NEW.weight OR OLD.value IS DISTINCT FROM NEW.value)
+    EXECUTE FUNCTION item_templates_aggregate_trigger()
+    """,
+    "DROP TRIGGER IF EXISTS player_characters_aggregate ON player_characters",
+    """
+    CREATE TRIGGER player_characters_aggregate
+    AFTER UPDATE OF party_id ON player_characters
+    FOR EACH ROW
+    WHEN (OLD.party_id IS DISTINCT FROM NEW.party_id)
+    EXECUTE FUNCTION player_characters_aggregate_trigger()
+    """,
+]
+
+DROP_STATEMENTS = [
+    "DROP TRIGGER IF EXISTS inventory_items_aggregate ON inventory_items",
+    "DROP TRIGGER IF EXISTS item_templates_aggregate ON item_templates",
+    "DROP TRIGGER IF EXISTS player_characters_aggregate ON player_characters",
+    "DROP FUNCTION IF EXISTS inventory_items_aggregate_trigger()",
+    "DROP FUNCTION IF EXISTS item_templates_aggregate_trigger()",
+    "DROP FUNCTION IF EXISTS player_characters_aggregate_trigger()",
+    "DROP FUNCTION IF EXISTS inventory_aggregates_apply(uuid, numeric, numeric, integer)",
+    "DROP FUNCTION IF EXISTS party_aggregates_apply(uuid, numeric, numeric, integer)",
+]
+
+
+def install_triggers(connection: Connection) -> None:
+    for statement in INSTALL_STATEMENTS:
+        connection.execute(text(statement))
+
+
+def drop_triggers(connection: Connection) -> None:
+    for statement in DROP_STATEMENTS:
+        connection.execute(text(statement))
@@ -1,7 +1,67 @@
-from app.apimodels.api_system import APISystem, APISystemResponse
+from app.apimodels.api_base import APIPage, APIBatchError, APIImportRowError, APIAggregateTotals
+from app.apimodels.api_system import APISystem, APISystemResponse, APISystemBatchResponse
+from app.apimodels.api_item_template import (
+    APIItemTemplate,
+    APIItemTemplateResponse,
+    APIItemTemplateSearch,
+    APIItemTemplateImportRow,
+    APIItemTemplateImportReport
+)
+from app.apimodels.api_inventory_item import (
+    APIInventoryItem,
+    APIInventoryItemUpdate,
+    APIInventoryItemResponse,
+    APIQuantityAdjustment,
+    APIItemTransfer,
+    APIInventoryTransfer,
+    APIInventoryItemQuantity
+)
+from app.apimodels.api_inventory import APIInventoryResponse, APIInventoryItemAsOf, APIInventoryAsOfResponse
+from app.apimodels.api_player_character import APIPlayerCharacterResponse, APICharacterSheetResponse
+from app.apimodels.api_party import APIPartyResponse, APIPartyOverviewResponse
+from app.apimodels.api_change_log import APIChangeLogResponse
+from app.apimodels.api_batch import (
+    BATCH_MAX_OPERATIONS,
+    APIBatchOperation,
+    APIBatchRequest,
+    APIBatchOperationResult,
+    APIBatchResponse
+)
+from app.apimodels.api_purge import APIPurgeJob, APIDeleteResponse
 
 __all__ = [
+    "APIPage",
+    "APIBatchError",
+    "APIImportRowError",
+    "APIAggregateTotals",
     "APISystem",
-    "APISystemResponse"
+    "APISystemResponse",
+    "APISystemBatchResponse",
+    "APIItemTemplate",
+    "APIItemTemplateResponse",
+    "APIItemTemplateSearch",
+    "APIItemTemplateImportRow",
+    "APIItemTemplateImportReport",
+    "APIInventoryItem",
+    "APIInventoryItemUpdate",
+    "APIInventoryItemResponse",
+    "APIQuantityAdjustment",
+    "APIItemTransfer",
+    "APIInventoryTransfer",
+    "APIInventoryItemQuantity",
+    "APIInventoryResponse",
+    "APIInventoryItemAsOf",
+    "APIInventoryAsOfResponse",
+    "APIPlayerCharacterResponse",
+    "APICharacterSheetResponse",
+    "APIPartyResponse",
+    "APIPartyOverviewResponse",
+    "APIChangeLogResponse",
+    "BATCH_MAX_OPERATIONS",
+    "APIBatchOperation",
+    "APIBatchRequest",
+    "APIBatchOperationResult",
+    "APIBatchResponse",
+    "APIPurgeJob",
+    "APIDeleteResponse"
 ]
-
@@ -0,0 +1,26 @@
+from decimal import Decimal
+from typing import Generic, List, Optional, TypeVar
+from pydantic import BaseModel
+
+ItemType = TypeVar("ItemType")
+
+
+class APIPage(BaseModel, Generic[ItemType]):
+    items: List[ItemType]
+    next_cursor: Optional[str] = None
+
+
+class APIBatchError(BaseModel):
+    index: int
+    errors: List[str]
+
+
+class APIAggregateTotals(BaseModel):
+    total_weight: Decimal
+    total_value: Decimal
+    item_count: int
+
+
+class APIImportRowError(BaseModel):
+    line: int  # Line of the row in the import file
+    errors: List[str]
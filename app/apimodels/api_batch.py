@@ -0,0 +1,34 @@
+from typing import Any, Dict, List, Literal, Optional
+from pydantic import BaseModel, Field
+
+BATCH_MAX_OPERATIONS = 500
+
+
+class APIBatchOperation(BaseModel):
+    """
+    One call of a batch, named and shaped like its route: op "add-item" with params
+    {"inventory_id": ...} and the route's request body. Any string "$<step>.<path>" in params or
+    body is replaced by a value from the result of an earlier step, given by its index or ref,
+    e.g. "$sword.id" or "$0.id"
+    """
+    op: str
+    ref: Optional[str] = Field(None, pattern=r"^[A-Za-z_][A-Za-z0-9_-]*$")
+    params: Dict[str, Any] = Field(default_factory=dict)
+    body: Any = None
+
+
+class APIBatchRequest(BaseModel):
+    operations: List[APIBatchOperation] = Field(min_length=1, max_length=BATCH_MAX_OPERATIONS)
+
+
+class APIBatchOperationResult(BaseModel):
+    index: int
+    ref: Optional[str] = None
+    status: Literal["ok", "failed", "skipped"]  # Steps after a failed one are skipped
+    result: Any = None
+    error: Optional[str] = None
+
+
+class APIBatchResponse(BaseModel):
+    committed: bool  # False: a step failed and nothing of the batch was written
+    results: List[APIBatchOperationResult]
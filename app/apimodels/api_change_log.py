@@ -0,0 +1,17 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+from pydantic import BaseModel
+
+
+class APIChangeLogResponse(BaseModel):
+    id: UUID
+    created_at: datetime
+    user_id: str
+    player_character_id: Optional[UUID] = None
+    inventory_id: Optional[UUID] = None
+    inventory_item_id: Optional[UUID] = None
+    action: str
+    description: Optional[str] = None
+    item_template_id: Optional[UUID] = None
+    quantity_delta: Optional[int] = None  # Change of the quantity of item_template_id in the inventory
@@ -0,0 +1,29 @@
+from datetime import datetime
+from typing import List, Optional
+from uuid import UUID
+from pydantic import BaseModel
+
+from app.apimodels.api_inventory_item import APIInventoryItemResponse
+from app.apimodels.api_item_template import APIItemTemplateResponse
+
+
+class APIInventoryResponse(BaseModel):
+    id: UUID
+    player_character_id: UUID
+    items: List[APIInventoryItemResponse]
+
+
+class APIInventoryItemAsOf(BaseModel):
+    item_template_id: UUID
+    quantity: int
+    item_template: Optional[APIItemTemplateResponse] = None  # None when the template was deleted since
+
+
+class APIInventoryAsOfResponse(BaseModel):
+    """What an inventory held at as_of, reconstructed from a snapshot and the change log"""
+    id: UUID
+    player_character_id: UUID
+    as_of: datetime
+    snapshot_taken_at: Optional[datetime] = None  # None when replayed from the creation of the inventory
+    replayed_changes: int
+    items: List[APIInventoryItemAsOf]
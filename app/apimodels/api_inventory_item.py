@@ -0,0 +1,46 @@
+from typing import List, Optional
+from uuid import UUID
+from pydantic import BaseModel, Field
+
+from app.apimodels.api_item_template import APIItemTemplateResponse
+
+
+class APIInventoryItemResponse(BaseModel):
+    id: UUID
+    inventory_id: UUID
+    item_template_id: UUID
+    quantity: Optional[int] = None
+    item_template: Optional[APIItemTemplateResponse] = None
+
+
+class APIInventoryItem(BaseModel):
+    item_template_id: UUID
+    quantity: int = Field(1, ge=1)
+
+
+class APIInventoryItemUpdate(BaseModel):
+    quantity: int = Field(ge=1)
+
+
+class APIQuantityAdjustment(BaseModel):
+    item_template_id: UUID
+    quantity_delta: int  # Negative takes items out, the item is removed when its quantity reaches zero
+
+
+class APIItemTransfer(BaseModel):
+    from_inventory_id: UUID
+    to_inventory_id: UUID
+    item_template_id: UUID
+    quantity: int = Field(1, ge=1)
+
+
+class APIInventoryTransfer(BaseModel):
+    """Moves applied together: either all of them happen or none do"""
+    transfers: List[APIItemTransfer] = Field(min_length=1)
+
+
+class APIInventoryItemQuantity(BaseModel):
+    id: Optional[UUID] = None  # None when the quantity reached zero and the item was removed
+    inventory_id: UUID
+    item_template_id: UUID
+    quantity: int
@@ -0,0 +1,67 @@
+from decimal import Decimal
+from typing import List, Optional
+from uuid import UUID
+from pydantic import BaseModel, Field
+
+from app.apimodels.api_base import APIImportRowError
+
+
+class APIItemTemplate(BaseModel):
+    name: str
+    description: Optional[str] = None
+    system_id: UUID
+    party_id: Optional[UUID] = None
+    weight: Optional[Decimal] = None
+    value: Optional[Decimal] = None
+    rarity: Optional[str] = None
+    type: Optional[str] = None
+    tags: Optional[List[str]] = None
+
+
+class APIItemTemplateResponse(BaseModel):
+    id: UUID
+    name: str
+    description: Optional[str] = None
+    system_id: UUID
+    party_id: Optional[UUID] = None
+    weight: Optional[Decimal] = None
+    value: Optional[Decimal] = None
+    rarity: Optional[str] = None
+    type: Optional[str] = None
+    tags: Optional[List[str]] = None
+
+
+class APIItemTemplateSearch(BaseModel):
+    """Query parameters of /item-template/search, all filters are combined with AND"""
+    system_id: UUID
+    party_id: Optional[UUID] = None  # Adds the party's own templates to the system-wide ones
+    q: Optional[str] = Field(None, min_length=3)  # Substring of name or description, trigrams need 3 characters
+    tags: List[str] = []  # Templates having all of these tags
+    type: List[str] = []  # Any of these types
+    rarity: List[str] = []  # Any of these rarities
+    min_weight: Optional[Decimal] = None
+    max_weight: Optional[Decimal] = None
+    min_value: Optional[Decimal] = None
+    max_value: Optional[Decimal] = None
+    limit: int = Field(50, ge=1, le=200)
+    cursor: Optional[str] = None
+
+
+class APIItemTemplateImportRow(BaseModel):
+    """One row of a compendium import (CSV or JSONL), imported into the system of the request"""
+    name: str = Field(min_length=1)
+    description: Optional[str] = None
+    weight: Optional[Decimal] = Field(None, max_digits=10, decimal_places=2)
+    value: Optional[Decimal] = Field(None, max_digits=10, decimal_places=2)
+    rarity: Optional[str] = None
+    type: Optional[str] = None
+    tags: Optional[List[str]] = None
+
+
+class APIItemTemplateImportReport(BaseModel):
+    rows: int  # Rows read from the file
+    inserted: int
+    updated: int
+    unchanged: int
+    failed: int  # Rows not imported, errors lists the first of them with their line
+    errors: List[APIImportRowError]
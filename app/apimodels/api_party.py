@@ -0,0 +1,16 @@
+from typing import List, Optional
+from uuid import UUID
+from pydantic import BaseModel
+
+from app.apimodels.api_player_character import APICharacterSheetResponse
+
+
+class APIPartyResponse(BaseModel):
+    id: UUID
+    name: str
+    description: Optional[str] = None
+    system_id: UUID
+
+
+class APIPartyOverviewResponse(APIPartyResponse):
+    player_characters: List[APICharacterSheetResponse]
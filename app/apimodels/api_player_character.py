@@ -0,0 +1,18 @@
+from typing import Optional
+from uuid import UUID
+from pydantic import BaseModel
+
+from app.apimodels.api_inventory import APIInventoryResponse
+
+
+class APIPlayerCharacterResponse(BaseModel):
+    id: UUID
+    user_id: str
+    name: str
+    description: Optional[str] = None
+    system_id: UUID
+    party_id: Optional[UUID] = None
+
+
+class APICharacterSheetResponse(APIPlayerCharacterResponse):
+    inventory: Optional[APIInventoryResponse] = None
@@ -0,0 +1,23 @@
+from datetime import datetime
+from typing import Dict, Literal, Optional
+from uuid import UUID
+from pydantic import BaseModel
+
+
+class APIPurgeJob(BaseModel):
+    id: UUID
+    kind: Literal["system", "party", "player-character", "item-template"]
+    root_id: UUID
+    status: Literal["queued", "running", "done", "failed", "cancelled"]  # Cancelled: the worker stopped
+    total_rows: Dict[str, int]  # Per table, counted when the job started
+    deleted_rows: Dict[str, int]
+    progress: float  # 0.0 - 1.0
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
+
+
+class APIDeleteResponse(BaseModel):
+    deleted: bool  # False: too big to delete in the request, purge_job is removing it
+    deleted_rows: Dict[str, int]  # Per table, when deleted right away
+    purge_job: Optional[APIPurgeJob] = None
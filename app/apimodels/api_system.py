@@ -1,6 +1,9 @@
+from typing import List
 from uuid import UUID
 from pydantic import BaseModel
 
+from app.apimodels.api_base import APIBatchError
+
 
 class APISystem(BaseModel):
     name: str
@@ -11,3 +14,8 @@ class APISystemResponse(BaseModel):
     id: UUID
     name: str
     description: str
+
+
+class APISystemBatchResponse(BaseModel):
+    created: List[APISystemResponse]
+    errors: List[APIBatchError]
@@ -0,0 +1,27 @@
+from app.settings import CacheSettings, CoalescingSettings
+from .cache_backends import CacheBackend, InMemoryLRUCache, RedisCacheBackend, build_cache_backend
+from .template_catalog_cache import TemplateCatalogCache
+from .single_flight import SingleFlight
+from .request_coalescer import RequestCoalescer
+
+cache_settings = CacheSettings.from_env()
+
+# Shared by all requests of this process (and by all workers when the backend is Redis)
+template_catalog_cache = TemplateCatalogCache(build_cache_backend(cache_settings), cache_settings.ttl_seconds)
+
+# Identical concurrent reads of this process share one query, see get_request_coalescer
+coalescing_settings = CoalescingSettings.from_env()
+single_flight = SingleFlight()
+
+__all__ = [
+    "CacheBackend",
+    "InMemoryLRUCache",
+    "RedisCacheBackend",
+    "build_cache_backend",
+    "TemplateCatalogCache",
+    "template_catalog_cache",
+    "SingleFlight",
+    "RequestCoalescer",
+    "coalescing_settings",
+    "single_flight"
+]
@@ -0,0 +1,105 @@
+import pickle
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+from app.settings import CacheSettings
+
+
+class CacheBackend(ABC):
+    """Key/value store behind the read-through caches, swappable so workers can share one"""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[Any]:
+        """Return the cached value or None when it is missing or expired"""
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a value, expiring after ttl seconds (never when ttl is None)"""
+
+    @abstractmethod
+    async def add(self, key: str, value: Any, ttl: Optional[float] = None) -> bool:
+        """Store a value only if the key is missing, returns whether it was stored"""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Remove a key if it exists"""
+
+
+class InMemoryLRUCache(CacheBackend):
+    """Per-process LRU cache with a time-to-live per entry"""
+
+    def __init__(self, max_entries: int = 1024, default_ttl: Optional[float] = None):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._entries: "OrderedDict[str, Tuple[Optional[float], Any]]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.default_ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def add(self, key: str, value: Any, ttl: Optional[float] = None) -> bool:
+        if await self.get(key) is not None:
+            return False
+        await self.set(key, value, ttl)
+        return True
+
+    async def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisCacheBackend(CacheBackend):
+    """Cache shared by all workers through Redis, values are pickled"""
+
+    def __init__(self, url: str, default_ttl: Optional[float] = None, prefix: str = "ttrpg:"):
+        try:
+            from redis import asyncio as redis_asyncio
+        except ImportError as e:
+            raise RuntimeError("cache_backend=redis requires the 'redis' package") from e
+        self._redis = redis_asyncio.from_url(url)
+        self.default_ttl = default_ttl
+        self.prefix = prefix
+
+    async def get(self, key: str) -> Optional[Any]:
+        raw = await self._redis.get(self.prefix + key)
+        return None if raw is None else pickle.loads(raw)
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.default_ttl if ttl is None else ttl
+        expire_ms = int(ttl * 1000) if ttl is not None else None
+        await self._redis.set(self.prefix + key, pickle.dumps(value), px=expire_ms)
+
+    async def add(self, key: str, value: Any, ttl: Optional[float] = None) -> bool:
+        ttl = self.default_ttl if ttl is None else ttl
+        expire_ms = int(ttl * 1000) if ttl is not None else None
+        return bool(await self._redis.set(self.prefix + key, pickle.dumps(value), px=expire_ms, nx=True))
+
+    async def delete(self, key: str) -> None:
+        await self._redis.delete(self.prefix + key)
+
+
+def build_cache_backend(settings: CacheSettings) -> CacheBackend:
+    if settings.backend == "redis":
+        if not settings.redis_url:
+            raise ValueError("cache_backend=redis requires redis_url")
+        return RedisCacheBackend(settings.redis_url, default_ttl=settings.ttl_seconds)
+    return InMemoryLRUCache(max_entries=settings.max_entries, default_ttl=settings.ttl_seconds)
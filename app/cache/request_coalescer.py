@@ -0,0 +1,60 @@
+from typing import Any, Awaitable, Callable, TypeVar
+
+from fastapi import Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.cache.single_flight import SingleFlight
+from app.registry import ServiceRegistry
+
+T = TypeVar("T")
+
+
+class RequestCoalescer:
+    """
+    Runs the read-only service calls of one request through the process-wide SingleFlight, keyed
+    by the called method, the route and its parameters, where the request reads from (primary or
+    replica; a user pinned to the primary by read-your-writes never gets a replica's result) and
+    the user when key_scope is "user". Only for calls whose result depends on nothing but those,
+    never for writes.
+
+    The shared call runs on a service of its own, built from the registry on a session that the
+    call opens and closes itself, routed like the request's. So the leader's request finishing or
+    being cancelled first, and releasing its session, does not pull the session from under the
+    followers still waiting for the result
+    """
+
+    def __init__(
+        self,
+        request: Request,
+        single_flight: SingleFlight,
+        key_scope: str,
+        registry: ServiceRegistry,
+        session_factory: Callable[[], AsyncSession],
+        read_target: str
+    ):
+        self.request = request
+        self.single_flight = single_flight
+        self.key_scope = key_scope
+        self.registry = registry
+        self.session_factory = session_factory
+        self.read_target = read_target
+
+    async def __call__(self, call: Callable[..., Awaitable[T]], *args: Any) -> T:
+        """call is a method of a service in the registry, e.g. service.get_inventory"""
+        if self.key_scope == "off":
+            return await call(*args)
+        name = call.__qualname__
+        key = (
+            name,
+            self.request.url.path,
+            tuple(sorted(self.request.query_params.multi_items())),
+            args,
+            self.read_target,
+            self.request.headers.get("x-user-id", "anonymous") if self.key_scope == "user" else None,
+        )
+        return await self.single_flight.do(name, key, lambda: self._call_on_own_session(call, args))
+
+    async def _call_on_own_session(self, call: Callable[..., Awaitable[T]], args: tuple) -> T:
+        async with self.session_factory() as session:
+            service = self.registry.scope(session).get(type(call.__self__))
+            return await call.__func__(service, *args)
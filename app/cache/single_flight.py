@@ -0,0 +1,51 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Shares one in-flight call between the concurrent callers with the same key, within this process.
+
+    The first caller's call runs as a task; callers arriving before it finishes await the same
+    task and receive the same result (or exception), so results must not be mutated. A caller
+    that is cancelled does not cancel the call for the others. Nothing is kept after the call
+    finishes, a later caller starts a new one
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, "asyncio.Task[Any]"] = {}
+        self.leaders = 0
+        self.coalesced = 0
+        self._per_name: Dict[str, Dict[str, int]] = {}
+
+    async def do(self, name: str, key: Hashable, call: Callable[[], Awaitable[T]]) -> T:
+        """Run call() for key, or wait for the call already running for it; name labels the metrics"""
+        counts = self._per_name.setdefault(name, {"leaders": 0, "coalesced": 0})
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(call())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._finished(key, done))
+            self.leaders += 1
+            counts["leaders"] += 1
+        else:
+            self.coalesced += 1
+            counts["coalesced"] += 1
+        return await asyncio.shield(task)
+
+    def _finished(self, key: Hashable, task: "asyncio.Task[Any]") -> None:
+        self._calls.pop(key, None)
+        if not task.cancelled():
+            task.exception()  # Retrieved here too, in case every caller was cancelled meanwhile
+
+    def stats(self) -> Dict[str, Any]:
+        requests = self.leaders + self.coalesced
+        return {
+            "in_flight": len(self._calls),
+            "leaders": self.leaders,
+            "coalesced": self.coalesced,
+            "coalesced_ratio": round(self.coalesced / requests, 4) if requests else 0.0,
+            "calls": {name: dict(counts) for name, counts in self._per_name.items()},
+        }
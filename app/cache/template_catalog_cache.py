@@ -0,0 +1,84 @@
+import uuid
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from uuid import UUID
+
+from app.apimodels import APIItemTemplateResponse
+from app.cache.cache_backends import CacheBackend
+
+
+class TemplateCatalogCache:
+    """
+    Read-through cache of ItemTemplate catalogs per (system_id, party_id).
+
+    Every system has a version marker: the newest updated_at of its templates. Catalog keys
+    include that marker, so a write only has to move the marker forward to make every cached
+    catalog of the system unreachable, also for the other workers sharing the backend.
+    A missing marker is read back from the database, which also picks up writes that did not
+    go through the service once the marker's TTL has passed.
+    """
+
+    def __init__(self, backend: CacheBackend, ttl: Optional[float] = None):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.version_loads = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def _version_key(system_id: UUID) -> str:
+        return f"item-templates:version:{system_id}"
+
+    @staticmethod
+    def _catalog_key(system_id: UUID, party_id: Optional[UUID], version: str) -> str:
+        return f"item-templates:catalog:{system_id}:{party_id or '-'}:{version}"
+
+    @staticmethod
+    def version_marker(updated_at: Optional[datetime]) -> str:
+        return updated_at.isoformat() if updated_at is not None else "empty"
+
+    async def get_catalog(
+        self,
+        system_id: UUID,
+        party_id: Optional[UUID],
+        load_version: Callable[[], Awaitable[Optional[datetime]]],
+        load_catalog: Callable[[], Awaitable[List[APIItemTemplateResponse]]],
+    ) -> List[APIItemTemplateResponse]:
+        """Return the cached catalog, loading the version marker and/or catalog when missing"""
+        version = await self.backend.get(self._version_key(system_id))
+        if version is None:
+            self.version_loads += 1
+            loaded = self.version_marker(await load_version())
+            # Only if still missing: an invalidate() since the load has moved the marker past it
+            if not await self.backend.add(self._version_key(system_id), loaded, self.ttl):
+                version = await self.backend.get(self._version_key(system_id))
+            version = version or loaded
+
+        key = self._catalog_key(system_id, party_id, version)
+        catalog = await self.backend.get(key)
+        if catalog is not None:
+            self.hits += 1
+            return catalog
+
+        self.misses += 1
+        catalog = await load_catalog()
+        await self.backend.set(key, catalog, self.ttl)
+        return catalog
+
+    async def invalidate(self, system_id: UUID, updated_at: datetime) -> None:
+        """Move the system's version marker to the updated_at of a template that was just written"""
+        self.invalidations += 1
+        # The suffix keeps two writes within the same clock tick from producing the same marker
+        version = f"{self.version_marker(updated_at)}-{uuid.uuid4().hex[:8]}"
+        await self.backend.set(self._version_key(system_id), version, self.ttl)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "version_loads": self.version_loads,
+            "invalidations": self.invalidations,
+        }
@@ -0,0 +1,18 @@
+from app.db import AsyncSessionLocal
+from app.changestream import change_broker
+from app.settings import ChangeLogSettings
+from .change_log_recorder import ChangeLogRecorder
+from .inventory_snapshots import InventorySnapshotScheduler
+
+# Started and stopped with the application, see main.py
+change_log_settings = ChangeLogSettings.from_env()
+change_log_recorder = ChangeLogRecorder(AsyncSessionLocal, change_log_settings, change_broker)
+inventory_snapshot_scheduler = InventorySnapshotScheduler(AsyncSessionLocal, change_log_settings)
+
+__all__ = [
+    "ChangeLogRecorder",
+    "InventorySnapshotScheduler",
+    "change_log_settings",
+    "change_log_recorder",
+    "inventory_snapshot_scheduler"
+]
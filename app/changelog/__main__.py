@@ -0,0 +1,61 @@
+"""
+Maintenance commands for the change log.
+
+    python -m app.changelog archive [--older-than-days N] [--directory DIR] [--format jsonl|parquet]
+    python -m app.changelog create-partitions [--months-ahead N]   # after the 0006 migration with partitions
+    python -m app.changelog snapshot-inventories [--min-changes N]  # when change_log_snapshot_interval is 0
+"""
+import argparse
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from app.db import get_engine
+from app.settings import ChangeLogSettings
+from app.changelog.change_log_archive import archive_change_logs, FILE_FORMATS
+from app.changelog.change_log_partitions import is_partitioned, create_monthly_partitions, add_months
+from app.changelog.inventory_snapshots import compact_inventory_snapshots
+
+
+def main() -> int:
+    settings = ChangeLogSettings.from_env()
+    parser = argparse.ArgumentParser(prog="python -m app.changelog")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    archive = subparsers.add_parser("archive", help="move old entries to compressed archive files")
+    archive.add_argument("--older-than-days", type=int, default=settings.retention_days)
+    archive.add_argument("--directory", type=Path, default=Path(settings.archive_dir))
+    archive.add_argument("--format", choices=FILE_FORMATS, default="jsonl")
+    partitions = subparsers.add_parser("create-partitions", help="create the monthly partitions ahead of time")
+    partitions.add_argument("--months-ahead", type=int, default=3)
+    snapshots = subparsers.add_parser("snapshot-inventories", help="snapshot the inventories that changed often")
+    snapshots.add_argument("--min-changes", type=int, default=settings.snapshot_every)
+    args = parser.parse_args()
+    engine = get_engine()
+
+    now = datetime.now(timezone.utc)
+    if args.command == "archive":
+        before = now - timedelta(days=args.older_than_days)
+        archived_files = archive_change_logs(engine, before, args.directory, args.format)
+        for archived in archived_files:
+            print(f"✅ Archived {archived.rows} entries of {archived.source} to {archived.path}")
+        if not archived_files:
+            print(f"✅ No change log entries older than {before:%Y-%m-%d}")
+        return 0
+
+    if args.command == "snapshot-inventories":
+        with engine.begin() as connection:
+            taken = compact_inventory_snapshots(connection, settings, args.min_changes)
+        print(f"✅ Took {taken} inventory snapshots")
+        return 0
+
+    with engine.begin() as connection:
+        if not is_partitioned(connection):
+            print("⚠️  change_logs is not partitioned, run 'alembic -x change_log_partitions=monthly upgrade head'")
+            return 1
+        created = create_monthly_partitions(connection, now, add_months(now, args.months_ahead))
+    print(f"✅ Created partitions: {', '.join(created)}" if created else "✅ All partitions exist already")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
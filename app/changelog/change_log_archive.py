@@ -0,0 +1,151 @@
+import gzip
+import json
+import os
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List
+from uuid import UUID
+
+from sqlalchemy import Connection, Engine, text
+
+from app.changelog.change_log_partitions import (
+    TABLE,
+    COLUMNS,
+    is_partitioned,
+    list_monthly_partitions,
+    detach_and_drop
+)
+from app.changelog.inventory_snapshots import take_horizon_snapshots
+
+FILE_FORMATS = ("jsonl", "parquet")
+
+
+@dataclass
+class ArchivedFile:
+    source: str
+    path: Path
+    rows: int
+
+
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def _write_jsonl(path: Path, rows: Iterable[Dict[str, Any]]) -> int:
+    count = 0
+    with gzip.open(path, "wt", encoding="utf-8") as archive:
+        for row in rows:
+            archive.write(json.dumps({key: _jsonable(value) for key, value in row.items()}) + "\n")
+            count += 1
+    return count
+
+
+def _write_parquet(path: Path, rows: Iterable[Dict[str, Any]], chunk_size: int) -> int:
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise RuntimeError("Parquet archives require the 'pyarrow' package") from e
+    types = {"created_at": pa.timestamp("us", tz="UTC"), "updated_at": pa.timestamp("us", tz="UTC"), "quantity_delta": pa.int32()}
+    schema = pa.schema([(column, types.get(column, pa.string())) for column in COLUMNS])
+    count = 0
+    with pq.ParquetWriter(path, schema, compression="zstd") as writer:
+        chunk = []
+        for row in rows:
+            chunk.append({key: str(value) if isinstance(value, UUID) else value for key, value in row.items()})
+            if len(chunk) == chunk_size:
+                writer.write_table(pa.Table.from_pylist(chunk, schema=schema))
+                count += len(chunk)
+                chunk = []
+        if chunk:
+            writer.write_table(pa.Table.from_pylist(chunk, schema=schema))
+            count += len(chunk)
+    return count
+
+
+def _export(connection: Connection, query: str, params: Dict[str, Any], path: Path, file_format: str, chunk_size: int) -> int:
+    """Stream the rows of a query into an archive file, which only appears under its name once complete"""
+    result = connection.execution_options(yield_per=chunk_size).execute(text(query), params)
+    rows = (row._asdict() for row in result)
+    partial = path.with_name(path.name + ".partial")
+    if file_format == "parquet":
+        count = _write_parquet(partial, rows, chunk_size)
+    else:
+        count = _write_jsonl(partial, rows)
+    with open(partial, "rb") as archive:
+        os.fsync(archive.fileno())
+    os.replace(partial, path)
+    return count
+
+
+def _archive_path(directory: Path, name: str, file_format: str) -> Path:
+    return directory / (f"{name}.parquet" if file_format == "parquet" else f"{name}.jsonl.gz")
+
+
+def _archive_rows(engine: Engine, source: str, before: datetime, directory: Path, file_format: str, chunk_size: int) -> ArchivedFile:
+    """Archive and delete the rows of one table older than before, in a single snapshot"""
+    path = _archive_path(directory, f"{source}_before_{before:%Y%m%dT%H%M%S}", file_format)
+    # Repeatable read: the DELETE only sees the rows that were exported, not ones inserted meanwhile
+    with engine.connect().execution_options(isolation_level="REPEATABLE READ") as connection:
+        with connection.begin():
+            rows = _export(
+                connection,
+                f"SELECT {', '.join(COLUMNS)} FROM {source} WHERE created_at < :before ORDER BY created_at, id",
+                {"before": before}, path, file_format, chunk_size
+            )
+            if rows:
+                connection.execute(text(f"DELETE FROM {source} WHERE created_at < :before"), {"before": before})
+    if not rows:
+        path.unlink()
+    return ArchivedFile(source, path, rows)
+
+
+def archive_change_logs(
+    engine: Engine, before: datetime, directory: Path, file_format: str = "jsonl", chunk_size: int = 5000
+) -> List[ArchivedFile]:
+    """
+    Move change log entries older than before into archive files in directory.
+
+    On a partitioned table every monthly partition that ends at or before the cutoff is written to
+    one file and then detached and dropped, which is cheap and leaves no dead rows behind. Old rows
+    in the default partition, or in an unpartitioned table, are exported and deleted row by row.
+
+    Every inventory with entries older than the cutoff is snapshotted at the cutoff first, so the
+    as-of view can still reconstruct it from there on.
+    """
+    if file_format not in FILE_FORMATS:
+        raise ValueError(f"file_format must be one of {FILE_FORMATS}, got {file_format!r}")
+    directory.mkdir(parents=True, exist_ok=True)
+    with engine.begin() as connection:
+        take_horizon_snapshots(connection, before)
+
+    with engine.connect() as connection:
+        partitioned = is_partitioned(connection)
+        partitions = list_monthly_partitions(connection) if partitioned else []
+
+    if not partitioned:
+        archived = _archive_rows(engine, TABLE, before, directory, file_format, chunk_size)
+        return [archived] if archived.rows else []
+
+    archived_files = []
+    for partition in partitions:
+        if partition.end > before:
+            break
+        path = _archive_path(directory, partition.name, file_format)
+        with engine.begin() as connection:
+            rows = _export(
+                connection, f"SELECT {', '.join(COLUMNS)} FROM {partition.name} ORDER BY created_at, id", {},
+                path, file_format, chunk_size
+            )
+            detach_and_drop(connection, partition)
+        archived_files.append(ArchivedFile(partition.name, path, rows))
+
+    archived = _archive_rows(engine, f"{TABLE}_default", before, directory, file_format, chunk_size)
+    if archived.rows:
+        archived_files.append(archived)
+    return archived_files
@@ -0,0 +1,80 @@
+import re
+from datetime import datetime, timezone
+from typing import List, NamedTuple
+
+from sqlalchemy import Connection, text
+
+TABLE = "change_logs"
+_PARTITION_NAME = re.compile(r"^change_logs_y(\d{4})m(\d{2})$")
+
+# Columns of ChangeLog in table order, what the archive job exports. Migration 0006 has its own,
+# frozen copies of the table definition and of the partition helpers
+COLUMNS = ["id", "created_at", "updated_at", "user_id", "player_character_id", "inventory_id",
+           "inventory_item_id", "action", "description", "item_template_id", "quantity_delta"]
+
+
+class MonthlyPartition(NamedTuple):
+    name: str
+    start: datetime  # Inclusive
+    end: datetime  # Exclusive
+
+
+def _month_start(year: int, month: int) -> datetime:
+    return datetime(year, month, 1, tzinfo=timezone.utc)
+
+
+def _next_month(moment: datetime) -> datetime:
+    return _month_start(moment.year + moment.month // 12, moment.month % 12 + 1)
+
+
+def add_months(moment: datetime, months: int) -> datetime:
+    for _ in range(months):
+        moment = _next_month(moment)
+    return moment
+
+
+def monthly_partition(moment: datetime) -> MonthlyPartition:
+    """The monthly partition (in UTC) that holds a timestamp"""
+    start = _month_start(moment.year, moment.month)
+    return MonthlyPartition(f"{TABLE}_y{start.year:04d}m{start.month:02d}", start, _next_month(start))
+
+
+def is_partitioned(connection: Connection) -> bool:
+    return bool(connection.scalar(text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:table))"
+    ), {"table": TABLE}))
+
+
+def list_monthly_partitions(connection: Connection) -> List[MonthlyPartition]:
+    """Monthly partitions of change_logs, oldest first (the default partition is not included)"""
+    names = connection.scalars(text(
+        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = to_regclass(:table)"
+    ), {"table": TABLE})
+    partitions = []
+    for name in names:
+        match = _PARTITION_NAME.match(name)
+        if match:
+            partitions.append(monthly_partition(_month_start(int(match.group(1)), int(match.group(2)))))
+    return sorted(partitions, key=lambda partition: partition.start)
+
+
+def create_monthly_partitions(connection: Connection, first: datetime, last: datetime) -> List[str]:
+    """Create the missing monthly partitions from the month of first up to and including the month of last"""
+    created = []
+    existing = {partition.name for partition in list_monthly_partitions(connection)}
+    partition = monthly_partition(first)
+    while partition.start <= last:
+        if partition.name not in existing:
+            connection.execute(text(
+                f"CREATE TABLE {partition.name} PARTITION OF {TABLE} "
+                f"FOR VALUES FROM ('{partition.start.isoformat()}') TO ('{partition.end.isoformat()}')"
+            ))
+            created.append(partition.name)
+        partition = monthly_partition(partition.end)
+    return created
+
+
+def detach_and_drop(connection: Connection, partition: MonthlyPartition) -> None:
+    connection.execute(text(f"ALTER TABLE {TABLE} DETACH PARTITION {partition.name}"))
+    connection.execute(text(f"DROP TABLE {partition.name}"))
@@ -0,0 +1,233 @@
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Set
+from uuid import UUID
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.apimodels import APIChangeLogResponse
+from app.changestream import ChangeBroker, ChangeEvent
+from app.dbmodels import ChangeLog, Inventory, InventoryItem, PlayerCharacter
+from app.settings import ChangeLogSettings
+
+logger = logging.getLogger(__name__)
+
+# Keeps a single INSERT well below the 32767 bind parameter limit of PostgreSQL
+_MAX_ROWS_PER_INSERT = 1000
+_WRITE_ATTEMPTS = 3
+_STOP = object()
+
+
+class ChangeLogRecorder:
+    """
+    Records ChangeLog entries outside of the request transaction.
+
+    In write-behind mode record() only puts the entry on a bounded in-memory queue. A background
+    task inserts queued entries with multi-row INSERTs once batch_size entries are waiting or
+    flush_interval seconds have passed. When the queue is full record() either waits (backpressure)
+    or drops the entry, depending on the overflow setting. stop() writes whatever is still queued.
+
+    In sync mode record() inserts the entry before returning, which keeps tests deterministic.
+
+    With a broker the written entries are also published to the live change streams, from the
+    inserting transaction so subscribers only ever see committed entries.
+    """
+
+    def __init__(self, session_factory: async_sessionmaker, settings: ChangeLogSettings, broker: Optional[ChangeBroker] = None):
+        self.session_factory = session_factory
+        self.settings = settings
+        self.broker = broker
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=settings.max_queue_size)
+        self._task: Optional[asyncio.Task] = None
+        self.recorded = 0
+        self.written = 0
+        self.dropped = 0
+        self.orphaned = 0
+        self.failed = 0
+        self.batches = 0
+
+    @property
+    def synchronous(self) -> bool:
+        return self.settings.mode == "sync" or self._task is None
+
+    async def start(self) -> None:
+        if self.settings.mode == "write_behind" and self._task is None:
+            self._task = asyncio.create_task(self._run(), name="change-log-recorder")
+
+    async def stop(self) -> None:
+        """Stop the background task after it has written every entry queued before the call"""
+        if self._task is not None:
+            await self._queue.put(_STOP)
+            await self._task
+            self._task = None
+        while not self._queue.empty():
+            await self._write(self._drain(self.settings.batch_size))
+
+    async def record(
+        self,
+        user_id: str,
+        action: str,
+        description: Optional[str] = None,
+        player_character_id: Optional[UUID] = None,
+        inventory_id: Optional[UUID] = None,
+        inventory_item_id: Optional[UUID] = None,
+        item_template_id: Optional[UUID] = None,
+        quantity_delta: Optional[int] = None,
+    ) -> None:
+        entry = {
+            "id": uuid.uuid4(),
+            # Time of the change itself, not of the (later) batch insert
+            "created_at": datetime.now(timezone.utc),
+            "user_id": user_id,
+            "action": action,
+            "description": description,
+            "player_character_id": player_character_id,
+            "inventory_id": inventory_id,
+            "inventory_item_id": inventory_item_id,
+            "item_template_id": item_template_id,
+            "quantity_delta": quantity_delta,
+        }
+        self.recorded += 1
+        if self.synchronous:
+            await self._write([entry])
+        elif self.settings.overflow == "drop":
+            try:
+                self._queue.put_nowait(entry)
+            except asyncio.QueueFull:
+                self.dropped += 1
+                logger.warning("Change log queue full, dropped %s entry", action)
+        else:
+            await self._queue.put(entry)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "mode": "sync" if self.synchronous else "write_behind",
+            "queued": self._queue.qsize(),
+            "recorded": self.recorded,
+            "written": self.written,
+            "dropped": self.dropped,
+            "orphaned": self.orphaned,
+            "failed": self.failed,
+            "batches": self.batches,
+        }
+
+    def _drain(self, limit: int) -> List[Dict[str, Any]]:
+        batch = []
+        while len(batch) < limit and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        return batch
+
+    async def _run(self) -> None:
+        """Collect a batch until it is full or flush_interval has passed since its first entry"""
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            batch: List[Dict[str, Any]] = []
+            deadline: Optional[float] = None
+            while len(batch) < self.settings.batch_size:
+                try:
+                    entry = self._queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    timeout = None if deadline is None else deadline - loop.time()
+                    if timeout is not None and timeout <= 0:
+                        break
+                    try:
+                        entry = await asyncio.wait_for(self._queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                if entry is _STOP:
+                    stopping = True
+                    break
+                batch.append(entry)
+                if deadline is None:
+                    deadline = loop.time() + self.settings.flush_interval
+            await self._write(batch)
+
+    async def _write(self, entries: List[Dict[str, Any]]) -> None:
+        if not entries:
+            return
+        for attempt in range(1, _WRITE_ATTEMPTS + 1):
+            try:
+                async with self.session_factory() as session:
+                    await self._fill_player_character_ids(session, entries)
+                    # Checked again on a retry, a purge may have deleted more in the meantime
+                    entries = await self._drop_deleted_references(session, entries)
+                    if not entries:
+                        return
+                    for start in range(0, len(entries), _MAX_ROWS_PER_INSERT):
+                        await session.execute(insert(ChangeLog).values(entries[start:start + _MAX_ROWS_PER_INSERT]))
+                    if self.broker is not None:
+                        await self.broker.publish(session, await self._change_events(session, entries))
+                    await session.commit()
+                self.written += len(entries)
+                self.batches += 1
+                return
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                if attempt == _WRITE_ATTEMPTS:
+                    self.failed += len(entries)
+                    logger.exception("Failed to write %d change log entries", len(entries))
+                    return
+                await asyncio.sleep(0.1 * 2 ** attempt)
+
+    @staticmethod
+    async def _fill_player_character_ids(session: AsyncSession, entries: List[Dict[str, Any]]) -> None:
+        """Resolve the owning character of inventory-only entries with one query per batch"""
+        inventory_ids = {
+            entry["inventory_id"] for entry in entries
+            if entry["player_character_id"] is None and entry["inventory_id"] is not None
+        }
+        if not inventory_ids:
+            return
+        result = await session.execute(
+            select(Inventory.id, Inventory.player_character_id).where(Inventory.id.in_(inventory_ids))
+        )
+        owners = dict(result.all())
+        for entry in entries:
+            if entry["player_character_id"] is None and entry["inventory_id"] is not None:
+                entry["player_character_id"] = owners.get(entry["inventory_id"])
+
+    @staticmethod
+    async def _change_events(session: AsyncSession, entries: List[Dict[str, Any]]) -> List[ChangeEvent]:
+        """The entries with the party of their character, which party streams are routed by"""
+        player_character_ids = {entry["player_character_id"] for entry in entries if entry["player_character_id"] is not None}
+        parties: Dict[UUID, Optional[UUID]] = {}
+        if player_character_ids:
+            result = await session.execute(
+                select(PlayerCharacter.id, PlayerCharacter.party_id).where(PlayerCharacter.id.in_(player_character_ids))
+            )
+            parties = dict(result.all())
+        return [
+            ChangeEvent(parties.get(entry["player_character_id"]), APIChangeLogResponse(**entry))
+            for entry in entries
+        ]
+
+    async def _drop_deleted_references(self, session: AsyncSession, entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Handle rows deleted while their entries were queued, the foreign keys would fail the whole
+        batch. Entries of deleted inventories and characters are dropped: the history of those went
+        with them (ON DELETE CASCADE). References to deleted items are cleared, their entries stay
+        """
+        references = (
+            ("inventory_item_id", InventoryItem),
+            ("inventory_id", Inventory),
+            ("player_character_id", PlayerCharacter),
+        )
+        existing: Dict[str, Set[UUID]] = {}
+        for key, model in references:
+            ids = {entry[key] for entry in entries if entry[key] is not None}
+            existing[key] = set(await session.scalars(select(model.id).where(model.id.in_(ids)))) if ids else set()
+
+        kept = []
+        for entry in entries:
+            if entry["inventory_item_id"] is not None and entry["inventory_item_id"] not in existing["inventory_item_id"]:
+                entry["inventory_item_id"] = None
+            if any(entry[key] is not None and entry[key] not in existing[key] for key in ("inventory_id", "player_character_id")):
+                self.orphaned += 1
+                continue
+            kept.append(entry)
+        return kept
@@ -0,0 +1,185 @@
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import Connection, Select, func, insert, select, text
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.dbmodels import ChangeLog, InventorySnapshot
+from app.settings import ChangeLogSettings
+
+logger = logging.getLogger(__name__)
+
+# Nothing before a baseline (taken from the live rows by migration 0011) or a horizon (taken right
+# before archiving the entries older than it) can be reconstructed from the change log
+HORIZON_KINDS = ("baseline", "horizon")
+# Key of the transaction-level advisory lock that keeps snapshot runs of several workers apart
+_ADVISORY_LOCK_KEY = 0x5EED_0C0A
+_MAX_ROWS_PER_INSERT = 1000
+
+
+def fold_deltas(items: Dict[str, int], deltas: Iterable[Tuple[UUID, int]]) -> Dict[str, int]:
+    """Apply (item_template_id, quantity_delta) pairs, oldest first, to the items of a snapshot"""
+    folded = dict(items)
+    for item_template_id, quantity_delta in deltas:
+        key = str(item_template_id)
+        quantity = folded.get(key, 0) + quantity_delta
+        if quantity > 0:
+            folded[key] = quantity
+        else:
+            folded.pop(key, None)
+    return folded
+
+
+def nearest_snapshot_select(inventory_id: Any, at: datetime) -> Select:
+    """The newest snapshot of an inventory taken at or before at, one index lookup"""
+    return (
+        select(InventorySnapshot.taken_at, InventorySnapshot.kind, InventorySnapshot.items)
+        .where(InventorySnapshot.inventory_id == inventory_id, InventorySnapshot.taken_at <= at)
+        .order_by(InventorySnapshot.taken_at.desc())
+        .limit(1)
+    )
+
+
+def horizon_select(inventory_id: Any, at: datetime) -> Select:
+    """Newest baseline or horizon after at: when there is one, the entries before it may be gone"""
+    return select(func.max(InventorySnapshot.taken_at)).where(
+        InventorySnapshot.inventory_id == inventory_id,
+        InventorySnapshot.kind.in_(HORIZON_KINDS),
+        InventorySnapshot.taken_at > at
+    )
+
+
+def deltas_select(inventory_id: Any, start: Optional[datetime], end: datetime) -> Select:
+    """Quantity deltas of an inventory with start <= created_at < end, oldest first"""
+    stmt = (
+        select(ChangeLog.item_template_id, ChangeLog.quantity_delta)
+        .where(
+            ChangeLog.inventory_id == inventory_id,
+            ChangeLog.quantity_delta.is_not(None),
+            ChangeLog.created_at < end
+        )
+        .order_by(ChangeLog.created_at, ChangeLog.id)
+    )
+    return stmt if start is None else stmt.where(ChangeLog.created_at >= start)
+
+
+def take_inventory_snapshots(
+    connection: Connection, cutoff: datetime, min_changes: int, kind: str, since: Optional[datetime] = None
+) -> int:
+    """
+    Snapshot, at cutoff, every inventory with at least min_changes deltas since its previous
+    snapshot, by folding those deltas into it. Only inventories with entries created since since
+    (all of them without) are looked at. Returns how many snapshots were taken
+    """
+    if connection.dialect.name == "postgresql" and not connection.scalar(
+        text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": _ADVISORY_LOCK_KEY}
+    ):
+        return 0  # Another worker is taking them right now
+    candidates = select(ChangeLog.inventory_id).distinct().where(
+        ChangeLog.inventory_id.is_not(None),
+        ChangeLog.quantity_delta.is_not(None),
+        ChangeLog.created_at < cutoff
+    )
+    if since is not None:
+        candidates = candidates.where(ChangeLog.created_at >= since)
+
+    snapshots = []
+    for inventory_id in connection.scalars(candidates).all():
+        previous = connection.execute(nearest_snapshot_select(inventory_id, cutoff)).first()
+        if previous is not None and previous.taken_at == cutoff:
+            continue
+        deltas = connection.execute(
+            deltas_select(inventory_id, None if previous is None else previous.taken_at, cutoff)
+        ).all()
+        if len(deltas) < min_changes:
+            continue
+        snapshots.append({
+            "id": uuid.uuid4(),
+            "inventory_id": inventory_id,
+            "taken_at": cutoff,
+            "kind": kind,
+            "items": fold_deltas({} if previous is None else previous.items, deltas),
+            "change_count": len(deltas),
+        })
+    for start in range(0, len(snapshots), _MAX_ROWS_PER_INSERT):
+        connection.execute(insert(InventorySnapshot), snapshots[start:start + _MAX_ROWS_PER_INSERT])
+    return len(snapshots)
+
+
+def compact_inventory_snapshots(connection: Connection, settings: ChangeLogSettings, min_changes: Optional[int] = None) -> int:
+    """
+    Snapshot the inventories that changed snapshot_every times (or min_changes) since their last
+    snapshot. Inventories without entries since the newest snapshot of any inventory were
+    already looked at by the run that took it
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=settings.snapshot_settle_seconds)
+    since = connection.scalar(select(func.max(InventorySnapshot.taken_at)))
+    return take_inventory_snapshots(
+        connection, cutoff, settings.snapshot_every if min_changes is None else min_changes, "compaction", since
+    )
+
+
+def take_horizon_snapshots(connection: Connection, before: datetime) -> int:
+    """Snapshot, at before, every inventory with entries older than before, which are about to be archived"""
+    return take_inventory_snapshots(connection, before, 0, "horizon")
+
+
+class InventorySnapshotScheduler:
+    """
+    Runs compact_inventory_snapshots every snapshot_interval seconds in the background, so
+    reconstructing an inventory never replays much more than snapshot_every deltas. With several
+    workers the advisory lock lets one of them do each run
+    """
+
+    def __init__(self, session_factory: async_sessionmaker, settings: ChangeLogSettings):
+        self.session_factory = session_factory
+        self.settings = settings
+        self._task: Optional[asyncio.Task] = None
+        self.runs = 0
+        self.taken = 0
+        self.failed = 0
+
+    async def start(self) -> None:
+        if self.settings.snapshot_interval > 0 and self._task is None:
+            self._task = asyncio.create_task(self._run(), name="inventory-snapshots")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def run_once(self) -> int:
+        async with self.session_factory() as session:
+            taken = await session.run_sync(
+                lambda sync_session: compact_inventory_snapshots(sync_session.connection(), self.settings)
+            )
+            await session.commit()
+        self.runs += 1
+        self.taken += taken
+        return taken
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.settings.snapshot_interval)
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self.failed += 1
+                logger.exception("Failed to take inventory snapshots")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self._task is not None,
+            "interval": self.settings.snapshot_interval,
+            "every": self.settings.snapshot_every,
+            "runs": self.runs,
+            "taken": self.taken,
+            "failed": self.failed,
+        }
@@ -0,0 +1,23 @@
+from app.db import settings as database_settings
+from app.settings import ChangeStreamSettings
+from .change_stream_hub import ChangeEvent, ChangeSubscription, ChangeStreamHub
+from .change_brokers import ChangeBroker, InMemoryChangeBroker, PostgresChangeBroker, build_change_broker
+
+change_stream_settings = ChangeStreamSettings.from_env()
+
+# Subscribers of this process; the broker feeds it, started and stopped with the application (see main.py)
+change_stream_hub = ChangeStreamHub(change_stream_settings.buffer_size)
+change_broker = build_change_broker(change_stream_settings, database_settings)
+
+__all__ = [
+    "ChangeEvent",
+    "ChangeSubscription",
+    "ChangeStreamHub",
+    "ChangeBroker",
+    "InMemoryChangeBroker",
+    "PostgresChangeBroker",
+    "build_change_broker",
+    "change_stream_settings",
+    "change_stream_hub",
+    "change_broker"
+]
@@ -0,0 +1,154 @@
+import asyncio
+import json
+import logging
+from abc import ABC, abstractmethod
+from typing import List, Optional
+from uuid import UUID
+
+from sqlalchemy import event, text, bindparam, Text
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.apimodels import APIChangeLogResponse
+from app.changestream.change_stream_hub import ChangeEvent, ChangeStreamHub
+from app.settings import ChangeStreamSettings, DatabaseSettings
+
+logger = logging.getLogger(__name__)
+
+# PostgreSQL rejects NOTIFY payloads of 8000 bytes or more
+_MAX_PAYLOAD_BYTES = 7900
+_MAX_DESCRIPTION_LENGTH = 1000
+
+
+class ChangeBroker(ABC):
+    """Carries committed change events to the ChangeStreamHub of every process, swappable like the cache backends"""
+
+    @abstractmethod
+    async def publish(self, session: AsyncSession, events: List[ChangeEvent]) -> None:
+        """Called inside the transaction inserting the entries, they reach subscribers only once it commits"""
+
+    @abstractmethod
+    async def start(self, hub: ChangeStreamHub) -> None:
+        """Start delivering published events to hub"""
+
+    async def stop(self) -> None:
+        """Stop delivering"""
+
+
+class InMemoryChangeBroker(ChangeBroker):
+    """Delivers to the hub of this process only: a single worker, or tests"""
+
+    def __init__(self):
+        self._hub: Optional[ChangeStreamHub] = None
+
+    async def publish(self, session: AsyncSession, events: List[ChangeEvent]) -> None:
+        hub = self._hub
+        if hub is None or not events:
+            return
+
+        def deliver(_) -> None:
+            for change_event in events:
+                hub.deliver(change_event)
+
+        # The recorder uses a new session per write attempt, so a rolled back attempt never fires this
+        event.listen(session.sync_session, "after_commit", deliver, once=True)
+
+    async def start(self, hub: ChangeStreamHub) -> None:
+        self._hub = hub
+
+    async def stop(self) -> None:
+        self._hub = None
+
+
+def _encode(change_event: ChangeEvent) -> str:
+    change = change_event.change
+    payload = json.dumps({"party_id": str(change_event.party_id) if change_event.party_id else None,
+                          "change": change.model_dump(mode="json")})
+    if len(payload.encode()) > _MAX_PAYLOAD_BYTES and change.description:
+        return _encode(ChangeEvent(change_event.party_id, change.model_copy(
+            update={"description": change.description[:_MAX_DESCRIPTION_LENGTH]}
+        )))
+    return payload
+
+
+def _decode(payload: str) -> ChangeEvent:
+    data = json.loads(payload)
+    party_id = UUID(data["party_id"]) if data["party_id"] else None
+    return ChangeEvent(party_id, APIChangeLogResponse.model_validate(data["change"]))
+
+
+class PostgresChangeBroker(ChangeBroker):
+    """
+    Fans out through PostgreSQL LISTEN/NOTIFY, so every worker's subscribers get every change.
+    NOTIFY is transactional: the notifications are sent when the inserting transaction commits.
+    One dedicated connection per process listens; when it drops it reconnects and tells every
+    stream to catch up from the database, as notifications sent meanwhile are lost
+    """
+
+    def __init__(self, dsn: str, channel: str):
+        self.dsn = dsn
+        self.channel = channel
+        self._hub: Optional[ChangeStreamHub] = None
+        self._task: Optional[asyncio.Task] = None
+        self._notify = text(
+            "SELECT pg_notify(:channel, payload) FROM unnest(:payloads) AS payload"
+        ).bindparams(bindparam("payloads", type_=ARRAY(Text)))
+
+    async def publish(self, session: AsyncSession, events: List[ChangeEvent]) -> None:
+        if events:
+            await session.execute(self._notify, {"channel": self.channel, "payloads": [_encode(e) for e in events]})
+
+    async def start(self, hub: ChangeStreamHub) -> None:
+        self._hub = hub
+        if self._task is None:
+            self._task = asyncio.create_task(self._listen(), name="change-stream-listener")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _on_notification(self, connection, pid: int, channel: str, payload: str) -> None:
+        try:
+            self._hub.deliver(_decode(payload))
+        except Exception:
+            logger.exception("Invalid change stream notification: %.200s", payload)
+
+    async def _listen(self) -> None:
+        try:
+            import asyncpg
+        except ImportError as e:
+            raise RuntimeError("change_stream_broker=postgres requires the 'asyncpg' package") from e
+        delay = 0.5
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(self.dsn)
+                closed = asyncio.Event()
+                connection.add_termination_listener(lambda _: closed.set())
+                await connection.add_listener(self.channel, self._on_notification)
+                delay = 0.5
+                self._hub.mark_all_lagged()
+                await closed.wait()
+                logger.warning("Change stream listener connection closed, reconnecting")
+            except asyncio.CancelledError:
+                if connection is not None and not connection.is_closed():
+                    await connection.close()
+                raise
+            except Exception:
+                logger.exception("Change stream listener failed, retrying in %.1fs", delay)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 30.0)
+
+
+def build_change_broker(settings: ChangeStreamSettings, database_settings: DatabaseSettings) -> ChangeBroker:
+    if settings.broker == "postgres":
+        # asyncpg takes a plain postgresql:// DSN, with sslmode like libpq
+        url = settings.listen_url or database_settings.sync_url
+        return PostgresChangeBroker(make_url(url).set(drivername="postgresql").render_as_string(hide_password=False), settings.channel)
+    return InMemoryChangeBroker()
@@ -0,0 +1,105 @@
+import asyncio
+from collections import deque
+from typing import Any, Deque, Dict, NamedTuple, Optional, Set, Tuple
+from uuid import UUID
+
+from app.apimodels import APIChangeLogResponse
+
+
+class ChangeEvent(NamedTuple):
+    """A committed change log entry and the party its character belonged to at the time"""
+    party_id: Optional[UUID]
+    change: APIChangeLogResponse
+
+
+class ChangeSubscription:
+    """
+    Events for one stream, buffered up to buffer_size. A subscriber that falls further behind is
+    marked lagged and its buffer dropped: memory stays bounded and the stream catches up from
+    the database instead (see AsyncChangeStreamService)
+    """
+
+    def __init__(self, key: Tuple[str, UUID], buffer_size: int):
+        self.key = key
+        self.buffer_size = buffer_size
+        self.lagged = False
+        self._buffer: Deque[ChangeEvent] = deque()
+        self._ready = asyncio.Event()
+
+    def push(self, event: ChangeEvent) -> None:
+        if self.lagged:
+            return
+        if len(self._buffer) >= self.buffer_size:
+            self.drop()
+            return
+        self._buffer.append(event)
+        self._ready.set()
+
+    def drop(self) -> None:
+        """Discard the buffered events and mark the subscription lagged"""
+        self._buffer.clear()
+        self.lagged = True
+        self._ready.set()
+
+    async def get(self, timeout: float) -> Optional[ChangeEvent]:
+        """The next buffered event, None when timeout passes first or once the subscription is lagged"""
+        if not self._buffer and not self.lagged:
+            self._ready.clear()
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return None
+        if self.lagged or not self._buffer:
+            return None
+        return self._buffer.popleft()
+
+    def resume(self) -> None:
+        """Buffer events again, after the caller has replayed what the dropped buffer held"""
+        self.lagged = False
+
+
+class ChangeStreamHub:
+    """Routes committed change events to the subscribers of a party or a character in this process"""
+
+    def __init__(self, buffer_size: int = 256):
+        self.buffer_size = buffer_size
+        self._subscribers: Dict[Tuple[str, UUID], Set[ChangeSubscription]] = {}
+        self.delivered = 0
+        self.overflowed = 0
+
+    def subscribe(self, party_id: Optional[UUID] = None, player_character_id: Optional[UUID] = None) -> ChangeSubscription:
+        key = ("party", party_id) if party_id is not None else ("player_character", player_character_id)
+        subscription = ChangeSubscription(key, self.buffer_size)
+        self._subscribers.setdefault(key, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: ChangeSubscription) -> None:
+        subscribers = self._subscribers.get(subscription.key)
+        if subscribers is not None:
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[subscription.key]
+
+    def deliver(self, event: ChangeEvent) -> None:
+        for key in (("party", event.party_id), ("player_character", event.change.player_character_id)):
+            for subscription in self._subscribers.get(key, ()):
+                was_lagged = subscription.lagged
+                subscription.push(event)
+                if subscription.lagged:
+                    self.overflowed += not was_lagged
+                else:
+                    self.delivered += 1
+
+    def mark_all_lagged(self) -> None:
+        """Events may have been missed (the broker lost its connection), every stream replays from the database"""
+        for subscribers in self._subscribers.values():
+            for subscription in subscribers:
+                subscription.drop()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "streams": len(self._subscribers),
+            "subscribers": sum(len(subscribers) for subscribers in self._subscribers.values()),
+            "delivered": self.delivered,
+            "overflowed": self.overflowed,
+        }
@@ -0,0 +1,19 @@
+from .compendium_formats import (
+    FILE_FORMATS,
+    MEDIA_TYPES,
+    COLUMNS,
+    CompendiumRecord,
+    read_compendium_chunks,
+    compendium_header,
+    encode_compendium_rows
+)
+
+__all__ = [
+    "FILE_FORMATS",
+    "MEDIA_TYPES",
+    "COLUMNS",
+    "CompendiumRecord",
+    "read_compendium_chunks",
+    "compendium_header",
+    "encode_compendium_rows"
+]
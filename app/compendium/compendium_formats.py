@@ -0,0 +1,167 @@
+import codecs
+import csv
+import io
+from decimal import Decimal
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+import orjson
+
+FILE_FORMATS = ("csv", "jsonl")
+MEDIA_TYPES = {"csv": "text/csv; charset=utf-8", "jsonl": "application/x-ndjson"}
+
+# Compendium columns, in file order; tags are written as one CSV field separated by TAG_SEPARATOR
+COLUMNS = ("name", "description", "weight", "value", "rarity", "type", "tags")
+TAG_SEPARATOR = "|"
+
+
+class CompendiumRecord(NamedTuple):
+    """One record of an import file: its fields, or why they could not be read"""
+    line: int  # First line of the record in the file, 1-based
+    fields: Optional[Dict[str, Any]]
+    error: Optional[str] = None
+
+
+async def _text_lines(body: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    """Decode a byte stream into lines that keep their line ending, a UTF-8 BOM is skipped"""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    try:
+        async for data in body:
+            pending += decoder.decode(data)
+            *lines, pending = pending.split("\n")
+            for line in lines:
+                yield line + "\n"
+        pending += decoder.decode(b"", final=True)
+    except UnicodeDecodeError as e:
+        raise ValueError(f"Import file is not valid UTF-8: {e.reason}") from e
+    if pending:
+        yield pending
+
+
+def _csv_fields(header: Sequence[str], values: List[str], line: int) -> CompendiumRecord:
+    if len(values) != len(header):
+        return CompendiumRecord(line, None, f"Expected {len(header)} fields, got {len(values)}")
+    fields: Dict[str, Any] = {}
+    for column, value in zip(header, values):
+        if column not in COLUMNS:
+            continue  # Columns of other exports (id, system_id, ...) are ignored
+        value = value.strip()
+        if column == "tags":
+            fields[column] = [tag.strip() for tag in value.split(TAG_SEPARATOR) if tag.strip()] if value else None
+        else:
+            fields[column] = value or None
+    return CompendiumRecord(line, fields)
+
+
+async def _csv_chunks(body: AsyncIterable[bytes], chunk_size: int) -> AsyncIterator[List[CompendiumRecord]]:
+    header: Optional[List[str]] = None
+    block: List[str] = []  # Physical lines of whole records
+    block_start = 1  # File line of block[0]
+    records = 0
+    quotes = 0  # A record continues on the next line while it has an odd number of quotes
+
+    def parse_block() -> List[CompendiumRecord]:
+        nonlocal header
+        reader = csv.reader(block)
+        chunk = []
+        line = block_start
+        while True:
+            try:
+                values = next(reader)
+            except StopIteration:
+                return chunk
+            except csv.Error as e:
+                raise ValueError(f"CSV could not be read at line {line}: {e}") from e
+            record_line, line = line, block_start + reader.line_num
+            if not any(value.strip() for value in values):
+                continue
+            if header is None:
+                header = [value.strip().lower() for value in values]
+                if "name" not in header:
+                    raise ValueError("CSV header has no 'name' column")
+                continue
+            chunk.append(_csv_fields(header, values, record_line))
+
+    async for text_line in _text_lines(body):
+        block.append(text_line)
+        quotes += text_line.count('"')
+        if quotes % 2:
+            continue
+        records += 1
+        if records >= chunk_size:
+            chunk = parse_block()
+            block_start += len(block)
+            block, records = [], 0
+            if chunk:
+                yield chunk
+    if block:
+        chunk = parse_block()
+        if chunk:
+            yield chunk
+    if header is None:
+        raise ValueError("CSV import file is empty")
+
+
+async def _jsonl_chunks(body: AsyncIterable[bytes], chunk_size: int) -> AsyncIterator[List[CompendiumRecord]]:
+    chunk: List[CompendiumRecord] = []
+    line = 0
+    async for text_line in _text_lines(body):
+        line += 1
+        if not text_line.strip():
+            continue
+        try:
+            fields = orjson.loads(text_line)
+        except orjson.JSONDecodeError as e:
+            chunk.append(CompendiumRecord(line, None, f"Invalid JSON: {e}"))
+        else:
+            if isinstance(fields, dict):
+                chunk.append(CompendiumRecord(line, {key: value for key, value in fields.items() if key in COLUMNS}))
+            else:
+                chunk.append(CompendiumRecord(line, None, "Expected a JSON object"))
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def read_compendium_chunks(
+    body: AsyncIterable[bytes], file_format: str, chunk_size: int
+) -> AsyncIterator[List[CompendiumRecord]]:
+    """
+    Parse an import file while it is received, in chunks of up to chunk_size records. Records that
+    cannot be read carry an error instead of fields; a file that cannot be read at all (not UTF-8,
+    no CSV header) raises ValueError
+    """
+    if file_format not in FILE_FORMATS:
+        raise ValueError(f"file_format must be one of {FILE_FORMATS}, got {file_format!r}")
+    if file_format == "csv":
+        return _csv_chunks(body, chunk_size)
+    return _jsonl_chunks(body, chunk_size)
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def compendium_header(file_format: str) -> bytes:
+    """What an export file starts with: the CSV header line, nothing for JSONL"""
+    return (",".join(COLUMNS) + "\r\n").encode() if file_format == "csv" else b""
+
+
+def encode_compendium_rows(rows: Iterable[Sequence[Any]], file_format: str) -> bytes:
+    """Rows of values in COLUMNS order as CSV records or JSON lines"""
+    if file_format == "jsonl":
+        return b"".join(
+            orjson.dumps(dict(zip(COLUMNS, row)), default=_default, option=orjson.OPT_APPEND_NEWLINE) for row in rows
+        )
+    output = io.StringIO()
+    writer = csv.writer(output)
+    tags_index = COLUMNS.index("tags")
+    for row in rows:
+        values = list(row)
+        values[tags_index] = TAG_SEPARATOR.join(values[tags_index] or ())
+        writer.writerow(values)
+    return output.getvalue().encode()
@@ -1,40 +1,140 @@
-from sqlalchemy import create_engine
+import dataclasses
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import Engine, create_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import NullPool
-import os
-from dotenv import load_dotenv
-
-load_dotenv()
-
-# Fetch Supabase connection variables
-USER = os.getenv("user")
-PASSWORD = os.getenv("password")
-HOST = os.getenv("host")
-PORT = os.getenv("port")
-DBNAME = os.getenv("dbname")
-
-# Construct the SQLAlchemy connection string for Supabase
-DATABASE_URL = f"postgresql+psycopg2://{USER}:{PASSWORD}@{HOST}:{PORT}/{DBNAME}?sslmode=require"
-
-# Create SQLAlchemy engine
-# Note: If using Supabase Transaction Pooler or Session Pooler, use NullPool
-# to disable SQLAlchemy client-side pooling (recommended for Supabase)
-# For direct connection, you can use default pooling settings
-engine = create_engine(
-    DATABASE_URL,
-    poolclass=NullPool,  # Use NullPool for Supabase connection pooling
-    echo=False           # Set to True for SQL logging
-)
+from fastapi import Request
+
+from app.cache import InMemoryLRUCache, RedisCacheBackend, cache_settings
+from app.pooling import engine_options
+from app.replica_routing import RoutingAsyncSession, ReadYourWritesTracker
+from app.settings import DatabaseSettings, ReplicaSettings
+
+# Connection and pool settings: user/password/host/port/dbname (or DATABASE_URL) plus db_pool_* knobs
+settings = DatabaseSettings.from_env()
+
+# Construct the SQLAlchemy connection strings for Supabase
+DATABASE_URL = settings.sync_url
+ASYNC_DATABASE_URL = settings.async_url
+
+# Read replicas (DATABASE_REPLICA_URLS), same credentials handling and pool settings as the primary
+replica_settings = ReplicaSettings.from_env()
+
+# The engines are created on first use instead of at import: creating one imports its driver
+# (psycopg2/asyncpg), and a production process that only serves requests never needs the sync engine
+_engine: Optional[Engine] = None
+_async_engine: Optional[AsyncEngine] = None
+_replica_engines: Optional[List[AsyncEngine]] = None
+_engine_hooks: List[Callable[[Engine], None]] = []
+
+
+def on_engine_created(hook: Callable[[Engine], None]) -> None:
+    """Call hook with every engine, the ones created so far included (the async engine as its sync_engine)"""
+    _engine_hooks.append(hook)
+    for engine in created_engines().values():
+        hook(engine)
+
+
+def get_engine() -> Engine:
+    """The sync engine, for scripts, the CLIs and create_all"""
+    global _engine
+    if _engine is None:
+        # The pool is chosen by db_pool_mode: "queue" (default) keeps TLS connections open between
+        # requests, "transaction_pooler" is for PgBouncer / the Supabase transaction pooler and
+        # "null" opens a new connection for every checkout
+        _engine = create_engine(DATABASE_URL, **engine_options(settings, is_async=False))
+        for hook in _engine_hooks:
+            hook(_engine)
+    return _engine
+
+
+def get_async_engine() -> AsyncEngine:
+    """Async engine used by the request handlers, so waiting on the database does not hold a threadpool worker"""
+    global _async_engine
+    if _async_engine is None:
+        _async_engine = create_async_engine(ASYNC_DATABASE_URL, **engine_options(settings, is_async=True))
+        for hook in _engine_hooks:
+            hook(_async_engine.sync_engine)
+    return _async_engine
+
+
+def get_replica_engines() -> List[AsyncEngine]:
+    """Async engines of the read replicas, empty when none are configured"""
+    global _replica_engines
+    if _replica_engines is None:
+        _replica_engines = [
+            create_async_engine(
+                dataclasses.replace(settings, url=url).async_url, **engine_options(settings, is_async=True)
+            )
+            for url in replica_settings.urls
+        ]
+        for replica in _replica_engines:
+            for hook in _engine_hooks:
+                hook(replica.sync_engine)
+    return _replica_engines
+
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def created_engines() -> Dict[str, Engine]:
+    """The engines created so far by name ("sync", "async", "replica_0", ...), async engines as their sync_engine"""
+    engines = {}
+    if _engine is not None:
+        engines["sync"] = _engine
+    if _async_engine is not None:
+        engines["async"] = _async_engine.sync_engine
+    for index, replica in enumerate(_replica_engines or ()):
+        engines[f"replica_{index}"] = replica.sync_engine
+    return engines
+
+
+def __getattr__(name: str):
+    # 'from app.db import engine' keeps working, it creates the engine at that point
+    if name == "engine":
+        return get_engine()
+    if name == "async_engine":
+        return get_async_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class _LazySessionmaker(sessionmaker):
+    """sessionmaker that binds to the sync engine when it makes its first session"""
+
+    def __call__(self, **local_kw):
+        if self.kw.get("bind") is None:
+            self.configure(bind=get_engine())
+        return super().__call__(**local_kw)
+
+
+class _LazyAsyncSessionmaker(async_sessionmaker):
+    """async_sessionmaker that binds to the async engine when it makes its first session"""
+
+    def __call__(self, **local_kw):
+        if self.kw.get("bind") is None:
+            self.configure(bind=get_async_engine())
+        return super().__call__(**local_kw)
+
+
+SessionLocal = _LazySessionmaker(autocommit=False, autoflush=False)
+
+# expire_on_commit=False: async sessions cannot lazy load expired attributes after a commit.
+# Sessions route reads to a replica once get_async_db allows it, otherwise everything uses the primary
+AsyncSessionLocal = _LazyAsyncSessionmaker(class_=RoutingAsyncSession, autoflush=False, expire_on_commit=False)
 Base = declarative_base()
 
+# Remembers who wrote recently, in Redis when the caches use it so every worker sees the markers
+read_your_writes = ReadYourWritesTracker(
+    replica_settings,
+    RedisCacheBackend(cache_settings.redis_url) if cache_settings.backend == "redis" and cache_settings.redis_url
+    else InMemoryLRUCache(max_entries=100_000),
+    get_replica_engines,
+)
+
 
 def test_connection():
     """Test the database connection"""
     try:
-        with engine.connect() as connection:
+        with get_engine().connect() as connection:
             print("✅ Database connection successful!")
             return True
     except Exception as e:
@@ -49,3 +149,13 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# Dependency to get an async DB session. GET/HEAD requests read from a replica unless the user
+# (X-User-Id) wrote within the sticky window; other requests and all writes use the primary
+async def get_async_db(request: Request):
+    async with AsyncSessionLocal() as db:
+        await read_your_writes.route(
+            db, request.headers.get("x-user-id", "anonymous"), request.method in ("GET", "HEAD")
+        )
+        yield db
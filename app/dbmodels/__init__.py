@@ -6,6 +6,9 @@ from .db_inventory import Inventory
 from .db_player_character import PlayerCharacter
 from .db_inventory_item import InventoryItem
 from .db_change_log import ChangeLog
+from .db_inventory_aggregate import InventoryAggregate
+from .db_party_aggregate import PartyAggregate
+from .db_inventory_snapshot import InventorySnapshot
 
 __all__ = [
     "BaseModel",
@@ -16,4 +19,7 @@ __all__ = [
     "PlayerCharacter",
     "InventoryItem",
     "ChangeLog",
+    "InventoryAggregate",
+    "PartyAggregate",
+    "InventorySnapshot",
 ]
\ No newline at end of file
@@ -1,5 +1,7 @@
 import uuid
-from typing import Optional, List, Dict, Any
+from functools import lru_cache
+from operator import attrgetter
+from typing import Optional, List, Dict, Any, Callable, Tuple, Type
 
 from sqlalchemy import Column, DateTime
 from sqlalchemy.dialects.postgresql import UUID
@@ -7,6 +9,13 @@ from sqlalchemy.sql import func
 from app.db import Base
 
 
+@lru_cache(maxsize=None)
+def column_accessor(model: Type[Base]) -> Tuple[Tuple[str, ...], Callable[[Any], Tuple[Any, ...]]]:
+    """Column names of a model and a single attrgetter returning all their values, built once per model"""
+    names = tuple(column.name for column in model.__table__.columns)
+    return names, attrgetter(*names)
+
+
 class BaseModel(Base):
     """Base model class with common fields"""
     __abstract__ = True
@@ -19,11 +28,7 @@ class BaseModel(Base):
         """
         Simple conversion to dictionary (columns only, no relationships)
         """
-        if exclude is None:
-            exclude = []
-
-        result = {}
-        for column in self.__table__.columns:
-            if column.name not in exclude:
-                result[column.name] = getattr(self, column.name)
-        return result
\ No newline at end of file
+        names, get_values = column_accessor(type(self))
+        if not exclude:
+            return dict(zip(names, get_values(self)))
+        return {name: value for name, value in zip(names, get_values(self)) if name not in exclude}
\ No newline at end of file
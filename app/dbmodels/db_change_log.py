@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.dbmodels.db_base import BaseModel
@@ -6,14 +6,24 @@ from app.dbmodels.db_base import BaseModel
 
 class ChangeLog(BaseModel):
     __tablename__ = "change_logs"
+    __table_args__ = (
+        Index("ix_change_logs_created_at_id", "created_at", "id"),  # Keyset pagination
+        # History of one character / inventory in a time window, in keyset order
+        Index("ix_change_logs_player_character_id_created_at", "player_character_id", "created_at", "id"),
+        Index("ix_change_logs_inventory_id_created_at", "inventory_id", "created_at", "id"),
+    )
 
     # Inherited columns: id, created_at, updated_at
     user_id = Column(String, nullable=False, index=True)  # From Supabase Auth
-    player_character_id = Column(UUID(as_uuid=True), ForeignKey("player_characters.id"), nullable=True)
-    inventory_id = Column(UUID(as_uuid=True), ForeignKey("inventories.id"), nullable=True)
-    inventory_item_id = Column(UUID(as_uuid=True), ForeignKey("inventory_items.id"), nullable=True)
+    player_character_id = Column(UUID(as_uuid=True), ForeignKey("player_characters.id", ondelete="CASCADE"), nullable=True)
+    inventory_id = Column(UUID(as_uuid=True), ForeignKey("inventories.id", ondelete="CASCADE"), nullable=True)
+    inventory_item_id = Column(UUID(as_uuid=True), ForeignKey("inventory_items.id", ondelete="SET NULL"), nullable=True, index=True)
     action = Column(String, nullable=False)  # e.g., "ADD_ITEM", "UPDATE_ITEM", "REMOVE_ITEM"
     description = Column(Text, nullable=True)  # Human-readable summary
+    # Structured delta of inventory entries, replayed by the as-of view (see app/changelog/inventory_snapshots.py).
+    # No foreign key: the history of a template outlives the template
+    item_template_id = Column(UUID(as_uuid=True), nullable=True)
+    quantity_delta = Column(Integer, nullable=True)
 
     # Relationships
     player_character = relationship("PlayerCharacter", back_populates="change_logs")
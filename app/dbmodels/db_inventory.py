@@ -7,7 +7,7 @@ from app.dbmodels.db_base import BaseModel
 class Inventory(BaseModel):
     __tablename__ = "inventories"
 
-    player_character_id = Column(UUID(as_uuid=True), ForeignKey("player_characters.id"), nullable=False)
+    player_character_id = Column(UUID(as_uuid=True), ForeignKey("player_characters.id", ondelete="CASCADE"), nullable=False, index=True)
 
     # Specify which foreign key this relationship uses
     player_character = relationship(
@@ -16,4 +16,6 @@ class Inventory(BaseModel):
         back_populates="inventory",
         uselist=False
     )
-    inventory_items = relationship("InventoryItem", back_populates="inventory", cascade="all, delete-orphan")
\ No newline at end of file
+    inventory_items = relationship(
+        "InventoryItem", back_populates="inventory", cascade="all, delete-orphan", passive_deletes=True
+    )
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, ForeignKey, Integer
+from sqlalchemy import Column, ForeignKey, Integer, Index, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.dbmodels.db_base import BaseModel
@@ -6,13 +6,19 @@ from app.dbmodels.db_base import BaseModel
 
 class InventoryItem(BaseModel):
     __tablename__ = "inventory_items"
+    __table_args__ = (
+        Index("ix_inventory_items_created_at_id", "created_at", "id"),  # Keyset pagination
+        # One row per template in an inventory, the conflict target of quantity upserts
+        UniqueConstraint("inventory_id", "item_template_id", name="uq_inventory_items_inventory_id_item_template_id"),
+    )
 
     # Inherited columns: id, created_at, updated_at
-    inventory_id = Column(UUID(as_uuid=True), ForeignKey("inventories.id"), nullable=False)
-    item_template_id = Column(UUID(as_uuid=True), ForeignKey("item_templates.id"), nullable=False)
+    inventory_id = Column(UUID(as_uuid=True), ForeignKey("inventories.id", ondelete="CASCADE"), nullable=False, index=True)
+    item_template_id = Column(UUID(as_uuid=True), ForeignKey("item_templates.id", ondelete="CASCADE"), nullable=False, index=True)
     quantity = Column(Integer, default=1)
 
     # Relationships
     inventory = relationship("Inventory", back_populates="inventory_items")
     item_template = relationship("ItemTemplate", back_populates="inventory_items")
-    change_logs = relationship("ChangeLog", back_populates="inventory_item", cascade="all, delete-orphan")
\ No newline at end of file
+    # The entries are kept when the item goes, the database sets their inventory_item_id to NULL
+    change_logs = relationship("ChangeLog", back_populates="inventory_item", passive_deletes=True)
\ No newline at end of file
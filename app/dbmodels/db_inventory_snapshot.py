@@ -0,0 +1,21 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from app.dbmodels.db_base import BaseModel
+
+
+class InventorySnapshot(BaseModel):
+    """
+    Contents of one inventory at taken_at, folded from the quantity deltas of the change log
+    entries created before it (see app/changelog/inventory_snapshots.py)
+    """
+    __tablename__ = "inventory_snapshots"
+    __table_args__ = (
+        Index("ix_inventory_snapshots_inventory_id_taken_at", "inventory_id", "taken_at"),  # Nearest snapshot
+    )
+
+    # Inherited columns: id, created_at, updated_at
+    inventory_id = Column(UUID(as_uuid=True), ForeignKey("inventories.id", ondelete="CASCADE"), nullable=False)
+    taken_at = Column(DateTime(timezone=True), nullable=False)
+    kind = Column(String, nullable=False)  # "baseline", "compaction" or "horizon"
+    items = Column(JSONB, nullable=False)  # {item_template_id: quantity}, templates held at taken_at only
+    change_count = Column(Integer, nullable=False, default=0)  # Deltas folded in since the previous snapshot
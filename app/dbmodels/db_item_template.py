@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, ForeignKey, Numeric, Integer
+from sqlalchemy import Column, String, Text, ForeignKey, Numeric, Integer, Index, DDL, event, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from app.dbmodels.db_base import BaseModel
@@ -6,12 +6,27 @@ from app.dbmodels.db_base import BaseModel
 
 class ItemTemplate(BaseModel):
     __tablename__ = "item_templates"
+    __table_args__ = (
+        Index("ix_item_templates_system_id_updated_at", "system_id", "updated_at"),  # Catalog cache version lookup
+        Index("ix_item_templates_system_id_party_id", "system_id", "party_id"),  # Catalog reads
+        # Search: tag containment, substring/similarity matching and the most used range filters
+        Index("ix_item_templates_tags", "tags", postgresql_using="gin", postgresql_ops={"tags": "jsonb_path_ops"}),
+        Index("ix_item_templates_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+        Index(
+            "ix_item_templates_description_trgm", "description",
+            postgresql_using="gin", postgresql_ops={"description": "gin_trgm_ops"}
+        ),
+        Index("ix_item_templates_system_id_type_weight", "system_id", "type", "weight"),
+        Index("ix_item_templates_system_id_value", "system_id", "value"),
+        # Compendium import (upsert by name) and export (name order) of the system-wide templates
+        Index("ix_item_templates_system_id_name", "system_id", "name", postgresql_where=text("party_id IS NULL")),
+    )
 
     # Inherited columns: id, created_at, updated_at
     name = Column(String, nullable=False)
     description = Column(Text, nullable=True)
-    system_id = Column(UUID(as_uuid=True), ForeignKey("systems.id"), nullable=False)
-    party_id = Column(UUID(as_uuid=True), ForeignKey("parties.id"), nullable=True)
+    system_id = Column(UUID(as_uuid=True), ForeignKey("systems.id", ondelete="CASCADE"), nullable=False)
+    party_id = Column(UUID(as_uuid=True), ForeignKey("parties.id", ondelete="CASCADE"), nullable=True, index=True)
     weight = Column(Numeric(precision=10, scale=2), nullable=True)
     value = Column(Numeric(precision=10, scale=2), nullable=True)
     rarity = Column(String, nullable=True)
@@ -21,4 +36,14 @@ class ItemTemplate(BaseModel):
     # Relationships
     system = relationship("System", back_populates="item_templates")
     party = relationship("Party", back_populates="item_templates")
-    inventory_items = relationship("InventoryItem", back_populates="item_template", cascade="all, delete-orphan")
\ No newline at end of file
+    inventory_items = relationship(
+        "InventoryItem", back_populates="item_template", cascade="all, delete-orphan", passive_deletes=True
+    )
+
+
+# The trigram indexes need pg_trgm, also when the tables are made with create_all
+event.listen(
+    ItemTemplate.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql")
+)
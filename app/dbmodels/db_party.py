@@ -10,9 +10,13 @@ class Party(BaseModel):
     # Inherited columns: id, created_at, updated_at
     name = Column(String, nullable=False)
     description = Column(Text, nullable=True)
-    system_id = Column(UUID(as_uuid=True), ForeignKey("systems.id"), nullable=False)
+    system_id = Column(UUID(as_uuid=True), ForeignKey("systems.id", ondelete="CASCADE"), nullable=False, index=True)
 
     # Relationships
     system = relationship("System", back_populates="parties")
-    player_characters = relationship("PlayerCharacter", back_populates="party", cascade="all, delete-orphan")
-    item_templates = relationship("ItemTemplate", back_populates="party", cascade="all, delete-orphan")
\ No newline at end of file
+    player_characters = relationship(
+        "PlayerCharacter", back_populates="party", cascade="all, delete-orphan", passive_deletes=True
+    )
+    item_templates = relationship(
+        "ItemTemplate", back_populates="party", cascade="all, delete-orphan", passive_deletes=True
+    )
\ No newline at end of file
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, ForeignKey, Integer, Numeric
+from sqlalchemy.dialects.postgresql import UUID
+from app.dbmodels.db_base import BaseModel
+
+
+class PartyAggregate(BaseModel):
+    """Running totals over the inventories of all characters in a party (see app/aggregates)"""
+    __tablename__ = "party_aggregates"
+
+    # Inherited columns: id, created_at, updated_at
+    party_id = Column(UUID(as_uuid=True), ForeignKey("parties.id", ondelete="CASCADE"), nullable=False, unique=True)
+    total_weight = Column(Numeric(precision=14, scale=2), nullable=False, default=0)  # sum(quantity * weight)
+    total_value = Column(Numeric(precision=14, scale=2), nullable=False, default=0)  # sum(quantity * value)
+    item_count = Column(Integer, nullable=False, default=0)  # sum(quantity)
@@ -11,8 +11,8 @@ class PlayerCharacter(BaseModel):
     user_id = Column(String, nullable=False, index=True)
     name = Column(String, nullable=False)
     description = Column(Text, nullable=True)
-    system_id = Column(UUID(as_uuid=True), ForeignKey("systems.id"), nullable=False)
-    party_id = Column(UUID(as_uuid=True), ForeignKey("parties.id"), nullable=True)
+    system_id = Column(UUID(as_uuid=True), ForeignKey("systems.id", ondelete="CASCADE"), nullable=False, index=True)
+    party_id = Column(UUID(as_uuid=True), ForeignKey("parties.id", ondelete="CASCADE"), nullable=True, index=True)
 
     # Relationships with explicit foreign_keys
     system = relationship("System", back_populates="player_characters")
@@ -21,6 +21,10 @@ class PlayerCharacter(BaseModel):
     inventory = relationship(
         "Inventory",
         back_populates="player_character",
-        uselist=False  # One-to-one relationship
+        uselist=False,  # One-to-one relationship
+        cascade="all, delete-orphan",
+        passive_deletes=True
     )
-    change_logs = relationship("ChangeLog", back_populates="player_character", cascade="all, delete-orphan")
\ No newline at end of file
+    change_logs = relationship(
+        "ChangeLog", back_populates="player_character", cascade="all, delete-orphan", passive_deletes=True
+    )
\ No newline at end of file
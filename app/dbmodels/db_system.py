@@ -10,7 +10,11 @@ class System(BaseModel):
     name = Column(String, unique=True, nullable=False)
     description = Column(Text, nullable=True)
 
-    # Relationships
-    parties = relationship("Party", back_populates="system", cascade="all, delete-orphan")
-    item_templates = relationship("ItemTemplate", back_populates="system", cascade="all, delete-orphan")
-    player_characters = relationship("PlayerCharacter", back_populates="system", cascade="all, delete-orphan")
\ No newline at end of file
+    # Relationships: the ORM only deletes children it has loaded, the ON DELETE CASCADE foreign keys the rest
+    parties = relationship("Party", back_populates="system", cascade="all, delete-orphan", passive_deletes=True)
+    item_templates = relationship(
+        "ItemTemplate", back_populates="system", cascade="all, delete-orphan", passive_deletes=True
+    )
+    player_characters = relationship(
+        "PlayerCharacter", back_populates="system", cascade="all, delete-orphan", passive_deletes=True
+    )
\ No newline at end of file
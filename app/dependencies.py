@@ -1,15 +1,179 @@
-from fastapi import Depends
-from sqlalchemy.orm import Session
-from app.db import get_db
-from app.repositories import SystemRepository
-from app.services import SystemService
+from typing import Callable, Type
 
+from fastapi import Depends, Header, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db import get_async_db, AsyncSessionLocal
+from app.cache import TemplateCatalogCache, template_catalog_cache, single_flight, coalescing_settings, RequestCoalescer
+from app.changelog import ChangeLogRecorder, change_log_recorder
+from app.changestream import change_stream_hub, change_stream_settings
+from app.purge import purge_jobs, purge_settings
+from app.dbmodels import BaseModel
+from app.registry import ServiceRegistry, RequestScope
+from app.replica_routing import RoutingAsyncSession, read_replica, read_from
+from app.repositories import (
+    AsyncBaseRepository,
+    AsyncSystemRepository,
+    AsyncItemTemplateRepository,
+    AsyncInventoryRepository,
+    AsyncInventoryItemRepository,
+    AsyncInventoryAggregateRepository,
+    AsyncPartyAggregateRepository,
+    AsyncPartyRepository,
+    AsyncPlayerCharacterRepository,
+    AsyncChangeLogRepository,
+    AsyncInventorySnapshotRepository,
+    AsyncPurgeRepository
+)
+from app.services import (
+    AsyncSystemService,
+    AsyncItemTemplateService,
+    AsyncInventoryService,
+    AsyncPartyService,
+    AsyncPlayerCharacterService,
+    AsyncChangeLogService,
+    AsyncChangeStreamService,
+    AsyncCrudService,
+    AsyncBatchService,
+    AsyncPurgeService
+)
 
-def get_system_repository(db: Session = Depends(get_db)) -> SystemRepository:
-    return SystemRepository(db)
 
+async def get_user_id(x_user_id: str = Header("anonymous")) -> str:
+    """Who to attribute change log entries to, until there is real authentication"""
+    return x_user_id
 
-def get_system_service(
-    repository: SystemRepository = Depends(get_system_repository)
-) -> SystemService:
-    return SystemService(repository)
+
+# Services of the async request session. Building them from the registry keeps the per-request
+# dependency graph to one (async, so no threadpool hop) dependency per service
+service_registry = ServiceRegistry()
+service_registry.register(ChangeLogRecorder, lambda scope: change_log_recorder)
+service_registry.register(TemplateCatalogCache, lambda scope: template_catalog_cache)
+service_registry.register(
+    AsyncSystemService, lambda scope: AsyncSystemService(AsyncSystemRepository(scope.session))
+)
+service_registry.register(
+    AsyncItemTemplateService,
+    lambda scope: AsyncItemTemplateService(AsyncItemTemplateRepository(scope.session), scope.get(TemplateCatalogCache))
+)
+service_registry.register(
+    AsyncInventoryService,
+    lambda scope: AsyncInventoryService(
+        AsyncInventoryRepository(scope.session),
+        AsyncInventoryItemRepository(scope.session),
+        AsyncInventoryAggregateRepository(scope.session),
+        scope.get(AsyncItemTemplateService),
+        scope.get(ChangeLogRecorder),
+        AsyncInventorySnapshotRepository(scope.session)
+    )
+)
+service_registry.register(
+    AsyncPartyService,
+    lambda scope: AsyncPartyService(AsyncPartyRepository(scope.session), AsyncPartyAggregateRepository(scope.session))
+)
+service_registry.register(
+    AsyncPlayerCharacterService,
+    lambda scope: AsyncPlayerCharacterService(AsyncPlayerCharacterRepository(scope.session))
+)
+service_registry.register(
+    AsyncChangeLogService, lambda scope: AsyncChangeLogService(AsyncChangeLogRepository(scope.session))
+)
+service_registry.register(AsyncBatchService, AsyncBatchService)
+service_registry.register(
+    AsyncPurgeService,
+    lambda scope: AsyncPurgeService(
+        AsyncPurgeRepository(scope.session), purge_jobs, purge_settings, scope.get(TemplateCatalogCache)
+    )
+)
+
+
+async def get_request_scope(db: AsyncSession = Depends(get_async_db)):
+    """
+    The request's services. Their connection goes back to the pool as soon as the endpoint
+    returns, instead of after the response has been serialized and sent; streaming responses
+    check one out again and get_async_db closes the session after the last chunk
+    """
+    scope = service_registry.scope(db)
+    try:
+        yield scope
+    finally:
+        await scope.release()
+
+
+async def get_request_coalescer(
+    request: Request,
+    scope: RequestScope = Depends(get_request_scope, scope="function")
+) -> RequestCoalescer:
+    # Coalesced calls get their own session, on the bind of this request's session (so overrides of
+    # get_async_db apply to them too) and reading from where it reads
+    bind = scope.session.bind
+    replica = read_replica(scope.session)
+
+    def session_factory() -> AsyncSession:
+        session = RoutingAsyncSession(bind=bind, autoflush=False, expire_on_commit=False)
+        read_from(session, replica)
+        return session
+
+    return RequestCoalescer(
+        request, single_flight, coalescing_settings.key_scope, service_registry, session_factory,
+        "primary" if replica is None else "replica"
+    )
+
+
+async def get_async_system_service(
+    scope: RequestScope = Depends(get_request_scope, scope="function")
+) -> AsyncSystemService:
+    return scope.get(AsyncSystemService)
+
+
+async def get_async_item_template_service(
+    scope: RequestScope = Depends(get_request_scope, scope="function")
+) -> AsyncItemTemplateService:
+    return scope.get(AsyncItemTemplateService)
+
+
+async def get_async_inventory_service(
+    scope: RequestScope = Depends(get_request_scope, scope="function")
+) -> AsyncInventoryService:
+    return scope.get(AsyncInventoryService)
+
+
+async def get_async_party_service(
+    scope: RequestScope = Depends(get_request_scope, scope="function")
+) -> AsyncPartyService:
+    return scope.get(AsyncPartyService)
+
+
+async def get_async_player_character_service(
+    scope: RequestScope = Depends(get_request_scope, scope="function")
+) -> AsyncPlayerCharacterService:
+    return scope.get(AsyncPlayerCharacterService)
+
+
+async def get_async_change_log_service(
+    scope: RequestScope = Depends(get_request_scope, scope="function")
+) -> AsyncChangeLogService:
+    return scope.get(AsyncChangeLogService)
+
+
+async def get_async_batch_service(
+    scope: RequestScope = Depends(get_request_scope, scope="function")
+) -> AsyncBatchService:
+    return scope.get(AsyncBatchService)
+
+
+async def get_async_purge_service(
+    scope: RequestScope = Depends(get_request_scope, scope="function")
+) -> AsyncPurgeService:
+    return scope.get(AsyncPurgeService)
+
+
+def get_async_crud_service(model: Type[BaseModel]) -> Callable[..., AsyncCrudService]:
+    """Dependency for the generic list/get service of one model"""
+    async def get_service(scope: RequestScope = Depends(get_request_scope, scope="function")) -> AsyncCrudService:
+        return AsyncCrudService(AsyncBaseRepository(model, scope.session))
+    return get_service
+
+
+async def get_async_change_stream_service() -> AsyncChangeStreamService:
+    # No request session: a stream can stay open for hours and would hold a pooled connection throughout
+    return AsyncChangeStreamService(AsyncSessionLocal, change_stream_hub, change_stream_settings)
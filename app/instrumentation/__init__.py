@@ -0,0 +1,18 @@
+from app.settings import InstrumentationSettings
+from .request_stats import RequestStats, current_request_stats, record_connection_acquire
+from .sql_metrics import SQLMetrics
+from .sql_instrumentation import SQLInstrumentation
+from .sql_middleware import SQLInstrumentationMiddleware
+
+# Shared by the engine hooks, the middleware and /metrics
+sql_instrumentation = SQLInstrumentation(InstrumentationSettings.from_env())
+
+__all__ = [
+    "RequestStats",
+    "current_request_stats",
+    "record_connection_acquire",
+    "SQLMetrics",
+    "SQLInstrumentation",
+    "SQLInstrumentationMiddleware",
+    "sql_instrumentation"
+]
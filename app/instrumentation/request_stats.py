@@ -0,0 +1,53 @@
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+
+@dataclass
+class RequestStats:
+    """SQL activity of one request, filled in by the engine and pool hooks"""
+    path: str = ""
+    query_count: int = 0
+    db_time: float = 0.0
+    acquire_time: float = 0.0
+    hold_time: float = 0.0  # Checkout to checkin, summed over the connections the request used
+    connections: int = 0
+    slowest_time: float = 0.0
+    slowest_statement: Optional[str] = None
+    statement_counts: Counter = field(default_factory=Counter)
+
+    def record_query(self, statement: str, seconds: float) -> None:
+        self.query_count += 1
+        self.db_time += seconds
+        self.statement_counts[statement] += 1
+        if seconds > self.slowest_time:
+            self.slowest_time = seconds
+            self.slowest_statement = statement
+
+    def record_connection_hold(self, seconds: float) -> None:
+        self.connections += 1
+        self.hold_time += seconds
+
+    def repeated_statements(self, threshold: int) -> List[Tuple[str, int]]:
+        """Statements executed at least threshold times, the typical N+1 pattern"""
+        return [(statement, count) for statement, count in self.statement_counts.most_common() if count >= threshold]
+
+    def server_timing(self) -> str:
+        """Value of the Server-Timing header, durations in milliseconds"""
+        return (
+            f'db;desc="{self.query_count} queries";dur={self.db_time * 1000:.3f}, '
+            f'db-acquire;dur={self.acquire_time * 1000:.3f}, '
+            f'db-hold;desc="{self.connections} connections";dur={self.hold_time * 1000:.3f}, '
+            f'db-slowest;dur={self.slowest_time * 1000:.3f}'
+        )
+
+
+# Set by the middleware for the duration of a request, None outside of requests
+current_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("current_request_stats", default=None)
+
+
+def record_connection_acquire(seconds: float) -> None:
+    stats = current_request_stats.get()
+    if stats is not None:
+        stats.acquire_time += seconds
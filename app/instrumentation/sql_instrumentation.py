@@ -0,0 +1,61 @@
+import logging
+import time
+from typing import Any, Dict
+
+from sqlalchemy import Engine, event
+
+from app.instrumentation.request_stats import RequestStats, current_request_stats
+from app.instrumentation.sql_metrics import SQLMetrics
+from app.settings import InstrumentationSettings
+
+logger = logging.getLogger(__name__)
+
+_START_KEY = "_instrumentation_start"
+
+
+def _shorten(statement: str, limit: int = 500) -> str:
+    statement = " ".join(statement.split())
+    return statement if len(statement) <= limit else statement[:limit] + "..."
+
+
+class SQLInstrumentation:
+    """Engine event hooks timing every statement, feeding the per-request stats, the slow query log and the metrics"""
+
+    def __init__(self, settings: InstrumentationSettings):
+        self.settings = settings
+        self.metrics = SQLMetrics()
+
+    def instrument(self, engine: Engine) -> None:
+        """Listen on an engine, for an AsyncEngine pass its sync_engine"""
+        if not event.contains(engine, "before_cursor_execute", self._before_cursor_execute):
+            event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+            event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def _before_cursor_execute(self, connection, cursor, statement, parameters, context, executemany) -> None:
+        setattr(context, _START_KEY, time.perf_counter())
+
+    def _after_cursor_execute(self, connection, cursor, statement, parameters, context, executemany) -> None:
+        seconds = time.perf_counter() - getattr(context, _START_KEY)
+        stats = current_request_stats.get()
+        if stats is not None:
+            stats.record_query(statement, seconds)
+        if self.settings.slow_query_ms and seconds * 1000 >= self.settings.slow_query_ms:
+            self.metrics.record_slow_query()
+            logger.warning(
+                "Slow query (%.1f ms)%s: %s",
+                seconds * 1000, f" in {stats.path}" if stats is not None else "", _shorten(statement)
+            )
+
+    def finish_request(self, scope: Dict[str, Any], stats: RequestStats) -> None:
+        """Report the stats of a finished request: N+1 warnings and the per-route metrics"""
+        route = scope.get("route")
+        route_path = getattr(route, "path", "unmatched")
+        repeated = []
+        if self.settings.n_plus_one_threshold:
+            repeated = stats.repeated_statements(self.settings.n_plus_one_threshold)
+        for statement, count in repeated:
+            logger.warning(
+                "Possible N+1 in %s %s: statement executed %d times: %s",
+                scope["method"], stats.path, count, _shorten(statement)
+            )
+        self.metrics.observe(scope["method"], route_path, stats, n_plus_one=bool(repeated))
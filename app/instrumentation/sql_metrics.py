@@ -0,0 +1,98 @@
+import threading
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Tuple
+
+from app.instrumentation.request_stats import RequestStats
+
+# Upper bounds in seconds of the per-request DB time histogram
+DB_TIME_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+@dataclass
+class _RouteMetrics:
+    requests: int = 0
+    queries: int = 0
+    db_seconds: float = 0.0
+    acquire_seconds: float = 0.0
+    hold_seconds: float = 0.0
+    n_plus_one: int = 0
+    db_time_buckets: List[int] = field(default_factory=lambda: [0] * len(DB_TIME_BUCKETS))
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class SQLMetrics:
+    """Process-wide SQL totals per route, rendered in the Prometheus text format"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes: Dict[Tuple[str, str], _RouteMetrics] = defaultdict(_RouteMetrics)
+        self.slow_queries = 0
+
+    def observe(self, method: str, route: str, stats: RequestStats, n_plus_one: bool) -> None:
+        with self._lock:
+            metrics = self._routes[(method, route)]
+            metrics.requests += 1
+            metrics.queries += stats.query_count
+            metrics.db_seconds += stats.db_time
+            metrics.acquire_seconds += stats.acquire_time
+            metrics.hold_seconds += stats.hold_time
+            metrics.n_plus_one += int(n_plus_one)
+            for index, upper_bound in enumerate(DB_TIME_BUCKETS):
+                if stats.db_time <= upper_bound:
+                    metrics.db_time_buckets[index] += 1
+
+    def record_slow_query(self) -> None:
+        with self._lock:
+            self.slow_queries += 1
+
+    def render(self, pools: Dict[str, Dict[str, Any]]) -> str:
+        """Prometheus exposition text, including the current pool statistics per engine"""
+        lines = []
+
+        def family(name: str, kind: str, help_text: str) -> None:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        with self._lock:
+            routes = sorted(self._routes.items())
+            counters = [
+                ("http_requests_total", "Requests handled", lambda m: m.requests),
+                ("db_queries_total", "SQL statements executed", lambda m: m.queries),
+                ("db_query_seconds_total", "Time spent executing SQL statements", lambda m: m.db_seconds),
+                ("db_connection_acquire_seconds_total", "Time spent waiting for a pooled connection", lambda m: m.acquire_seconds),
+                ("db_connection_hold_seconds_total", "Time pooled connections were checked out", lambda m: m.hold_seconds),
+                ("db_n_plus_one_requests_total", "Requests that repeated one statement past the N+1 threshold", lambda m: m.n_plus_one),
+            ]
+            for name, help_text, value in counters:
+                family(name, "counter", help_text)
+                for (method, route), metrics in routes:
+                    lines.append(f'{name}{{method="{method}",route="{_label(route)}"}} {value(metrics)}')
+
+            family("db_request_seconds", "histogram", "SQL time per request")
+            for (method, route), metrics in routes:
+                labels = f'method="{method}",route="{_label(route)}"'
+                for upper_bound, count in zip(DB_TIME_BUCKETS, metrics.db_time_buckets):
+                    lines.append(f'db_request_seconds_bucket{{{labels},le="{upper_bound}"}} {count}')
+                lines.append(f'db_request_seconds_bucket{{{labels},le="+Inf"}} {metrics.requests}')
+                lines.append(f"db_request_seconds_sum{{{labels}}} {metrics.db_seconds}")
+                lines.append(f"db_request_seconds_count{{{labels}}} {metrics.requests}")
+
+            family("db_slow_queries_total", "counter", "Statements slower than slow_query_ms")
+            lines.append(f"db_slow_queries_total {self.slow_queries}")
+
+        gauges = [
+            ("db_pool_checked_out", "checked_out", "Connections in use"),
+            ("db_pool_checked_in", "checked_in", "Idle pooled connections"),
+            ("db_pool_overflow", "overflow", "Connections opened beyond pool_size"),
+            ("db_pool_checkouts_total", "checkouts", "Connection checkouts"),
+        ]
+        for name, key, help_text in gauges:
+            family(name, "counter" if name.endswith("_total") else "gauge", help_text)
+            for engine_name, stats in sorted(pools.items()):
+                if key in stats:
+                    lines.append(f'{name}{{engine="{engine_name}"}} {stats[key]}')
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,37 @@
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.instrumentation.request_stats import RequestStats, current_request_stats
+from app.instrumentation.sql_instrumentation import SQLInstrumentation
+
+
+class SQLInstrumentationMiddleware:
+    """
+    Collects the SQL stats of each HTTP request and adds them as a Server-Timing header.
+    Plain ASGI instead of BaseHTTPMiddleware, so the context variable is set in the same context
+    the endpoint (and the engine hooks) run in. Streaming responses send their headers first,
+    their header only covers the queries made before the body, the metrics cover all of them.
+    """
+
+    def __init__(self, app: ASGIApp, instrumentation: SQLInstrumentation):
+        self.app = app
+        self.instrumentation = instrumentation
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(path=scope["path"])
+        token = current_request_stats.set(stats)
+
+        async def send_with_server_timing(message: Message) -> None:
+            if message["type"] == "http.response.start" and self.instrumentation.settings.server_timing:
+                MutableHeaders(scope=message).append("Server-Timing", stats.server_timing())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_server_timing)
+        finally:
+            current_request_stats.reset(token)
+            self.instrumentation.finish_request(scope, stats)
@@ -1,5 +1,17 @@
 from .system_mapper import SystemMapper
+from .item_template_mapper import ItemTemplateMapper
+from .inventory_mapper import InventoryMapper
+from .aggregate_mapper import AggregateMapper
+from .player_character_mapper import PlayerCharacterMapper
+from .party_mapper import PartyMapper
+from .change_log_mapper import ChangeLogMapper
 
 __all__ = [
-    "SystemMapper"
-]
\ No newline at end of file
+    "SystemMapper",
+    "ItemTemplateMapper",
+    "InventoryMapper",
+    "AggregateMapper",
+    "PlayerCharacterMapper",
+    "PartyMapper",
+    "ChangeLogMapper"
+]
@@ -0,0 +1,20 @@
+from decimal import Decimal
+from typing import Optional, Union
+
+from app.apimodels import APIAggregateTotals
+from app.dbmodels import InventoryAggregate, PartyAggregate
+
+
+class AggregateMapper:
+    @staticmethod
+    def aggregate_to_api_aggregate_totals(
+        aggregate: Optional[Union[InventoryAggregate, PartyAggregate]]
+    ) -> APIAggregateTotals:
+        # No aggregate row yet means nothing has been added
+        if aggregate is None:
+            return APIAggregateTotals(total_weight=Decimal("0"), total_value=Decimal("0"), item_count=0)
+        return APIAggregateTotals(
+            total_weight=aggregate.total_weight,
+            total_value=aggregate.total_value,
+            item_count=aggregate.item_count
+        )
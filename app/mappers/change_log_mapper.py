@@ -0,0 +1,25 @@
+from typing import List
+
+from app.apimodels import APIChangeLogResponse
+from app.dbmodels import ChangeLog
+
+
+class ChangeLogMapper:
+    @staticmethod
+    def change_log_to_api_change_log_response(change_log: ChangeLog) -> APIChangeLogResponse:
+        return APIChangeLogResponse(
+            id=change_log.id,
+            created_at=change_log.created_at,
+            user_id=change_log.user_id,
+            player_character_id=change_log.player_character_id,
+            inventory_id=change_log.inventory_id,
+            inventory_item_id=change_log.inventory_item_id,
+            action=change_log.action,
+            description=change_log.description,
+            item_template_id=change_log.item_template_id,
+            quantity_delta=change_log.quantity_delta
+        )
+
+    @staticmethod
+    def change_logs_to_api_change_log_responses(change_logs: List[ChangeLog]) -> List[APIChangeLogResponse]:
+        return [ChangeLogMapper.change_log_to_api_change_log_response(change_log) for change_log in change_logs]
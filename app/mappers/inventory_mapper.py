@@ -0,0 +1,120 @@
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+from uuid import UUID
+
+from sqlalchemy import Row
+
+from app.apimodels import (
+    APIInventoryItemResponse,
+    APIInventoryResponse,
+    APIItemTemplateResponse,
+    APIInventoryItemQuantity,
+    APIInventoryItemAsOf,
+    APIInventoryAsOfResponse
+)
+from app.dbmodels import Inventory, InventoryItem
+from app.mappers.item_template_mapper import ItemTemplateMapper
+from app.mappers.row_mapping import response_columns, rows_to_payloads
+
+
+class InventoryMapper:
+    # Columns to select for inventory_rows_to_payload, in APIInventoryItemResponse field order
+    api_item_response_columns = response_columns(InventoryItem, APIInventoryItemResponse)
+    api_item_response_keys = tuple(column.key for column in api_item_response_columns)
+
+    @staticmethod
+    def inventory_item_to_api_inventory_item_response(
+        inventory_item: InventoryItem,
+        templates: Dict[UUID, APIItemTemplateResponse]
+    ) -> APIInventoryItemResponse:
+        return APIInventoryItemResponse(
+            id=inventory_item.id,
+            inventory_id=inventory_item.inventory_id,
+            item_template_id=inventory_item.item_template_id,
+            quantity=inventory_item.quantity,
+            item_template=templates.get(inventory_item.item_template_id)
+        )
+
+    @staticmethod
+    def inventory_to_api_inventory_response(
+        inventory: Inventory,
+        inventory_items: List[InventoryItem],
+        templates: Dict[UUID, APIItemTemplateResponse]
+    ) -> APIInventoryResponse:
+        return APIInventoryResponse(
+            id=inventory.id,
+            player_character_id=inventory.player_character_id,
+            items=[
+                InventoryMapper.inventory_item_to_api_inventory_item_response(inventory_item, templates)
+                for inventory_item in inventory_items
+            ]
+        )
+
+    @staticmethod
+    def loaded_inventory_to_api_inventory_response(inventory: Inventory) -> APIInventoryResponse:
+        """Map an inventory whose items and their templates were eager loaded"""
+        templates = {
+            inventory_item.item_template_id: ItemTemplateMapper.item_template_to_api_item_template_response(inventory_item.item_template)
+            for inventory_item in inventory.inventory_items
+            if inventory_item.item_template is not None
+        }
+        return InventoryMapper.inventory_to_api_inventory_response(inventory, inventory.inventory_items, templates)
+
+    @staticmethod
+    def inventory_rows_to_payload(
+        inventory: Inventory,
+        rows: Iterable[Row],
+        templates: Dict[UUID, APIItemTemplateResponse]
+    ) -> Dict[str, Any]:
+        """
+        APIInventoryResponse-shaped dict from item rows selected with api_item_response_columns.
+        Every distinct template is dumped once and shared by all items referencing it
+        """
+        template_payloads: Dict[UUID, Optional[Dict[str, Any]]] = {}
+        items = rows_to_payloads(rows, InventoryMapper.api_item_response_keys)
+        for item in items:
+            item_template_id = item["item_template_id"]
+            if item_template_id not in template_payloads:
+                template = templates.get(item_template_id)
+                template_payloads[item_template_id] = None if template is None else template.model_dump()
+            item["item_template"] = template_payloads[item_template_id]
+        return {"id": inventory.id, "player_character_id": inventory.player_character_id, "items": items}
+
+    @staticmethod
+    def quantity_rows_to_api_inventory_item_quantities(rows: Iterable[Row]) -> List[APIInventoryItemQuantity]:
+        """Map the rows returned by apply_quantity_deltas, removed items lose their id"""
+        return [
+            APIInventoryItemQuantity(
+                id=row.id if row.quantity else None,
+                inventory_id=row.inventory_id,
+                item_template_id=row.item_template_id,
+                quantity=row.quantity
+            )
+            for row in rows
+        ]
+
+    @staticmethod
+    def snapshot_items_to_api_inventory_as_of_response(
+        inventory: Inventory,
+        as_of: datetime,
+        snapshot_taken_at: Optional[datetime],
+        replayed_changes: int,
+        items: Dict[str, int],
+        templates: Dict[UUID, APIItemTemplateResponse]
+    ) -> APIInventoryAsOfResponse:
+        """Map the {item_template_id: quantity} items folded by the as-of view"""
+        return APIInventoryAsOfResponse(
+            id=inventory.id,
+            player_character_id=inventory.player_character_id,
+            as_of=as_of,
+            snapshot_taken_at=snapshot_taken_at,
+            replayed_changes=replayed_changes,
+            items=[
+                APIInventoryItemAsOf(
+                    item_template_id=UUID(item_template_id),
+                    quantity=quantity,
+                    item_template=templates.get(UUID(item_template_id))
+                )
+                for item_template_id, quantity in items.items()
+            ]
+        )
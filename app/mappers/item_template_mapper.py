@@ -0,0 +1,50 @@
+import uuid
+from typing import Any, Dict, Iterable, List
+
+from sqlalchemy import Row
+
+from app.apimodels import APIItemTemplate, APIItemTemplateResponse, APIItemTemplateImportRow
+from app.compendium import COLUMNS as COMPENDIUM_COLUMNS
+from app.dbmodels import ItemTemplate
+from app.mappers.row_mapping import response_columns, rows_to_payloads
+
+
+class ItemTemplateMapper:
+    # Columns to select for item_template_rows_to_payloads, in APIItemTemplateResponse field order
+    api_response_columns = response_columns(ItemTemplate, APIItemTemplateResponse)
+    api_response_keys = tuple(column.key for column in api_response_columns)
+    # Columns to select for a compendium export, in file column order
+    compendium_columns = tuple(getattr(ItemTemplate, name) for name in COMPENDIUM_COLUMNS)
+
+    @staticmethod
+    def api_item_template_to_item_template(api_item_template: APIItemTemplate) -> ItemTemplate:
+        return ItemTemplate(**api_item_template.model_dump())
+
+    @staticmethod
+    def item_template_to_api_item_template_response(item_template: ItemTemplate) -> APIItemTemplateResponse:
+        return APIItemTemplateResponse(
+            id=item_template.id,
+            name=item_template.name,
+            description=item_template.description,
+            system_id=item_template.system_id,
+            party_id=item_template.party_id,
+            weight=item_template.weight,
+            value=item_template.value,
+            rarity=item_template.rarity,
+            type=item_template.type,
+            tags=item_template.tags
+        )
+
+    @staticmethod
+    def item_templates_to_api_item_template_responses(item_templates: List[ItemTemplate]) -> List[APIItemTemplateResponse]:
+        return [ItemTemplateMapper.item_template_to_api_item_template_response(item_template) for item_template in item_templates]
+
+    @staticmethod
+    def item_template_rows_to_payloads(rows: Iterable[Row]) -> List[Dict[str, Any]]:
+        """APIItemTemplateResponse-shaped dicts from rows selected with api_response_columns"""
+        return rows_to_payloads(rows, ItemTemplateMapper.api_response_keys)
+
+    @staticmethod
+    def import_row_to_staged_row(line: int, import_row: APIItemTemplateImportRow) -> Dict[str, Any]:
+        """Staging table row of a validated compendium row; the id is only used if the name is new"""
+        return {"line": line, "id": uuid.uuid4(), **import_row.model_dump()}
@@ -0,0 +1,28 @@
+from app.apimodels import APIPartyResponse, APIPartyOverviewResponse
+from app.dbmodels import Party
+from app.mappers.player_character_mapper import PlayerCharacterMapper
+
+
+class PartyMapper:
+    @staticmethod
+    def party_to_api_party_response(party: Party) -> APIPartyResponse:
+        return APIPartyResponse(
+            id=party.id,
+            name=party.name,
+            description=party.description,
+            system_id=party.system_id
+        )
+
+    @staticmethod
+    def party_to_api_party_overview_response(party: Party) -> APIPartyOverviewResponse:
+        """Map a party loaded with the "party_overview" profile"""
+        return APIPartyOverviewResponse(
+            id=party.id,
+            name=party.name,
+            description=party.description,
+            system_id=party.system_id,
+            player_characters=[
+                PlayerCharacterMapper.player_character_to_api_character_sheet_response(player_character)
+                for player_character in party.player_characters
+            ]
+        )
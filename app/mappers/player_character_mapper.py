@@ -0,0 +1,30 @@
+from app.apimodels import APIPlayerCharacterResponse, APICharacterSheetResponse
+from app.dbmodels import PlayerCharacter
+from app.mappers.inventory_mapper import InventoryMapper
+
+
+class PlayerCharacterMapper:
+    @staticmethod
+    def player_character_to_api_player_character_response(player_character: PlayerCharacter) -> APIPlayerCharacterResponse:
+        return APIPlayerCharacterResponse(
+            id=player_character.id,
+            user_id=player_character.user_id,
+            name=player_character.name,
+            description=player_character.description,
+            system_id=player_character.system_id,
+            party_id=player_character.party_id
+        )
+
+    @staticmethod
+    def player_character_to_api_character_sheet_response(player_character: PlayerCharacter) -> APICharacterSheetResponse:
+        """Map a character loaded with the "sheet" profile"""
+        inventory = player_character.inventory
+        return APICharacterSheetResponse(
+            id=player_character.id,
+            user_id=player_character.user_id,
+            name=player_character.name,
+            description=player_character.description,
+            system_id=player_character.system_id,
+            party_id=player_character.party_id,
+            inventory=InventoryMapper.loaded_inventory_to_api_inventory_response(inventory) if inventory is not None else None
+        )
@@ -0,0 +1,20 @@
+from typing import Any, Dict, Iterable, List, Sequence, Tuple, Type
+
+from pydantic import BaseModel as PydanticModel
+from sqlalchemy import Row
+from sqlalchemy.orm import InstrumentedAttribute
+
+from app.dbmodels import BaseModel
+
+
+def response_columns(model: Type[BaseModel], api_model: Type[PydanticModel]) -> Tuple[InstrumentedAttribute, ...]:
+    """The columns of a model named like the fields of a response model, in field order"""
+    return tuple(getattr(model, name) for name in api_model.model_fields if name in model.__table__.columns)
+
+
+def rows_to_payloads(rows: Iterable[Row], keys: Sequence[str]) -> List[Dict[str, Any]]:
+    """
+    Response payloads straight from Row tuples whose leading columns match keys.
+    No Pydantic model per row: the columns already have the types of the response model
+    """
+    return [dict(zip(keys, row)) for row in rows]
@@ -1,7 +1,16 @@
+from typing import Any, Dict, Iterable, List
+
+from sqlalchemy import Row
+
 from app.apimodels import APISystem, APISystemResponse
 from app.dbmodels import System
+from app.mappers.row_mapping import response_columns, rows_to_payloads
 
 class SystemMapper:
+    # Columns to select for system_rows_to_payloads, in APISystemResponse field order
+    api_response_columns = response_columns(System, APISystemResponse)
+    api_response_keys = tuple(column.key for column in api_response_columns)
+
     @staticmethod
     def api_system_to_system(api_system: APISystem) -> System:
         return System(name=api_system.name, description=api_system.description)
@@ -12,4 +21,17 @@ class SystemMapper:
             id=system.id,
             name=system.name,
             description=system.description
-        )
\ No newline at end of file
+        )
+
+    @staticmethod
+    def api_systems_to_systems(api_systems: List[APISystem]) -> List[System]:
+        return [SystemMapper.api_system_to_system(api_system) for api_system in api_systems]
+
+    @staticmethod
+    def systems_to_api_system_responses(systems: List[System]) -> List[APISystemResponse]:
+        return [SystemMapper.system_to_api_system_response(system) for system in systems]
+
+    @staticmethod
+    def system_rows_to_payloads(rows: Iterable[Row]) -> List[Dict[str, Any]]:
+        """APISystemResponse-shaped dicts from rows selected with api_response_columns"""
+        return rows_to_payloads(rows, SystemMapper.api_response_keys)
@@ -0,0 +1,144 @@
+import threading
+import time
+import uuid
+from typing import Any, Dict
+
+from sqlalchemy import Engine
+from sqlalchemy.pool import NullPool, QueuePool, AsyncAdaptedQueuePool
+
+from app.instrumentation.request_stats import current_request_stats, record_connection_acquire
+from app.settings import DatabaseSettings
+
+
+# Connection record info key: when the current checkout started and the request it belongs to
+_HELD_SINCE_KEY = "held_since"
+
+
+class PoolWaitStats:
+    """Thread-safe running totals of how long checkouts waited for a pooled connection and how long they held it"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.checkins = 0
+        self.total_hold = 0.0
+        self.max_hold = 0.0
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait += seconds
+            self.max_wait = max(self.max_wait, seconds)
+
+    def record_hold(self, seconds: float) -> None:
+        with self._lock:
+            self.checkins += 1
+            self.total_hold += seconds
+            self.max_hold = max(self.max_hold, seconds)
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            average = self.total_wait / self.checkouts if self.checkouts else 0.0
+            average_hold = self.total_hold / self.checkins if self.checkins else 0.0
+            return {
+                "checkouts": self.checkouts,
+                "wait_time_total_ms": round(self.total_wait * 1000, 3),
+                "wait_time_avg_ms": round(average * 1000, 3),
+                "wait_time_max_ms": round(self.max_wait * 1000, 3),
+                "hold_time_total_ms": round(self.total_hold * 1000, 3),
+                "hold_time_avg_ms": round(average_hold * 1000, 3),
+                "hold_time_max_ms": round(self.max_hold * 1000, 3),
+            }
+
+
+class _TimedPoolMixin:
+    """
+    Measures the time spent in _do_get, which includes waiting for a free connection, and how
+    long the connection is held until it is returned, per pool and per request
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_stats = PoolWaitStats()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            record = super()._do_get()
+        finally:
+            seconds = time.perf_counter() - start
+            self.wait_stats.record(seconds)
+            record_connection_acquire(seconds)
+        # The request is remembered with the checkout, the connection may be returned from another context
+        record.info[_HELD_SINCE_KEY] = (time.perf_counter(), current_request_stats.get())
+        return record
+
+    def _do_return_conn(self, record) -> None:
+        held_since = record.info.pop(_HELD_SINCE_KEY, None)
+        if held_since is not None:
+            started, request_stats = held_since
+            seconds = time.perf_counter() - started
+            self.wait_stats.record_hold(seconds)
+            if request_stats is not None:
+                request_stats.record_connection_hold(seconds)
+        super()._do_return_conn(record)
+
+
+class TimedQueuePool(_TimedPoolMixin, QueuePool):
+    pass
+
+
+class TimedAsyncAdaptedQueuePool(_TimedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+class TimedNullPool(_TimedPoolMixin, NullPool):
+    pass
+
+
+def engine_options(settings: DatabaseSettings, is_async: bool) -> Dict[str, Any]:
+    """Keyword arguments for create_engine / create_async_engine for the configured pool mode"""
+    options: Dict[str, Any] = {
+        "echo": settings.echo,
+        "pool_pre_ping": settings.pool_pre_ping,
+    }
+    if settings.pool_mode == "null":
+        options["poolclass"] = TimedNullPool
+        return options
+
+    options.update(
+        poolclass=TimedAsyncAdaptedQueuePool if is_async else TimedQueuePool,
+        pool_size=settings.pool_size,
+        max_overflow=settings.max_overflow,
+        pool_timeout=settings.pool_timeout,
+        pool_recycle=settings.pool_recycle,
+    )
+    if settings.pool_mode == "transaction_pooler" and is_async:
+        # PgBouncer in transaction mode hands each transaction to a different server connection,
+        # so asyncpg must not cache prepared statements and needs unique statement names
+        options["connect_args"] = {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+        }
+    # psycopg2 does not use server-side prepared statements, so the sync engine needs no changes
+    return options
+
+
+def pool_statistics(engine: Engine) -> Dict[str, Any]:
+    """Current usage of an engine's pool (checked out, overflow, wait time)"""
+    pool = engine.pool
+    stats: Dict[str, Any] = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=max(pool.overflow(), 0),  # QueuePool counts up from -pool_size
+        )
+    wait_stats = getattr(pool, "wait_stats", None)
+    if wait_stats is not None:
+        stats.update(wait_stats.to_dict())
+    return stats
@@ -0,0 +1,22 @@
+from app.cache import InMemoryLRUCache, RedisCacheBackend, cache_settings, template_catalog_cache
+from app.db import AsyncSessionLocal
+from app.settings import PurgeSettings
+from .purge_jobs import PurgeJobRunner
+
+purge_settings = PurgeSettings.from_env()
+
+# Progress in Redis when the caches use it, so every worker can answer for every job; jobs are
+# cancelled on shutdown, see main.py
+purge_jobs = PurgeJobRunner(
+    AsyncSessionLocal,
+    purge_settings,
+    RedisCacheBackend(cache_settings.redis_url) if cache_settings.backend == "redis" and cache_settings.redis_url
+    else InMemoryLRUCache(max_entries=10_000),
+    template_catalog_cache
+)
+
+__all__ = [
+    "PurgeJobRunner",
+    "purge_settings",
+    "purge_jobs"
+]
@@ -0,0 +1,145 @@
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.cache import CacheBackend, TemplateCatalogCache
+from app.repositories import AsyncPurgeRepository, PurgePlan
+from app.settings import PurgeSettings
+
+logger = logging.getLogger(__name__)
+
+
+class PurgeJobRunner:
+    """
+    Deletes big subtrees in the background, chunk_size rows per transaction, so no statement
+    holds locks on (or writes WAL for) a whole campaign at once and requests keep going in between.
+
+    Progress is kept in a CacheBackend for job_ttl_seconds; with Redis every worker can report on
+    a job. The task runs in the worker that started it: when that worker stops, the job ends up
+    "cancelled" and deleting the row again resumes where it stopped, as every chunk only deletes
+    what is left.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker,
+        settings: PurgeSettings,
+        backend: CacheBackend,
+        catalog_cache: TemplateCatalogCache
+    ):
+        self.session_factory = session_factory
+        self.settings = settings
+        self.backend = backend
+        self.catalog_cache = catalog_cache
+        self._tasks: Dict[UUID, asyncio.Task] = {}
+        self._running: Dict[Tuple[str, UUID], Dict[str, Any]] = {}  # Job of each root being purged here
+        self.started = 0
+        self.finished = 0
+        self.failed = 0
+        self.rows_deleted = 0
+
+    @staticmethod
+    def _job_key(job_id: UUID) -> str:
+        return f"purge-job:{job_id}"
+
+    async def _save(self, job: Dict[str, Any]) -> None:
+        total, deleted = sum(job["total_rows"].values()), sum(job["deleted_rows"].values())
+        if job["status"] == "done":
+            job["progress"] = 1.0
+        elif total:
+            # Rows added to the subtree while it is purged can take deleted past the count
+            job["progress"] = round(min(deleted / total, 1.0), 4)
+        await self.backend.set(self._job_key(job["id"]), dict(job), self.settings.job_ttl_seconds)
+
+    async def get(self, job_id: UUID) -> Optional[Dict[str, Any]]:
+        return await self.backend.get(self._job_key(job_id))
+
+    async def start(self, plan: PurgePlan, catalog_system_id: Optional[UUID]) -> Dict[str, Any]:
+        """Queue the purge of plan's root, or return the job already purging it in this worker"""
+        running = self._running.get((plan.kind, plan.root_id))
+        if running is not None:
+            return dict(running)
+        job: Dict[str, Any] = {
+            "id": uuid.uuid4(),
+            "kind": plan.kind,
+            "root_id": plan.root_id,
+            "status": "queued",
+            "total_rows": {},
+            "deleted_rows": {step.model.__tablename__: 0 for step in plan.steps},
+            "progress": 0.0,
+            "created_at": datetime.now(timezone.utc),
+            "finished_at": None,
+            "error": None,
+        }
+        await self._save(job)
+        self._running[(plan.kind, plan.root_id)] = job
+        self._tasks[job["id"]] = asyncio.create_task(
+            self._run(job, plan, catalog_system_id), name=f"purge-{plan.kind}-{plan.root_id}"
+        )
+        self.started += 1
+        return dict(job)
+
+    async def _run(self, job: Dict[str, Any], plan: PurgePlan, catalog_system_id: Optional[UUID]) -> None:
+        try:
+            async with self.session_factory() as session:
+                job["total_rows"] = await AsyncPurgeRepository(session).count(plan)
+            job["status"] = "running"
+            await self._save(job)
+
+            for step in plan.steps:
+                table = step.model.__tablename__
+                while True:
+                    async with self.session_factory() as session:
+                        deleted = await AsyncPurgeRepository(session).delete_chunk(step, self.settings.chunk_size)
+                        await session.commit()
+                    job["deleted_rows"][table] += deleted
+                    self.rows_deleted += deleted
+                    await self._save(job)
+                    if deleted < self.settings.chunk_size:
+                        break
+                    if self.settings.pause_seconds:
+                        await asyncio.sleep(self.settings.pause_seconds)
+            job["status"] = "done"
+            self.finished += 1
+        except asyncio.CancelledError:
+            job["status"] = "cancelled"
+            raise
+        except Exception as e:
+            logger.exception("Purge of %s %s failed", plan.kind, plan.root_id)
+            job["status"] = "failed"
+            job["error"] = f"{type(e).__name__}: {e}"
+            self.failed += 1
+        finally:
+            job["finished_at"] = datetime.now(timezone.utc)
+            self._running.pop((plan.kind, plan.root_id), None)
+            self._tasks.pop(job["id"], None)
+            # Shielded, so a cancelled job still records how far it got
+            await asyncio.shield(self._finish(job, catalog_system_id))
+
+    async def _finish(self, job: Dict[str, Any], catalog_system_id: Optional[UUID]) -> None:
+        if catalog_system_id is not None and job["deleted_rows"].get("item_templates"):
+            await self.catalog_cache.invalidate(catalog_system_id, job["finished_at"])
+        await self._save(job)
+
+    async def stop(self) -> None:
+        """Cancel the jobs of this worker, e.g. on shutdown"""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": len(self._running),
+            "started": self.started,
+            "finished": self.finished,
+            "failed": self.failed,
+            "rows_deleted": self.rows_deleted,
+            "chunk_size": self.settings.chunk_size,
+            "inline_limit": self.settings.inline_limit,
+        }
@@ -0,0 +1,51 @@
+from typing import Any, Callable, Dict, Type, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+T = TypeVar("T")
+
+
+class ServiceRegistry:
+    """
+    How to build each service, and the repositories behind it, from a request session. Declared
+    once at import, so a request only builds the services its endpoint asks for instead of
+    FastAPI resolving a tree of repository and service dependencies for every request
+    """
+
+    def __init__(self):
+        self._factories: Dict[type, Callable[["RequestScope"], Any]] = {}
+
+    def register(self, service_type: Type[T], factory: Callable[["RequestScope"], T]) -> None:
+        self._factories[service_type] = factory
+
+    def scope(self, session: AsyncSession) -> "RequestScope":
+        return RequestScope(self, session)
+
+
+class RequestScope:
+    """The services of one request around its one session, each built on first use"""
+    __slots__ = ("registry", "session", "_instances")
+
+    def __init__(self, registry: ServiceRegistry, session: AsyncSession):
+        self.registry = registry
+        self.session = session
+        self._instances: Dict[type, Any] = {}
+
+    def provide(self, service_type: Type[T], instance: T) -> None:
+        """Use instance instead of what the registry would build, for this scope only"""
+        self._instances[service_type] = instance
+
+    def get(self, service_type: Type[T]) -> T:
+        instance = self._instances.get(service_type)
+        if instance is None:
+            instance = self.registry._factories[service_type](self)
+            self._instances[service_type] = instance
+        return instance
+
+    async def release(self) -> None:
+        """
+        Give the session's connection back to the pool. Reads leave their transaction open until
+        then; the session stays usable, a later statement checks out a connection again
+        """
+        if self.session.in_transaction():
+            await self.session.close()
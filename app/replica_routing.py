@@ -0,0 +1,147 @@
+import itertools
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import Select, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import Session
+
+from app.cache import CacheBackend
+from app.settings import ReplicaSettings
+
+_REPLICA_KEY = "replica"
+_DEFER_COMMITS_KEY = "defer_commits"
+
+
+def _is_read(clause: Any) -> bool:
+    """Plain SELECTs only: DML, SELECT ... FOR UPDATE, textual SQL and bare connection() calls are writes"""
+    return isinstance(clause, Select) and clause._for_update_arg is None
+
+
+class RoutingSession(Session):
+    """
+    Session whose reads go to the replica in info["replica"], when there is one, and everything
+    else to its own bind (the primary). The first write pins the session to the primary, so its
+    later reads see what it wrote
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        replica: Optional[AsyncEngine] = self.info.get(_REPLICA_KEY)
+        if replica is not None:
+            if not self._flushing and _is_read(clause):
+                return replica.sync_engine
+            del self.info[_REPLICA_KEY]
+        return super().get_bind(mapper=mapper, clause=clause, **kw)
+
+
+def read_replica(session: "RoutingAsyncSession") -> Optional[AsyncEngine]:
+    """The replica the session's reads go to, None when they go to the primary"""
+    return session.sync_session.info.get(_REPLICA_KEY)
+
+
+def read_from(session: "RoutingAsyncSession", replica: Optional[AsyncEngine]) -> None:
+    """Route the reads of another session like those of the one read_replica was asked about"""
+    if replica is not None:
+        session.sync_session.info[_REPLICA_KEY] = replica
+
+
+class RoutingAsyncSession(AsyncSession):
+    """
+    AsyncSession around a RoutingSession that tells its read-your-writes tracker about commits.
+    Commits can be deferred, so the repositories' own commits only flush and a batch of service
+    calls runs in one transaction
+    """
+    sync_session_class = RoutingSession
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.tracker: Optional["ReadYourWritesTracker"] = None
+        self.writer_key: Optional[str] = None
+
+    def defer_commits(self) -> None:
+        """Make commit() only flush until commit_deferred() or rollback()"""
+        self.sync_session.info[_DEFER_COMMITS_KEY] = True
+
+    async def commit_deferred(self) -> None:
+        self.sync_session.info.pop(_DEFER_COMMITS_KEY, None)
+        await self.commit()
+
+    async def rollback(self) -> None:
+        self.sync_session.info.pop(_DEFER_COMMITS_KEY, None)
+        await super().rollback()
+
+    async def commit(self) -> None:
+        if self.sync_session.info.get(_DEFER_COMMITS_KEY):
+            await self.flush()
+            return
+        await super().commit()
+        # Repositories only commit after writing
+        if self.tracker is not None and self.writer_key is not None:
+            await self.tracker.record_write(self, self.writer_key)
+
+
+class ReadYourWritesTracker:
+    """
+    Picks the engine a request session reads from: a replica (round robin) for read-only requests,
+    unless the writer key (the user) committed within the last sticky_seconds and the replica may
+    not have their write yet. Markers live in a CacheBackend, so Redis shares them between workers
+    """
+
+    def __init__(self, settings: ReplicaSettings, backend: CacheBackend, replicas: Callable[[], List[AsyncEngine]]):
+        self.settings = settings
+        self.backend = backend
+        self.replicas = replicas
+        self._next_replica = itertools.count()
+        self.replica_sessions = 0
+        self.primary_sessions = 0
+        self.sticky_sessions = 0  # Read-only, but sent to the primary after a recent write
+        self.writes_recorded = 0
+
+    @staticmethod
+    def _marker_key(writer_key: str) -> str:
+        return f"read-your-writes:{writer_key}"
+
+    async def route(self, session: RoutingAsyncSession, writer_key: str, read_only: bool) -> None:
+        """Set up a request session: reads from a replica when allowed, commits recorded for writer_key"""
+        session.tracker = self
+        session.writer_key = writer_key
+        replicas = self.replicas()
+        if not read_only or not replicas:
+            self.primary_sessions += 1
+            return
+        replica = replicas[next(self._next_replica) % len(replicas)]
+        marker = await self.backend.get(self._marker_key(writer_key))
+        if marker is not None and not await self._has_replayed(replica, marker):
+            self.sticky_sessions += 1
+            return
+        session.sync_session.info[_REPLICA_KEY] = replica
+        self.replica_sessions += 1
+
+    async def _has_replayed(self, replica: AsyncEngine, marker: Any) -> bool:
+        if self.settings.consistency != "lsn":
+            return False  # Within the window
+        async with replica.connect() as connection:
+            # NULL when the server is not replaying WAL (not a standby), nothing to wait for then
+            return bool(await connection.scalar(
+                text("SELECT coalesce(pg_last_wal_replay_lsn() >= CAST(:lsn AS pg_lsn), true)"), {"lsn": marker}
+            ))
+
+    async def record_write(self, session: RoutingAsyncSession, writer_key: str) -> None:
+        if not self.replicas():
+            return
+        marker: Any = True
+        if self.settings.consistency == "lsn":
+            # Runs on the primary: textual SQL is never routed to a replica
+            marker = await session.scalar(text("SELECT pg_current_wal_lsn()::text"))
+        await self.backend.set(self._marker_key(writer_key), marker, self.settings.sticky_seconds)
+        self.writes_recorded += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "replicas": len(self.settings.urls),
+            "consistency": self.settings.consistency,
+            "sticky_seconds": self.settings.sticky_seconds,
+            "replica_sessions": self.replica_sessions,
+            "primary_sessions": self.primary_sessions,
+            "sticky_sessions": self.sticky_sessions,
+            "writes_recorded": self.writes_recorded,
+        }
@@ -1,7 +1,31 @@
 from .base_repository import BaseRepository
-from.system_repository import SystemRepository
+from .async_base_repository import AsyncBaseRepository
+from .async_system_repository import AsyncSystemRepository
+from .async_item_template_repository import AsyncItemTemplateRepository
+from .async_inventory_repository import AsyncInventoryRepository
+from .async_inventory_item_repository import AsyncInventoryItemRepository
+from .async_player_character_repository import AsyncPlayerCharacterRepository
+from .async_party_repository import AsyncPartyRepository
+from .async_aggregate_repository import AsyncInventoryAggregateRepository, AsyncPartyAggregateRepository
+from .async_change_log_repository import AsyncChangeLogRepository
+from .async_inventory_snapshot_repository import AsyncInventorySnapshotRepository
+from .async_purge_repository import AsyncPurgeRepository, PurgePlan, PurgeStep, build_purge_plan
 
 __all__ = [
     "BaseRepository",
-    "SystemRepository"
-]
\ No newline at end of file
+    "AsyncBaseRepository",
+    "AsyncSystemRepository",
+    "AsyncItemTemplateRepository",
+    "AsyncInventoryRepository",
+    "AsyncInventoryItemRepository",
+    "AsyncPlayerCharacterRepository",
+    "AsyncPartyRepository",
+    "AsyncInventoryAggregateRepository",
+    "AsyncPartyAggregateRepository",
+    "AsyncChangeLogRepository",
+    "AsyncInventorySnapshotRepository",
+    "AsyncPurgeRepository",
+    "PurgePlan",
+    "PurgeStep",
+    "build_purge_plan"
+]
@@ -0,0 +1,26 @@
+from typing import Optional
+from uuid import UUID
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.dbmodels import InventoryAggregate, PartyAggregate
+from app.repositories.async_base_repository import AsyncBaseRepository
+
+
+class AsyncInventoryAggregateRepository(AsyncBaseRepository[InventoryAggregate]):
+    """Async repository for the maintained per-inventory totals"""
+
+    def __init__(self, db: AsyncSession):
+        super().__init__(InventoryAggregate, db)
+
+    async def get_by_inventory(self, inventory_id: UUID) -> Optional[InventoryAggregate]:
+        return await self.db.scalar(select(InventoryAggregate).where(InventoryAggregate.inventory_id == inventory_id))
+
+
+class AsyncPartyAggregateRepository(AsyncBaseRepository[PartyAggregate]):
+    """Async repository for the maintained per-party totals"""
+
+    def __init__(self, db: AsyncSession):
+        super().__init__(PartyAggregate, db)
+
+    async def get_by_party(self, party_id: UUID) -> Optional[PartyAggregate]:
+        return await self.db.scalar(select(PartyAggregate).where(PartyAggregate.party_id == party_id))
@@ -0,0 +1,165 @@
+from typing import Generic, TypeVar, Type, Optional, List, Dict, Any, AsyncIterator, Tuple, Sequence
+from sqlalchemy import select, insert, func, Row, Select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm.interfaces import LoaderOption
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.dbmodels import BaseModel
+from app.repositories.bulk_insert import insert_rows, on_conflict_insert, is_unique_violation, split_returned_rows
+from app.repositories.pagination import keyset_select, split_page
+from app.repositories.versioning import ResourceVersion, version_from_row
+
+ModelType = TypeVar("ModelType", bound=BaseModel)
+
+
+class AsyncBaseRepository(Generic[ModelType]):
+    """Async version of BaseRepository for use with an AsyncSession"""
+
+    # Named eager-loading profiles: which relationships to load, and how, for one use case
+    loader_profiles: Dict[str, Sequence[LoaderOption]] = {}
+
+    def __init__(self, model: Type[ModelType], db: AsyncSession):
+        self.model = model
+        self.db = db
+
+    def with_profile(self, stmt: Select, profile: Optional[str]) -> Select:
+        """Apply the loader options of a named profile to a select"""
+        if profile is None:
+            return stmt
+        if profile not in self.loader_profiles:
+            raise ValueError(f"Unknown loader profile {profile!r} for {self.model.__name__}")
+        return stmt.options(*self.loader_profiles[profile])
+
+    async def get(self, id: Any, profile: Optional[str] = None) -> Optional[ModelType]:
+        """Get a single record by ID, optionally with the relationships of a loader profile"""
+        stmt = self.with_profile(select(self.model).where(self.model.id == id), profile)
+        return await self.db.scalar(stmt)
+
+    async def get_row(self, id: Any, columns: Sequence[Any]) -> Optional[Row]:
+        """Like get, but only the given columns as a Row tuple"""
+        return (await self.db.execute(select(*columns).where(self.model.id == id))).first()
+
+    async def get_all(self, skip: int = 0, limit: int = 100) -> List[ModelType]:
+        """Get all records with pagination"""
+        result = await self.db.scalars(select(self.model).offset(skip).limit(limit))
+        return list(result)
+
+    async def get_page(self, limit: int = 100, cursor: Optional[str] = None) -> Tuple[List[ModelType], Optional[str]]:
+        """
+        Get one page of records ordered by (created_at, id), starting after the cursor.
+        Returns the records and the cursor for the next page (None on the last page)
+        """
+        result = await self.db.scalars(keyset_select(self.model, cursor).limit(limit + 1))
+        return split_page(list(result), limit)
+
+    async def get_page_rows(
+        self, columns: Sequence[Any], limit: int = 100, cursor: Optional[str] = None
+    ) -> Tuple[List[Row], Optional[str]]:
+        """Like get_page, but only the given columns as Row tuples, skipping ORM object construction"""
+        result = await self.db.execute(keyset_select(self.model, cursor, columns).limit(limit + 1))
+        return split_page(list(result), limit)
+
+    async def get_table_version(self) -> ResourceVersion:
+        """Version of the whole table, for list endpoints: newest updated_at and the row count"""
+        row = (await self.db.execute(select(func.max(self.model.updated_at), func.count()).select_from(self.model))).first()
+        return version_from_row(row)
+
+    async def stream_all(self, chunk_size: int = 1000) -> AsyncIterator[ModelType]:
+        """Yield all records ordered by (created_at, id), fetched from a server-side cursor in chunks"""
+        stmt = keyset_select(self.model).execution_options(yield_per=chunk_size)
+        result = await self.db.stream_scalars(stmt)
+        async for db_obj in result:
+            yield db_obj
+
+    async def stream_rows(self, columns: Sequence[Any], chunk_size: int = 1000) -> AsyncIterator[Row]:
+        """Like stream_all, but only the given columns as Row tuples"""
+        stmt = keyset_select(self.model, None, columns).execution_options(yield_per=chunk_size)
+        result = await self.db.stream(stmt)
+        async for row in result:
+            yield row
+
+    async def create(self, obj_in: Dict[str, Any]) -> ModelType:
+        """Create a new record"""
+        db_obj = self.model(**obj_in)
+        self.db.add(db_obj)
+        await self.db.commit()
+        await self.db.refresh(db_obj)
+        return db_obj
+
+    async def update(self, id: Any, obj_in: Dict[str, Any]) -> Optional[ModelType]:
+        """Update the given columns of a record, returns None when it does not exist"""
+        db_obj = await self.get(id)
+        if db_obj is None:
+            return None
+        for key, value in obj_in.items():
+            setattr(db_obj, key, value)
+        await self.db.commit()
+        await self.db.refresh(db_obj)
+        return db_obj
+
+    async def delete(self, id: Any) -> bool:
+        """Delete a record, returns False when it does not exist"""
+        db_obj = await self.get(id)
+        if db_obj is None:
+            return False
+        await self.db.delete(db_obj)
+        await self.db.commit()
+        return True
+
+    async def create_many(self, objs_in: List[Dict[str, Any]]) -> List[ModelType]:
+        """
+        Create many records with a single multi-row INSERT ... RETURNING in one transaction.
+        Columns that are None in every row get their defaults (see insert_rows)
+        """
+        if not objs_in:
+            return []
+        stmt = insert(self.model).returning(self.model, sort_by_parameter_order=True)
+        db_objs = list(await self.db.scalars(stmt, insert_rows(objs_in)))
+        for db_obj in db_objs:
+            self.db.expunge(db_obj)
+        await self.db.commit()
+        return db_objs
+
+    async def create_many_skipping_conflicts(
+        self, objs_in: List[Dict[str, Any]], conflict_columns: Sequence[str]
+    ) -> Tuple[List[ModelType], List[int]]:
+        """
+        Like create_many, but rows that conflict on the unique conflict_columns are skipped instead
+        of failing all of them: returns the created records and the indexes of the skipped rows.
+        One INSERT ... ON CONFLICT DO NOTHING on PostgreSQL and SQLite; elsewhere one INSERT when
+        nothing conflicts, otherwise one per row in its own savepoint. Other integrity errors raise
+        """
+        if not objs_in:
+            return [], []
+        rows = insert_rows(objs_in)
+        dialect_insert = on_conflict_insert(self.db.get_bind().dialect.name)
+        if dialect_insert is not None:
+            stmt = dialect_insert(self.model).on_conflict_do_nothing(index_elements=conflict_columns)
+            db_objs, skipped = split_returned_rows(
+                rows, list(await self.db.scalars(stmt.returning(self.model), rows)), conflict_columns
+            )
+        else:
+            db_objs, skipped = await self._insert_rows_one_by_one_on_conflict(rows)
+        for db_obj in db_objs:
+            self.db.expunge(db_obj)
+        await self.db.commit()
+        return db_objs, skipped
+
+    async def _insert_rows_one_by_one_on_conflict(self, rows: List[Dict[str, Any]]) -> Tuple[List[ModelType], List[int]]:
+        db_objs: List[ModelType] = []
+        skipped: List[int] = []
+        try:
+            async with self.db.begin_nested():
+                stmt = insert(self.model).returning(self.model, sort_by_parameter_order=True)
+                return list(await self.db.scalars(stmt, rows)), skipped
+        except IntegrityError as e:
+            if not is_unique_violation(e):
+                raise
+        for index, row in enumerate(rows):
+            try:
+                async with self.db.begin_nested():
+                    db_objs.append(await self.db.scalar(insert(self.model).values(row).returning(self.model)))
+            except IntegrityError as e:
+                if not is_unique_violation(e):
+                    raise
+                skipped.append(index)
+        return db_objs, skipped
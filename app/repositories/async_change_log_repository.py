@@ -0,0 +1,46 @@
+from datetime import datetime
+from typing import List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.dbmodels import ChangeLog, PlayerCharacter
+from app.repositories.async_base_repository import AsyncBaseRepository
+from app.repositories.pagination import keyset_select, split_page
+
+
+class AsyncChangeLogRepository(AsyncBaseRepository[ChangeLog]):
+    def __init__(self, db: AsyncSession):
+        super().__init__(ChangeLog, db)
+
+    async def get_history(
+        self,
+        player_character_id: Optional[UUID] = None,
+        inventory_id: Optional[UUID] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        party_id: Optional[UUID] = None
+    ) -> Tuple[List[ChangeLog], Optional[str]]:
+        """
+        One page of the entries of a character, inventory and/or the current members of a party with
+        since <= created_at < until, oldest first. Served by the (player_character_id|inventory_id,
+        created_at, id) indexes, and on a partitioned table only the partitions overlapping the
+        window are scanned
+        """
+        stmt = keyset_select(ChangeLog, cursor)
+        if player_character_id is not None:
+            stmt = stmt.where(ChangeLog.player_character_id == player_character_id)
+        if party_id is not None:
+            members = select(PlayerCharacter.id).where(PlayerCharacter.party_id == party_id)
+            stmt = stmt.where(ChangeLog.player_character_id.in_(members))
+        if inventory_id is not None:
+            stmt = stmt.where(ChangeLog.inventory_id == inventory_id)
+        if since is not None:
+            stmt = stmt.where(ChangeLog.created_at >= since)
+        if until is not None:
+            stmt = stmt.where(ChangeLog.created_at < until)
+        result = await self.db.scalars(stmt.limit(limit + 1))
+        return split_page(list(result), limit)
@@ -0,0 +1,92 @@
+import uuid
+from typing import Any, Dict, List, Mapping, Sequence, Tuple
+from uuid import UUID
+from sqlalchemy import select, delete, func, tuple_, Row
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.aggregates import aggregate_hooks_registered, apply_item_quantity_deltas
+from app.dbmodels import InventoryItem
+from app.repositories.async_base_repository import AsyncBaseRepository
+
+_ITEMS = InventoryItem.__table__
+
+
+class AsyncInventoryItemRepository(AsyncBaseRepository[InventoryItem]):
+    """Async repository for InventoryItem model"""
+
+    def __init__(self, db: AsyncSession):
+        super().__init__(InventoryItem, db)
+
+    async def get_by_inventory(self, inventory_id: UUID) -> List[InventoryItem]:
+        """Items of one inventory, without joining their templates"""
+        stmt = (
+            select(InventoryItem)
+            .where(InventoryItem.inventory_id == inventory_id)
+            .order_by(InventoryItem.created_at, InventoryItem.id)
+        )
+        return list(await self.db.scalars(stmt))
+
+    async def get_rows_by_inventory(self, inventory_id: UUID, columns: Sequence[Any]) -> List[Row]:
+        """Like get_by_inventory, but only the given columns as Row tuples"""
+        stmt = (
+            select(*columns)
+            .where(InventoryItem.inventory_id == inventory_id)
+            .order_by(InventoryItem.created_at, InventoryItem.id)
+        )
+        return list(await self.db.execute(stmt))
+
+    async def apply_quantity_deltas(self, deltas: Mapping[Tuple[UUID, UUID], int]) -> List[Row]:
+        """
+        Add quantity deltas to the items keyed by (inventory_id, item_template_id) in one transaction,
+        whatever the number of items: lock the existing rows, upsert all of them with
+        quantity = quantity + delta, delete the ones that reached zero.
+
+        Rows are locked and written in key order, so concurrent calls touching the same items wait
+        for each other instead of deadlocking. Raises ValueError, writing nothing, when a delta would
+        take a quantity below zero. Returns (id, inventory_id, item_template_id, quantity) rows in
+        key order, the deleted items with quantity 0
+        """
+        deltas = {key: delta for key, delta in deltas.items() if delta}
+        if not deltas:
+            return []
+        keys = sorted(deltas)
+
+        locked = await self.db.execute(
+            select(_ITEMS.c.inventory_id, _ITEMS.c.item_template_id, _ITEMS.c.quantity)
+            .where(tuple_(_ITEMS.c.inventory_id, _ITEMS.c.item_template_id).in_(keys))
+            .order_by(_ITEMS.c.inventory_id, _ITEMS.c.item_template_id)
+            .with_for_update()
+        )
+        quantities: Dict[Tuple[UUID, UUID], int] = {
+            (inventory_id, item_template_id): quantity or 0 for inventory_id, item_template_id, quantity in locked
+        }
+        for inventory_id, item_template_id in keys:
+            available = quantities.get((inventory_id, item_template_id), 0)
+            if available + deltas[(inventory_id, item_template_id)] < 0:
+                await self.db.rollback()
+                raise ValueError(
+                    f"Inventory {inventory_id} has {available} of item template {item_template_id}, "
+                    f"cannot remove {-deltas[(inventory_id, item_template_id)]}"
+                )
+
+        dialect_insert = sqlite.insert if self.db.get_bind().dialect.name == "sqlite" else postgresql.insert
+        stmt = dialect_insert(_ITEMS).values([
+            {"id": uuid.uuid4(), "inventory_id": inventory_id, "item_template_id": item_template_id,
+             "quantity": deltas[(inventory_id, item_template_id)]}
+            for inventory_id, item_template_id in keys
+        ])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[_ITEMS.c.inventory_id, _ITEMS.c.item_template_id],
+            set_={"quantity": func.coalesce(_ITEMS.c.quantity, 0) + stmt.excluded.quantity, "updated_at": func.now()},
+        ).returning(_ITEMS.c.id, _ITEMS.c.inventory_id, _ITEMS.c.item_template_id, _ITEMS.c.quantity)
+        rows = sorted(await self.db.execute(stmt), key=lambda row: (row.inventory_id, row.item_template_id))
+
+        emptied = [row.id for row in rows if row.quantity == 0]
+        if emptied:
+            # The history of the removed items stays, ON DELETE SET NULL drops only their references
+            await self.db.execute(delete(_ITEMS).where(_ITEMS.c.id.in_(emptied)))
+
+        if aggregate_hooks_registered():
+            await self.db.run_sync(lambda session: apply_item_quantity_deltas(session.connection(), deltas))
+        await self.db.commit()
+        return rows
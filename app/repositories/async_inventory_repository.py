@@ -0,0 +1,44 @@
+from typing import Iterable, Optional, Set, Tuple
+from uuid import UUID
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.dbmodels import Inventory, InventoryItem, ItemTemplate, PlayerCharacter
+from app.repositories.async_base_repository import AsyncBaseRepository
+from app.repositories.versioning import ResourceVersion, version_from_row
+
+
+class AsyncInventoryRepository(AsyncBaseRepository[Inventory]):
+    """Async repository for Inventory model"""
+
+    def __init__(self, db: AsyncSession):
+        super().__init__(Inventory, db)
+
+    async def get_with_scope(self, inventory_id: UUID) -> Optional[Tuple[Inventory, UUID, Optional[UUID]]]:
+        """Get an inventory with the system_id and party_id of the character that owns it"""
+        stmt = (
+            select(Inventory, PlayerCharacter.system_id, PlayerCharacter.party_id)
+            .join(PlayerCharacter, Inventory.player_character_id == PlayerCharacter.id)
+            .where(Inventory.id == inventory_id)
+        )
+        row = (await self.db.execute(stmt)).first()
+        return None if row is None else tuple(row)
+
+    async def get_existing_ids(self, inventory_ids: Iterable[UUID]) -> Set[UUID]:
+        """Which of the given inventories exist, with one query"""
+        return set(await self.db.scalars(select(Inventory.id).where(Inventory.id.in_(list(inventory_ids)))))
+
+    async def get_version(self, inventory_id: UUID) -> Optional[ResourceVersion]:
+        """Version of an inventory with its items and their templates, one aggregate query without loading rows"""
+        stmt = (
+            select(
+                Inventory.updated_at,
+                func.max(InventoryItem.updated_at),
+                func.max(ItemTemplate.updated_at),
+                func.count(InventoryItem.id)
+            )
+            .outerjoin(InventoryItem, InventoryItem.inventory_id == Inventory.id)
+            .outerjoin(ItemTemplate, ItemTemplate.id == InventoryItem.item_template_id)
+            .where(Inventory.id == inventory_id)
+            .group_by(Inventory.id, Inventory.updated_at)
+        )
+        return version_from_row((await self.db.execute(stmt)).first())
@@ -0,0 +1,29 @@
+from datetime import datetime
+from typing import List, Optional
+from uuid import UUID
+
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.changelog.inventory_snapshots import nearest_snapshot_select, horizon_select, deltas_select
+from app.dbmodels import InventorySnapshot
+from app.repositories.async_base_repository import AsyncBaseRepository
+
+
+class AsyncInventorySnapshotRepository(AsyncBaseRepository[InventorySnapshot]):
+    """Async repository for the inventory snapshots and the change log deltas after them"""
+
+    def __init__(self, db: AsyncSession):
+        super().__init__(InventorySnapshot, db)
+
+    async def get_nearest(self, inventory_id: UUID, at: datetime) -> Optional[Row]:
+        """taken_at, kind and items of the newest snapshot taken at or before at"""
+        return (await self.db.execute(nearest_snapshot_select(inventory_id, at))).first()
+
+    async def get_horizon_after(self, inventory_id: UUID, at: datetime) -> Optional[datetime]:
+        """Newest baseline or horizon snapshot after at, None when the history back to at is complete"""
+        return await self.db.scalar(horizon_select(inventory_id, at))
+
+    async def get_deltas(self, inventory_id: UUID, start: Optional[datetime], end: datetime) -> List[Row]:
+        """(item_template_id, quantity_delta) rows with start <= created_at < end, oldest first"""
+        return list(await self.db.execute(deltas_select(inventory_id, start, end)))
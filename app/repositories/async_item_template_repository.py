@@ -0,0 +1,218 @@
+import json
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Sequence, Tuple
+from uuid import UUID
+from sqlalchemy import (
+    select, insert, update, delete, exists, literal, func, or_, text, Row,
+    Table, MetaData, Column, Index, Integer, String, Text, Numeric
+)
+from sqlalchemy.dialects.postgresql import UUID as PGUUID, JSONB
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.aggregates import aggregate_hooks_registered, apply_item_template_deltas
+from app.dbmodels import ItemTemplate, System
+from app.repositories.async_base_repository import AsyncBaseRepository
+from app.repositories.pagination import keyset_select, split_page
+
+_TEMPLATES = ItemTemplate.__table__
+
+# Staging table of a compendium import, filled with COPY and merged into item_templates.
+# Temporary, so every session has its own, and not part of Base.metadata
+_IMPORT = Table(
+    "item_template_import",
+    MetaData(),
+    Column("line", Integer, nullable=False),
+    Column("id", PGUUID(as_uuid=True), nullable=False),  # Id of the template when the row is inserted
+    Column("name", String, nullable=False),
+    Column("description", Text),
+    Column("weight", Numeric(precision=10, scale=2)),
+    Column("value", Numeric(precision=10, scale=2)),
+    Column("rarity", String),
+    Column("type", String),
+    Column("tags", JSONB),
+    Index("ix_item_template_import_name_line", "name", "line"),
+    prefixes=["TEMPORARY"],
+    postgresql_on_commit="DROP",
+)
+_IMPORT_COLUMNS = [column.name for column in _IMPORT.columns]
+_MERGED_COLUMNS = ["description", "weight", "value", "rarity", "type", "tags"]  # Overwritten on a name match
+
+
+def _like_pattern(text: str) -> str:
+    """Substring pattern for ILIKE with the wildcard characters of text escaped"""
+    escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+class AsyncItemTemplateRepository(AsyncBaseRepository[ItemTemplate]):
+    """Async repository for ItemTemplate model"""
+
+    def __init__(self, db: AsyncSession):
+        super().__init__(ItemTemplate, db)
+
+    async def add_new_item_template(self, item_template: ItemTemplate) -> ItemTemplate:
+        return await self.create(item_template.to_dict())
+
+    @staticmethod
+    def _scope(system_id: UUID, party_id: Optional[UUID]) -> Tuple[Any, ...]:
+        """Templates usable in a system: the system-wide ones plus those of the given party"""
+        party_filter = ItemTemplate.party_id.is_(None)
+        if party_id is not None:
+            party_filter = or_(party_filter, ItemTemplate.party_id == party_id)
+        return ItemTemplate.system_id == system_id, party_filter
+
+    async def get_catalog(self, system_id: UUID, party_id: Optional[UUID] = None) -> List[ItemTemplate]:
+        """All templates usable in a system: the system-wide ones plus those of the given party"""
+        stmt = (
+            select(ItemTemplate)
+            .where(*self._scope(system_id, party_id))
+            .order_by(ItemTemplate.name, ItemTemplate.id)
+        )
+        return list(await self.db.scalars(stmt))
+
+    async def get_catalog_version(self, system_id: UUID) -> Optional[datetime]:
+        """Newest updated_at of a system's templates, an index-only lookup"""
+        stmt = select(func.max(ItemTemplate.updated_at)).where(ItemTemplate.system_id == system_id)
+        return await self.db.scalar(stmt)
+
+    async def get_many(self, ids: Iterable[UUID]) -> List[ItemTemplate]:
+        stmt = select(ItemTemplate).where(ItemTemplate.id.in_(list(ids)))
+        return list(await self.db.scalars(stmt))
+
+    async def search(
+        self,
+        columns: Sequence[Any],
+        system_id: UUID,
+        party_id: Optional[UUID] = None,
+        text: Optional[str] = None,
+        tags: Sequence[str] = (),
+        types: Sequence[str] = (),
+        rarities: Sequence[str] = (),
+        min_weight: Optional[Decimal] = None,
+        max_weight: Optional[Decimal] = None,
+        min_value: Optional[Decimal] = None,
+        max_value: Optional[Decimal] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Row], Optional[str]]:
+        """
+        One page of the templates in scope matching every given filter, as Row tuples of columns.
+        On PostgreSQL tags use the GIN index (@>), text the trigram indexes (ILIKE) and the
+        type/weight and value filters the (system_id, ...) btree indexes
+        """
+        stmt = keyset_select(ItemTemplate, cursor, columns).where(*self._scope(system_id, party_id))
+        if text:
+            pattern = _like_pattern(text)
+            stmt = stmt.where(or_(
+                ItemTemplate.name.ilike(pattern, escape="\\"),
+                ItemTemplate.description.ilike(pattern, escape="\\")
+            ))
+        if tags:
+            stmt = stmt.where(ItemTemplate.tags.contains(list(tags)))
+        if types:
+            stmt = stmt.where(ItemTemplate.type.in_(list(types)))
+        if rarities:
+            stmt = stmt.where(ItemTemplate.rarity.in_(list(rarities)))
+        if min_weight is not None:
+            stmt = stmt.where(ItemTemplate.weight >= min_weight)
+        if max_weight is not None:
+            stmt = stmt.where(ItemTemplate.weight <= max_weight)
+        if min_value is not None:
+            stmt = stmt.where(ItemTemplate.value >= min_value)
+        if max_value is not None:
+            stmt = stmt.where(ItemTemplate.value <= max_value)
+        result = await self.db.execute(stmt.limit(limit + 1))
+        return split_page(list(result), limit)
+
+    async def has_system(self, system_id: UUID) -> bool:
+        return bool(await self.db.scalar(select(exists().where(System.id == system_id))))
+
+    async def begin_compendium_import(self) -> None:
+        """Create the staging table of an import, on PostgreSQL it is dropped again when the transaction ends"""
+        connection = await self.db.connection()
+        await connection.run_sync(lambda sync_connection: _IMPORT.drop(sync_connection, checkfirst=True))
+        await connection.run_sync(_IMPORT.create)
+
+    async def stage_compendium_rows(self, rows: List[Dict[str, Any]]) -> None:
+        """Add validated rows (the _IMPORT columns) to the staging table, with COPY on asyncpg"""
+        if not rows:
+            return
+        connection = await self.db.connection()
+        if connection.dialect.driver != "asyncpg":
+            await connection.execute(insert(_IMPORT), rows)
+            return
+        # Binary COPY; JSONB goes through SQLAlchemy's asyncpg codec, which takes JSON text
+        records = [
+            tuple(json.dumps(row[name]) if name == "tags" and row[name] is not None else row[name] for name in _IMPORT_COLUMNS)
+            for row in rows
+        ]
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            _IMPORT.name, records=records, columns=_IMPORT_COLUMNS
+        )
+
+    async def merge_compendium_import(self, system_id: UUID) -> Tuple[int, int, List[Row]]:
+        """
+        Upsert the staged rows into the system-wide templates of a system by (system_id, name) and
+        commit. Of staged rows sharing a name the last one wins; rows matching a template without
+        any difference are left alone, so its updated_at (and the catalog version) stay put.
+        Returns the inserted and updated counts and (line, name) of the superseded rows
+        """
+        postgresql = self.db.get_bind().dialect.name == "postgresql"
+        if postgresql:
+            # Two imports into one system would otherwise both insert a name that is new to them
+            await self.db.execute(select(func.pg_advisory_xact_lock(func.hashtextextended(str(system_id), 0))))
+
+        later = _IMPORT.alias("later")
+        superseded = list(await self.db.execute(
+            delete(_IMPORT)
+            .where(exists().where(later.c.name == _IMPORT.c.name, later.c.line > _IMPORT.c.line))
+            .returning(_IMPORT.c.line, _IMPORT.c.name)
+        ))
+        if postgresql:
+            await self.db.execute(text(f"ANALYZE {_IMPORT.name}"))  # Autovacuum never analyzes temporary tables
+
+        matches = (
+            _TEMPLATES.c.system_id == system_id,
+            _TEMPLATES.c.party_id.is_(None),
+            _TEMPLATES.c.name == _IMPORT.c.name,
+        )
+        if aggregate_hooks_registered():
+            # Core writes bypass the flush hooks: carry weight/value changes into the inventory totals
+            weight_change = func.coalesce(_IMPORT.c.weight, 0) - func.coalesce(_TEMPLATES.c.weight, 0)
+            value_change = func.coalesce(_IMPORT.c.value, 0) - func.coalesce(_TEMPLATES.c.value, 0)
+            changes = await self.db.execute(
+                select(_TEMPLATES.c.id, weight_change, value_change)
+                .where(*matches, or_(weight_change != 0, value_change != 0))
+            )
+            deltas = {item_template_id: (weight, value) for item_template_id, weight, value in changes}
+            await self.db.run_sync(lambda session: apply_item_template_deltas(session.connection(), deltas))
+
+        updated = await self.db.execute(
+            update(_TEMPLATES)
+            .where(*matches, or_(*(_TEMPLATES.c[name].is_distinct_from(_IMPORT.c[name]) for name in _MERGED_COLUMNS)))
+            .values({name: _IMPORT.c[name] for name in _MERGED_COLUMNS})
+        )
+        inserted = await self.db.execute(
+            insert(_TEMPLATES).from_select(
+                ["id", "name", "system_id", *_MERGED_COLUMNS],
+                select(
+                    _IMPORT.c.id, _IMPORT.c.name, literal(system_id, _TEMPLATES.c.system_id.type),
+                    *(_IMPORT.c[name] for name in _MERGED_COLUMNS)
+                ).where(~exists().where(*matches))
+            )
+        )
+        await self.db.commit()
+        return inserted.rowcount, updated.rowcount, superseded
+
+    async def stream_compendium(self, columns: Sequence[Any], system_id: UUID, chunk_size: int = 1000) -> AsyncIterator[List[Row]]:
+        """The system-wide templates of a system in name order, in chunks from a server-side cursor"""
+        stmt = (
+            select(*columns)
+            .where(ItemTemplate.system_id == system_id, ItemTemplate.party_id.is_(None))
+            .order_by(ItemTemplate.name, ItemTemplate.id)
+            .execution_options(yield_per=chunk_size)
+        )
+        result = await self.db.stream(stmt)
+        async for rows in result.partitions():
+            yield rows
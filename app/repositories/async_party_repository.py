@@ -0,0 +1,52 @@
+from typing import Optional
+from uuid import UUID
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload, raiseload
+from app.dbmodels import Party, PlayerCharacter, Inventory, InventoryItem, ItemTemplate
+from app.repositories.async_base_repository import AsyncBaseRepository
+from app.repositories.versioning import ResourceVersion, version_from_row
+
+
+class AsyncPartyRepository(AsyncBaseRepository[Party]):
+    """Async repository for Party model"""
+
+    loader_profiles = {
+        # 3 queries: party, characters + inventories, items + templates
+        "party_overview": [
+            selectinload(Party.player_characters)
+            .joinedload(PlayerCharacter.inventory)
+            .selectinload(Inventory.inventory_items)
+            .joinedload(InventoryItem.item_template),
+            raiseload("*"),
+        ],
+        # 3 queries: party, characters, their change logs
+        "audit": [
+            selectinload(Party.player_characters).selectinload(PlayerCharacter.change_logs).raiseload("*"),
+            raiseload("*"),
+        ],
+    }
+
+    def __init__(self, db: AsyncSession):
+        super().__init__(Party, db)
+
+    async def get_overview_version(self, party_id: UUID) -> Optional[ResourceVersion]:
+        """Version of everything the "party_overview" profile loads, one aggregate query without loading rows"""
+        stmt = (
+            select(
+                Party.updated_at,
+                func.max(PlayerCharacter.updated_at),
+                func.max(Inventory.updated_at),
+                func.max(InventoryItem.updated_at),
+                func.max(ItemTemplate.updated_at),
+                func.count(PlayerCharacter.id.distinct()),
+                func.count(InventoryItem.id)
+            )
+            .outerjoin(PlayerCharacter, PlayerCharacter.party_id == Party.id)
+            .outerjoin(Inventory, Inventory.player_character_id == PlayerCharacter.id)
+            .outerjoin(InventoryItem, InventoryItem.inventory_id == Inventory.id)
+            .outerjoin(ItemTemplate, ItemTemplate.id == InventoryItem.item_template_id)
+            .where(Party.id == party_id)
+            .group_by(Party.id, Party.updated_at)
+        )
+        return version_from_row((await self.db.execute(stmt)).first())
@@ -0,0 +1,48 @@
+from typing import Optional
+from uuid import UUID
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, selectinload, raiseload
+from app.dbmodels import PlayerCharacter, Inventory, InventoryItem, ItemTemplate
+from app.repositories.async_base_repository import AsyncBaseRepository
+from app.repositories.versioning import ResourceVersion, version_from_row
+
+
+class AsyncPlayerCharacterRepository(AsyncBaseRepository[PlayerCharacter]):
+    """Async repository for PlayerCharacter model"""
+
+    loader_profiles = {
+        # 2 queries: character + inventory, then items + templates
+        "sheet": [
+            joinedload(PlayerCharacter.inventory)
+            .selectinload(Inventory.inventory_items)
+            .joinedload(InventoryItem.item_template),
+            raiseload("*"),
+        ],
+        # 2 queries: character, then its change logs
+        "audit": [
+            selectinload(PlayerCharacter.change_logs).raiseload("*"),
+            raiseload("*"),
+        ],
+    }
+
+    def __init__(self, db: AsyncSession):
+        super().__init__(PlayerCharacter, db)
+
+    async def get_sheet_version(self, player_character_id: UUID) -> Optional[ResourceVersion]:
+        """Version of everything the "sheet" profile loads, one aggregate query without loading rows"""
+        stmt = (
+            select(
+                PlayerCharacter.updated_at,
+                func.max(Inventory.updated_at),
+                func.max(InventoryItem.updated_at),
+                func.max(ItemTemplate.updated_at),
+                func.count(InventoryItem.id)
+            )
+            .outerjoin(Inventory, Inventory.player_character_id == PlayerCharacter.id)
+            .outerjoin(InventoryItem, InventoryItem.inventory_id == Inventory.id)
+            .outerjoin(ItemTemplate, ItemTemplate.id == InventoryItem.item_template_id)
+            .where(PlayerCharacter.id == player_character_id)
+            .group_by(PlayerCharacter.id, PlayerCharacter.updated_at)
+        )
+        return version_from_row((await self.db.execute(stmt)).first())
@@ -0,0 +1,168 @@
+from typing import Dict, List, NamedTuple, Optional, Tuple, Type
+from uuid import UUID
+from sqlalchemy import ColumnElement, Select, delete, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.aggregates import aggregate_hooks_registered, apply_item_quantity_deltas
+from app.dbmodels import BaseModel, System, Party, PlayerCharacter, Inventory, InventoryItem, ItemTemplate, ChangeLog
+
+
+class PurgeStep(NamedTuple):
+    """The rows of one table that belong to the subtree being deleted"""
+    model: Type[BaseModel]
+    where: ColumnElement[bool]
+
+
+class PurgePlan(NamedTuple):
+    """
+    What deleting a row takes: its descendants, children before parents, and the row itself
+    last. Running the steps in order never violates a foreign key, and a plan that was
+    interrupted can simply be run again
+    """
+    kind: str
+    root_id: UUID
+    steps: List[PurgeStep]
+    catalog_system: Optional[Select]  # System whose template catalog changes, None when no templates go
+
+    @property
+    def root(self) -> PurgeStep:
+        return self.steps[-1]
+
+    @property
+    def items(self) -> PurgeStep:
+        return next(step for step in self.steps if step.model is InventoryItem)
+
+
+def _subtree_steps(characters: Optional[Select], item_templates: Optional[Select]) -> List[PurgeStep]:
+    """Steps for the given characters and templates: their change logs, items and inventories"""
+    steps: List[PurgeStep] = []
+    items: List[ColumnElement[bool]] = []
+    if characters is not None:
+        inventories = select(Inventory.id).where(Inventory.player_character_id.in_(characters))
+        steps.append(PurgeStep(
+            ChangeLog,
+            or_(ChangeLog.player_character_id.in_(characters), ChangeLog.inventory_id.in_(inventories))
+        ))
+        items.append(InventoryItem.inventory_id.in_(inventories))
+    if item_templates is not None:
+        # Also the items of these templates in inventories that stay
+        items.append(InventoryItem.item_template_id.in_(item_templates))
+    steps.append(PurgeStep(InventoryItem, or_(*items)))
+    if characters is not None:
+        steps.append(PurgeStep(Inventory, Inventory.id.in_(inventories)))  # Their aggregates cascade
+        steps.append(PurgeStep(PlayerCharacter, PlayerCharacter.id.in_(characters)))
+    if item_templates is not None:
+        steps.append(PurgeStep(ItemTemplate, ItemTemplate.id.in_(item_templates)))
+    return steps
+
+
+def _system_plan(system_id: UUID) -> PurgePlan:
+    parties = select(Party.id).where(Party.system_id == system_id)
+    characters = select(PlayerCharacter.id).where(
+        or_(PlayerCharacter.system_id == system_id, PlayerCharacter.party_id.in_(parties))
+    )
+    item_templates = select(ItemTemplate.id).where(
+        or_(ItemTemplate.system_id == system_id, ItemTemplate.party_id.in_(parties))
+    )
+    steps = _subtree_steps(characters, item_templates)
+    steps.append(PurgeStep(Party, Party.system_id == system_id))  # Their aggregates cascade
+    steps.append(PurgeStep(System, System.id == system_id))
+    return PurgePlan("system", system_id, steps, select(System.id).where(System.id == system_id))
+
+
+def _party_plan(party_id: UUID) -> PurgePlan:
+    steps = _subtree_steps(
+        select(PlayerCharacter.id).where(PlayerCharacter.party_id == party_id),
+        select(ItemTemplate.id).where(ItemTemplate.party_id == party_id)
+    )
+    steps.append(PurgeStep(Party, Party.id == party_id))
+    return PurgePlan("party", party_id, steps, select(Party.system_id).where(Party.id == party_id))
+
+
+def _player_character_plan(player_character_id: UUID) -> PurgePlan:
+    steps = _subtree_steps(select(PlayerCharacter.id).where(PlayerCharacter.id == player_character_id), None)
+    # The character itself was the last step already
+    return PurgePlan("player-character", player_character_id, steps, None)
+
+
+def _item_template_plan(item_template_id: UUID) -> PurgePlan:
+    steps = _subtree_steps(None, select(ItemTemplate.id).where(ItemTemplate.id == item_template_id))
+    return PurgePlan(
+        "item-template", item_template_id, steps,
+        select(ItemTemplate.system_id).where(ItemTemplate.id == item_template_id)
+    )
+
+
+PURGE_PLANS = {
+    "system": _system_plan,
+    "party": _party_plan,
+    "player-character": _player_character_plan,
+    "item-template": _item_template_plan,
+}
+
+
+def build_purge_plan(kind: str, root_id: UUID) -> PurgePlan:
+    if kind not in PURGE_PLANS:
+        raise ValueError(f"Unknown purge kind {kind!r}, expected one of {sorted(PURGE_PLANS)}")
+    return PURGE_PLANS[kind](root_id)
+
+
+class AsyncPurgeRepository:
+    """Deletes purge plans with Core statements, so no row of the subtree is loaded into the session"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def exists(self, plan: PurgePlan) -> bool:
+        return await self.db.scalar(select(plan.root.model.id).where(plan.root.where)) is not None
+
+    async def get_catalog_system_id(self, plan: PurgePlan) -> Optional[UUID]:
+        return None if plan.catalog_system is None else await self.db.scalar(plan.catalog_system)
+
+    async def count(self, plan: PurgePlan, limit: Optional[int] = None) -> Dict[str, int]:
+        """
+        Rows per table of the plan. With a limit the counting stops once the total is past it, so
+        finding out that a subtree is too big to delete in the request stays cheap
+        """
+        counts: Dict[str, int] = {}
+        total = 0
+        for step in plan.steps:
+            ids = select(step.model.id).where(step.where)
+            if limit is not None:
+                ids = ids.limit(limit - total + 1)
+            counts[step.model.__tablename__] = await self.db.scalar(select(func.count()).select_from(ids.subquery()))
+            total += counts[step.model.__tablename__]
+            if limit is not None and total > limit:
+                break
+        return counts
+
+    async def delete_chunk(self, step: PurgeStep, chunk_size: Optional[int] = None) -> int:
+        """Delete up to chunk_size rows of a step (all of them without a chunk size), returns how many went"""
+        table = step.model.__table__
+        ids = select(step.model.id).where(step.where)
+        if chunk_size is not None:
+            ids = ids.limit(chunk_size)
+        stmt = delete(table).where(table.c.id.in_(ids))
+        if step.model is not InventoryItem:
+            return (await self.db.execute(stmt)).rowcount
+
+        # Items of inventories that stay (or whose party stays) change aggregates. The templates are
+        # still there at this point, so the triggers or the deltas below know the weights and values
+        rows = (await self.db.execute(
+            stmt.returning(table.c.inventory_id, table.c.item_template_id, table.c.quantity)
+        )).all()
+        if rows and aggregate_hooks_registered():
+            deltas: Dict[Tuple[UUID, UUID], int] = {}
+            for inventory_id, item_template_id, quantity in rows:
+                key = (inventory_id, item_template_id)
+                deltas[key] = deltas.get(key, 0) - (quantity or 0)
+            await self.db.run_sync(lambda session: apply_item_quantity_deltas(session.connection(), deltas))
+        return len(rows)
+
+    async def delete_now(self, plan: PurgePlan) -> None:
+        """
+        Delete the items, then the root row and with it, through the foreign keys, the rest of the
+        subtree, in one transaction
+        """
+        await self.delete_chunk(plan.items)
+        await self.delete_chunk(plan.root)
+        await self.db.commit()
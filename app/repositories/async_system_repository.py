@@ -0,0 +1,18 @@
+from typing import List, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.dbmodels import System
+from app.repositories.async_base_repository import AsyncBaseRepository
+
+
+class AsyncSystemRepository(AsyncBaseRepository[System]):
+    """Async repository for System model with additional system-specific methods"""
+
+    def __init__(self, db: AsyncSession):
+        super().__init__(System, db)
+
+    async def add_new_system(self, system: System) -> System:
+        return await self.create(system.to_dict())
+
+    async def add_new_systems(self, systems: List[System]) -> Tuple[List[System], List[int]]:
+        """Created systems and the indexes of those whose name was already taken"""
+        return await self.create_many_skipping_conflicts([system.to_dict() for system in systems], ["name"])
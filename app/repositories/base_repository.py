@@ -6,20 +6,20 @@ ModelType = TypeVar("ModelType", bound=BaseModel)
 
 
 class BaseRepository(Generic[ModelType]):
-    """Base repository class with common CRUD operations"""
-    
+    """Base repository class with common CRUD operations, for scripts on the sync SessionLocal"""
+
     def __init__(self, model: Type[ModelType], db: Session):
         self.model = model
         self.db = db
-    
+
     def get(self, id: int) -> Optional[ModelType]:
         """Get a single record by ID"""
         return self.db.query(self.model).filter(self.model.id == id).first()
-    
+
     def get_all(self, skip: int = 0, limit: int = 100) -> List[ModelType]:
         """Get all records with pagination"""
         return self.db.query(self.model).offset(skip).limit(limit).all()
-    
+
     def create(self, obj_in: Dict[str, Any]) -> ModelType:
         """Create a new record"""
         db_obj = self.model(**obj_in)
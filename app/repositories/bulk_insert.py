@@ -0,0 +1,47 @@
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+
+
+def insert_rows(objs_in: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    The rows of a multi-row INSERT, all with the same columns. Columns that are None in every row
+    are left out so their defaults apply; the others are sent for every row, None as NULL
+    """
+    keys = [key for key in dict.fromkeys(key for obj_in in objs_in for key in obj_in)
+            if any(obj_in.get(key) is not None for obj_in in objs_in)]
+    return [{key: obj_in.get(key) for key in keys} for obj_in in objs_in]
+
+
+# Dialects whose INSERT can skip conflicting rows itself (ON CONFLICT ... DO NOTHING RETURNING)
+_ON_CONFLICT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+_UNIQUE_VIOLATION = "23505"
+
+
+def on_conflict_insert(dialect_name: str) -> Optional[Callable[[Any], Any]]:
+    """The dialect's insert() with on_conflict_do_nothing, None when it has none"""
+    return _ON_CONFLICT_INSERTS.get(dialect_name)
+
+
+def is_unique_violation(error: IntegrityError) -> bool:
+    """Whether a unique constraint rejected the row, rather than a NOT NULL, foreign key or check"""
+    return (getattr(error.orig, "sqlstate", None) or getattr(error.orig, "pgcode", None)) == _UNIQUE_VIOLATION
+
+
+def split_returned_rows(
+    rows: List[Dict[str, Any]], db_objs: List[Any], conflict_columns: Sequence[str]
+) -> Tuple[List[Any], List[int]]:
+    """
+    The records an INSERT ... ON CONFLICT DO NOTHING RETURNING created, in the order of rows, and
+    the indexes of the rows it skipped: those whose conflict key no returned record has
+    """
+    returned = {tuple(getattr(db_obj, column) for column in conflict_columns): db_obj for db_obj in db_objs}
+    created: List[Any] = []
+    skipped: List[int] = []
+    for index, row in enumerate(rows):
+        db_obj = returned.pop(tuple(row.get(column) for column in conflict_columns), None)
+        if db_obj is None:
+            skipped.append(index)
+        else:
+            created.append(db_obj)
+    return created, skipped
@@ -0,0 +1,51 @@
+import base64
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Tuple, Type, TypeVar
+from uuid import UUID
+from sqlalchemy import select, tuple_, literal, Select
+from app.dbmodels import BaseModel
+
+ModelType = TypeVar("ModelType", bound=BaseModel)
+
+
+def encode_cursor(created_at: datetime, id: UUID) -> str:
+    """Encode a (created_at, id) keyset position as an opaque cursor string"""
+    raw = f"{created_at.isoformat()}|{id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """Decode a cursor made by encode_cursor, raises ValueError when it is malformed"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        created_at, id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), UUID(id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
+def keyset_select(model: Type[BaseModel], cursor: Optional[str] = None, columns: Optional[Sequence[Any]] = None) -> Select:
+    """
+    Select all records of a model ordered by (created_at, id), starting after the cursor.
+    With columns only those are selected (as Row tuples), plus created_at and id when missing
+    so split_page can still build the next cursor
+    """
+    if columns is None:
+        stmt = select(model)
+    else:
+        keys = {column.key for column in columns}
+        stmt = select(*columns, *(column for column in (model.created_at, model.id) if column.key not in keys))
+    stmt = stmt.order_by(model.created_at, model.id)
+    if cursor is not None:
+        created_at, id = decode_cursor(cursor)
+        position = tuple_(literal(created_at, model.created_at.type), literal(id, model.id.type))
+        stmt = stmt.where(tuple_(model.created_at, model.id) > position)
+    return stmt
+
+
+def split_page(records: List[Any], limit: int) -> Tuple[List[Any], Optional[str]]:
+    """Trim a limit + 1 result down to one page and build the cursor for the next page"""
+    if len(records) <= limit:
+        return records, None
+    records = records[:limit]
+    return records, encode_cursor(records[-1].created_at, records[-1].id)
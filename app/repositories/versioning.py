@@ -0,0 +1,24 @@
+from datetime import datetime, timezone
+from typing import NamedTuple, Optional
+from sqlalchemy import Row
+
+
+class ResourceVersion(NamedTuple):
+    """What a conditional GET compares: the newest updated_at within a resource and how many rows it spans"""
+    updated_at: datetime
+    rows: int
+
+
+def version_from_row(row: Optional[Row]) -> Optional[ResourceVersion]:
+    """
+    Combine a row of max(updated_at) and count() columns into one version: the newest timestamp and
+    the summed counts. The counts catch deleted rows, which leave max(updated_at) unchanged
+    """
+    if row is None:
+        return None
+    timestamps = [value for value in row if isinstance(value, datetime)]
+    rows = sum(value for value in row if isinstance(value, int))
+    if not timestamps:
+        return ResourceVersion(datetime.fromtimestamp(0, timezone.utc), rows)
+    updated_at = max(timestamp if timestamp.tzinfo else timestamp.replace(tzinfo=timezone.utc) for timestamp in timestamps)
+    return ResourceVersion(updated_at, rows)
@@ -1,5 +1,21 @@
 from .system_router import SystemRouter
+from .item_template_router import ItemTemplateRouter
+from .inventory_router import InventoryRouter
+from .party_router import PartyRouter
+from .player_character_router import PlayerCharacterRouter
+from .crud_router import CrudRouter, crud_models, crud_prefix
+from .batch_router import BatchRouter
+from .purge_router import PurgeRouter
 
 __all__ = [
-    "SystemRouter"
-]
\ No newline at end of file
+    "SystemRouter",
+    "ItemTemplateRouter",
+    "InventoryRouter",
+    "PartyRouter",
+    "PlayerCharacterRouter",
+    "CrudRouter",
+    "crud_models",
+    "crud_prefix",
+    "BatchRouter",
+    "PurgeRouter"
+]
@@ -0,0 +1,26 @@
+from fastapi import APIRouter, Depends
+
+from app.apimodels import APIBatchRequest, APIBatchResponse
+from app.services import AsyncBatchService
+from app.dependencies import get_async_batch_service, get_user_id
+from app.routers.json_response import ORJSONResponse
+
+
+class BatchRouter:
+    router = APIRouter()
+
+    @router.post("", response_model=APIBatchResponse)
+    async def post_batch(
+        api_batch_request: APIBatchRequest,
+        service: AsyncBatchService = Depends(get_async_batch_service),
+        user_id: str = Depends(get_user_id)
+    ):
+        """
+        Run service calls in order in one transaction, e.g. create templates and add them to several
+        inventories. A failed step rolls back the whole batch and is answered with a 400 that lists
+        the result of every step
+        """
+        report = await service.run(api_batch_request.operations, user_id)
+        if not report.committed:
+            return ORJSONResponse(report, status_code=400)
+        return report
@@ -0,0 +1,50 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Optional
+
+from fastapi import Request, Response
+
+from app.repositories.versioning import ResourceVersion
+
+
+def validator_headers(request: Request, version: ResourceVersion) -> Dict[str, str]:
+    """ETag and Last-Modified of a resource version, the ETag is weak as compression changes the bytes"""
+    raw = f"{request.url.path}?{request.url.query}|{version.updated_at.isoformat()}|{version.rows}"
+    return {
+        "ETag": f'W/"{hashlib.blake2b(raw.encode(), digest_size=12).hexdigest()}"',
+        "Last-Modified": format_datetime(version.updated_at.astimezone(timezone.utc), usegmt=True),
+        "Cache-Control": "private, no-cache",  # Clients may keep it but have to revalidate every time
+    }
+
+
+def _opaque_tag(etag: str) -> str:
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def _parse_http_date(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    # The -0000 zone parses to a naive datetime, HTTP dates are always in UTC
+    return parsed if parsed.tzinfo is not None else parsed.replace(tzinfo=timezone.utc)
+
+
+def not_modified(request: Request, version: ResourceVersion) -> Optional[Response]:
+    """
+    A 304 response when the client's copy is still current, otherwise None.
+    If-None-Match takes precedence; If-Modified-Since only has second precision, so it can miss
+    a change made within the same second as the copy, which clients sending the ETag avoid
+    """
+    headers = validator_headers(request, version)
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = {_opaque_tag(tag.strip()) for tag in if_none_match.split(",")}
+        current = "*" in tags or _opaque_tag(headers["ETag"]) in tags
+    else:
+        if_modified_since = _parse_http_date(request.headers.get("if-modified-since"))
+        current = if_modified_since is not None and version.updated_at.replace(microsecond=0) <= if_modified_since
+    return Response(status_code=304, headers=headers) if current else None
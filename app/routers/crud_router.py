@@ -0,0 +1,78 @@
+from typing import Dict, List, Optional, Type
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app.dbmodels import BaseModel
+from app.services import AsyncCrudService
+from app.dependencies import get_async_crud_service
+from app.routers.json_response import ORJSONResponse
+from app.routers.streaming import ndjson_payload_response
+
+FIELDS_DESCRIPTION = "Comma separated columns to return, e.g. id,name; all columns when left out"
+
+
+def crud_models() -> List[Type[BaseModel]]:
+    """Every concrete BaseModel subclass, in definition order"""
+    models, pending = [], list(BaseModel.__subclasses__())
+    while pending:
+        model = pending.pop(0)
+        pending.extend(model.__subclasses__())
+        if not model.__dict__.get("__abstract__", False):
+            models.append(model)
+    return models
+
+
+def crud_prefix(model: Type[BaseModel]) -> str:
+    return "/" + model.__tablename__.replace("_", "-")
+
+
+class CrudRouter:
+    """
+    Generic list, export and get routes of one model, returning only the columns asked for with
+    ?fields=. List pages and the NDJSON export both go in (created_at, id) keyset order, so deep
+    pages of big tables (change_logs, inventory_items) cost the same as the first one
+    """
+
+    def __init__(self, model: Type[BaseModel]):
+        self.model = model
+        self.router = APIRouter()
+        self._register_crud_routes(get_async_crud_service(model), model.__name__)
+
+    def _register_crud_routes(self, get_service, name: str):
+        @self.router.get("/list", response_model=Dict, summary=f"List {name} records")
+        async def get_list(
+            fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+            limit: int = Query(100, ge=1, le=1000),
+            cursor: Optional[str] = None,
+            service: AsyncCrudService = Depends(get_service)
+        ):
+            try:
+                return ORJSONResponse(await service.list_rows(fields, limit, cursor))
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+
+        @self.router.get("/export", summary=f"Export all {name} records as NDJSON")
+        async def get_export(
+            fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+            chunk_size: int = Query(1000, ge=1, le=10000),
+            service: AsyncCrudService = Depends(get_service)
+        ):
+            try:
+                return ndjson_payload_response(service.export_rows(fields, chunk_size))
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+
+        @self.router.get("/get/{record_id}", response_model=Dict, summary=f"Get one {name} record")
+        async def get_record(
+            record_id: UUID,
+            fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+            service: AsyncCrudService = Depends(get_service)
+        ):
+            try:
+                record = await service.get_row(record_id, fields)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            if record is None:
+                raise HTTPException(status_code=404, detail=f"{name} not found")
+            return ORJSONResponse(record)
@@ -0,0 +1,154 @@
+from datetime import datetime
+from typing import List, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+
+from app.apimodels import (
+    APIPage,
+    APIAggregateTotals,
+    APIChangeLogResponse,
+    APIInventoryItem,
+    APIInventoryItemUpdate,
+    APIInventoryItemResponse,
+    APIInventoryResponse,
+    APIQuantityAdjustment,
+    APIInventoryTransfer,
+    APIInventoryItemQuantity,
+    APIInventoryAsOfResponse
+)
+from app.services import AsyncInventoryService, AsyncChangeLogService
+from app.cache import RequestCoalescer
+from app.dependencies import (
+    get_async_inventory_service,
+    get_async_change_log_service,
+    get_user_id,
+    get_request_coalescer
+)
+from app.routers.conditional import not_modified, validator_headers
+from app.routers.json_response import ORJSONResponse
+
+
+class InventoryRouter:
+    router = APIRouter()
+
+    @router.get("/{inventory_id}", response_model=APIInventoryResponse)
+    async def get_inventory(
+        inventory_id: UUID,
+        request: Request,
+        service: AsyncInventoryService = Depends(get_async_inventory_service),
+        coalesce: RequestCoalescer = Depends(get_request_coalescer)
+    ):
+        # The version is read before the content: a change in between gets a stale ETag on new
+        # content, which costs one extra download, never the other way around
+        version = await coalesce(service.get_inventory_version, inventory_id)
+        if version is None:
+            raise HTTPException(status_code=404, detail="Inventory not found")
+        cached = not_modified(request, version)
+        if cached is not None:
+            return cached
+        inventory = await coalesce(service.get_inventory, inventory_id)
+        if inventory is None:
+            raise HTTPException(status_code=404, detail="Inventory not found")
+        return ORJSONResponse(inventory, headers=validator_headers(request, version))
+
+    @router.get("/{inventory_id}/as-of", response_model=APIInventoryAsOfResponse)
+    async def get_inventory_as_of(
+        inventory_id: UUID,
+        at: datetime,
+        service: AsyncInventoryService = Depends(get_async_inventory_service)
+    ):
+        try:
+            inventory = await service.get_inventory_as_of(inventory_id, at)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if inventory is None:
+            raise HTTPException(status_code=404, detail="Inventory not found")
+        return inventory
+
+    @router.get("/{inventory_id}/totals", response_model=APIAggregateTotals)
+    async def get_inventory_totals(
+        inventory_id: UUID,
+        service: AsyncInventoryService = Depends(get_async_inventory_service),
+        coalesce: RequestCoalescer = Depends(get_request_coalescer)
+    ):
+        totals = await coalesce(service.get_totals, inventory_id)
+        if totals is None:
+            raise HTTPException(status_code=404, detail="Inventory not found")
+        return totals
+
+    @router.post("/{inventory_id}/add-item", response_model=APIInventoryItemResponse)
+    async def post_add_item(
+        inventory_id: UUID,
+        api_inventory_item: APIInventoryItem,
+        service: AsyncInventoryService = Depends(get_async_inventory_service),
+        user_id: str = Depends(get_user_id)
+    ):
+        inventory_item = await service.add_item(inventory_id, api_inventory_item, user_id)
+        if inventory_item is None:
+            raise HTTPException(status_code=404, detail="Inventory not found")
+        return inventory_item
+
+    @router.post("/{inventory_id}/adjust-quantities", response_model=List[APIInventoryItemQuantity])
+    async def post_adjust_quantities(
+        inventory_id: UUID,
+        adjustments: List[APIQuantityAdjustment],
+        service: AsyncInventoryService = Depends(get_async_inventory_service),
+        user_id: str = Depends(get_user_id)
+    ):
+        try:
+            quantities = await service.adjust_quantities(inventory_id, adjustments, user_id)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if quantities is None:
+            raise HTTPException(status_code=404, detail="Inventory not found")
+        return quantities
+
+    @router.post("/transfer-items", response_model=List[APIInventoryItemQuantity])
+    async def post_transfer_items(
+        api_inventory_transfer: APIInventoryTransfer,
+        service: AsyncInventoryService = Depends(get_async_inventory_service),
+        user_id: str = Depends(get_user_id)
+    ):
+        try:
+            quantities = await service.transfer_items(api_inventory_transfer, user_id)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if quantities is None:
+            raise HTTPException(status_code=404, detail="Inventory not found")
+        return quantities
+
+    @router.put("/update-item/{inventory_item_id}", response_model=APIInventoryItemResponse)
+    async def put_update_item(
+        inventory_item_id: UUID,
+        api_inventory_item_update: APIInventoryItemUpdate,
+        service: AsyncInventoryService = Depends(get_async_inventory_service),
+        user_id: str = Depends(get_user_id)
+    ):
+        inventory_item = await service.update_item(inventory_item_id, api_inventory_item_update, user_id)
+        if inventory_item is None:
+            raise HTTPException(status_code=404, detail="Inventory item not found")
+        return inventory_item
+
+    @router.delete("/remove-item/{inventory_item_id}", status_code=204)
+    async def delete_remove_item(
+        inventory_item_id: UUID,
+        service: AsyncInventoryService = Depends(get_async_inventory_service),
+        user_id: str = Depends(get_user_id)
+    ):
+        if not await service.remove_item(inventory_item_id, user_id):
+            raise HTTPException(status_code=404, detail="Inventory item not found")
+
+    @router.get("/{inventory_id}/history", response_model=APIPage[APIChangeLogResponse])
+    async def get_inventory_history(
+        inventory_id: UUID,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: int = Query(100, ge=1, le=1000),
+        cursor: Optional[str] = None,
+        service: AsyncChangeLogService = Depends(get_async_change_log_service)
+    ):
+        try:
+            return await service.get_history(inventory_id=inventory_id, since=since, until=until, limit=limit, cursor=cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
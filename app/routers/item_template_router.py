@@ -0,0 +1,112 @@
+from typing import Annotated, List, Literal, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+
+from app.apimodels import (
+    APIItemTemplate,
+    APIItemTemplateResponse,
+    APIItemTemplateSearch,
+    APIItemTemplateImportReport,
+    APIPage,
+    APIDeleteResponse
+)
+from app.compendium import MEDIA_TYPES
+from app.services import AsyncItemTemplateService, AsyncPurgeService
+from app.cache import RequestCoalescer
+from app.dependencies import get_async_item_template_service, get_async_purge_service, get_request_coalescer
+from app.routers.json_response import ORJSONResponse
+
+
+class ItemTemplateRouter:
+    router = APIRouter()
+
+    @router.post("/add-item-template", response_model=APIItemTemplateResponse)
+    async def post_add_item_template(
+        api_item_template: APIItemTemplate,
+        service: AsyncItemTemplateService = Depends(get_async_item_template_service)
+    ):
+        return await service.add_item_template(api_item_template)
+
+    @router.put("/update-item-template/{item_template_id}", response_model=APIItemTemplateResponse)
+    async def put_update_item_template(
+        item_template_id: UUID,
+        api_item_template: APIItemTemplate,
+        service: AsyncItemTemplateService = Depends(get_async_item_template_service)
+    ):
+        updated = await service.update_item_template(item_template_id, api_item_template)
+        if updated is None:
+            raise HTTPException(status_code=404, detail="Item template not found")
+        return updated
+
+    @router.get("/catalog", response_model=List[APIItemTemplateResponse])
+    async def get_catalog(
+        system_id: UUID,
+        party_id: Optional[UUID] = None,
+        service: AsyncItemTemplateService = Depends(get_async_item_template_service),
+        coalesce: RequestCoalescer = Depends(get_request_coalescer)
+    ):
+        # Also keeps a cold cache from loading the same catalog once per waiting request
+        return await coalesce(service.get_catalog, system_id, party_id)
+
+    @router.get("/search", response_model=APIPage[APIItemTemplateResponse])
+    async def get_search(
+        search: Annotated[APIItemTemplateSearch, Query()],
+        service: AsyncItemTemplateService = Depends(get_async_item_template_service)
+    ):
+        try:
+            return ORJSONResponse(await service.search(search))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    @router.post("/import-compendium", response_model=APIItemTemplateImportReport)
+    async def post_import_compendium(
+        request: Request,
+        system_id: UUID,
+        file_format: Literal["csv", "jsonl"] = Query("csv", alias="format"),
+        service: AsyncItemTemplateService = Depends(get_async_item_template_service)
+    ):
+        # The raw body is parsed while it streams in, the file is never held in memory as a whole
+        try:
+            report = await service.import_compendium(system_id, request.stream(), file_format)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if report is None:
+            raise HTTPException(status_code=404, detail="System not found")
+        return report
+
+    @router.get("/export-compendium")
+    async def get_export_compendium(
+        system_id: UUID,
+        file_format: Literal["csv", "jsonl"] = Query("csv", alias="format"),
+        chunk_size: int = Query(1000, ge=1, le=10000),
+        service: AsyncItemTemplateService = Depends(get_async_item_template_service)
+    ):
+        if not await service.system_exists(system_id):
+            raise HTTPException(status_code=404, detail="System not found")
+        return StreamingResponse(
+            service.export_compendium(system_id, file_format, chunk_size),
+            media_type=MEDIA_TYPES[file_format],
+            headers={"Content-Disposition": f'attachment; filename="compendium-{system_id}.{file_format}"'}
+        )
+
+    @router.get("/cache-stats")
+    async def get_cache_stats(
+        service: AsyncItemTemplateService = Depends(get_async_item_template_service)
+    ):
+        return service.cache_stats()
+
+    @router.delete("/delete-item-template/{item_template_id}", response_model=APIDeleteResponse)
+    async def delete_item_template(
+        item_template_id: UUID,
+        response: Response,
+        service: AsyncPurgeService = Depends(get_async_purge_service)
+    ):
+        """Delete an item template and the inventory items made from it"""
+        result = await service.delete("item-template", item_template_id)
+        if result is None:
+            raise HTTPException(status_code=404, detail="Item template not found")
+        if not result.deleted:
+            response.status_code = 202  # Too big for one request, follow result.purge_job at /purge
+        return result
@@ -0,0 +1,97 @@
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response, WebSocket
+
+from app.apimodels import APIAggregateTotals, APIPartyOverviewResponse, APIDeleteResponse
+from app.services import AsyncPartyService, AsyncChangeStreamService, AsyncPurgeService
+from app.cache import RequestCoalescer
+from app.dependencies import (
+    get_async_party_service,
+    get_async_change_stream_service,
+    get_async_purge_service,
+    get_request_coalescer
+)
+from app.routers.conditional import not_modified, validator_headers
+from app.routers.streaming import sse_response, websocket_stream
+
+
+class PartyRouter:
+    router = APIRouter()
+
+    @router.get("/{party_id}/overview", response_model=APIPartyOverviewResponse)
+    async def get_party_overview(
+        party_id: UUID,
+        request: Request,
+        response: Response,
+        service: AsyncPartyService = Depends(get_async_party_service),
+        coalesce: RequestCoalescer = Depends(get_request_coalescer)
+    ):
+        # Every player's client asks for the overview at once when the GM opens the party screen
+        version = await coalesce(service.get_party_overview_version, party_id)
+        if version is None:
+            raise HTTPException(status_code=404, detail="Party not found")
+        cached = not_modified(request, version)
+        if cached is not None:
+            return cached
+        party = await coalesce(service.get_party_overview, party_id)
+        if party is None:
+            raise HTTPException(status_code=404, detail="Party not found")
+        response.headers.update(validator_headers(request, version))
+        return party
+
+    @router.get("/{party_id}/totals", response_model=APIAggregateTotals)
+    async def get_party_totals(
+        party_id: UUID,
+        service: AsyncPartyService = Depends(get_async_party_service),
+        coalesce: RequestCoalescer = Depends(get_request_coalescer)
+    ):
+        return await coalesce(service.get_totals, party_id)
+
+    @router.get("/{party_id}/changes")
+    async def get_party_changes(
+        party_id: UUID,
+        cursor: Optional[str] = None,
+        last_event_id: Optional[str] = Header(None),
+        service: AsyncChangeStreamService = Depends(get_async_change_stream_service)
+    ):
+        """Server-sent events of the party's change log entries as they are committed, resumable from a cursor"""
+        try:
+            position = service.resume_position(cursor or last_event_id)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if not await service.target_exists(party_id=party_id):
+            raise HTTPException(status_code=404, detail="Party not found")
+        return sse_response(service.stream(position, party_id=party_id), "change")
+
+    @router.websocket("/{party_id}/changes/ws")
+    async def party_changes_websocket(
+        websocket: WebSocket,
+        party_id: UUID,
+        cursor: Optional[str] = None,
+        service: AsyncChangeStreamService = Depends(get_async_change_stream_service)
+    ):
+        try:
+            position = service.resume_position(cursor)
+        except ValueError as e:
+            await websocket.close(code=1008, reason=str(e))
+            return
+        if not await service.target_exists(party_id=party_id):
+            await websocket.close(code=1008, reason="Party not found")
+            return
+        await websocket.accept()
+        await websocket_stream(websocket, service.stream(position, party_id=party_id))
+
+    @router.delete("/{party_id}", response_model=APIDeleteResponse)
+    async def delete_party(
+        party_id: UUID,
+        response: Response,
+        service: AsyncPurgeService = Depends(get_async_purge_service)
+    ):
+        """Delete a party with its characters, their inventories and the party's item templates"""
+        result = await service.delete("party", party_id)
+        if result is None:
+            raise HTTPException(status_code=404, detail="Party not found")
+        if not result.deleted:
+            response.status_code = 202  # Too big for one request, follow result.purge_job at /purge
+        return result
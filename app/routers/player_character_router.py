@@ -0,0 +1,109 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, WebSocket
+
+from app.apimodels import APIPage, APICharacterSheetResponse, APIChangeLogResponse, APIDeleteResponse
+from app.services import (
+    AsyncPlayerCharacterService,
+    AsyncChangeLogService,
+    AsyncChangeStreamService,
+    AsyncPurgeService
+)
+from app.cache import RequestCoalescer
+from app.dependencies import (
+    get_request_coalescer,
+    get_async_player_character_service,
+    get_async_change_log_service,
+    get_async_change_stream_service,
+    get_async_purge_service
+)
+from app.routers.conditional import not_modified, validator_headers
+from app.routers.streaming import sse_response, websocket_stream
+
+
+class PlayerCharacterRouter:
+    router = APIRouter()
+
+    @router.get("/{player_character_id}/sheet", response_model=APICharacterSheetResponse)
+    async def get_character_sheet(
+        player_character_id: UUID,
+        request: Request,
+        response: Response,
+        service: AsyncPlayerCharacterService = Depends(get_async_player_character_service),
+        coalesce: RequestCoalescer = Depends(get_request_coalescer)
+    ):
+        version = await coalesce(service.get_character_sheet_version, player_character_id)
+        if version is None:
+            raise HTTPException(status_code=404, detail="Player character not found")
+        cached = not_modified(request, version)
+        if cached is not None:
+            return cached
+        character_sheet = await coalesce(service.get_character_sheet, player_character_id)
+        if character_sheet is None:
+            raise HTTPException(status_code=404, detail="Player character not found")
+        response.headers.update(validator_headers(request, version))
+        return character_sheet
+
+    @router.get("/{player_character_id}/history", response_model=APIPage[APIChangeLogResponse])
+    async def get_player_character_history(
+        player_character_id: UUID,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: int = Query(100, ge=1, le=1000),
+        cursor: Optional[str] = None,
+        service: AsyncChangeLogService = Depends(get_async_change_log_service)
+    ):
+        try:
+            return await service.get_history(player_character_id=player_character_id, since=since, until=until, limit=limit, cursor=cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    @router.get("/{player_character_id}/changes")
+    async def get_player_character_changes(
+        player_character_id: UUID,
+        cursor: Optional[str] = None,
+        last_event_id: Optional[str] = Header(None),
+        service: AsyncChangeStreamService = Depends(get_async_change_stream_service)
+    ):
+        """Server-sent events of the character's change log entries as they are committed, resumable from a cursor"""
+        try:
+            position = service.resume_position(cursor or last_event_id)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if not await service.target_exists(player_character_id=player_character_id):
+            raise HTTPException(status_code=404, detail="Player character not found")
+        return sse_response(service.stream(position, player_character_id=player_character_id), "change")
+
+    @router.websocket("/{player_character_id}/changes/ws")
+    async def player_character_changes_websocket(
+        websocket: WebSocket,
+        player_character_id: UUID,
+        cursor: Optional[str] = None,
+        service: AsyncChangeStreamService = Depends(get_async_change_stream_service)
+    ):
+        try:
+            position = service.resume_position(cursor)
+        except ValueError as e:
+            await websocket.close(code=1008, reason=str(e))
+            return
+        if not await service.target_exists(player_character_id=player_character_id):
+            await websocket.close(code=1008, reason="Player character not found")
+            return
+        await websocket.accept()
+        await websocket_stream(websocket, service.stream(position, player_character_id=player_character_id))
+
+    @router.delete("/{player_character_id}", response_model=APIDeleteResponse)
+    async def delete_player_character(
+        player_character_id: UUID,
+        response: Response,
+        service: AsyncPurgeService = Depends(get_async_purge_service)
+    ):
+        """Delete a character with its inventory and change log"""
+        result = await service.delete("player-character", player_character_id)
+        if result is None:
+            raise HTTPException(status_code=404, detail="Player character not found")
+        if not result.deleted:
+            response.status_code = 202  # Too big for one request, follow result.purge_job at /purge
+        return result
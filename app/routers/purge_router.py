@@ -0,0 +1,22 @@
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException
+
+from app.apimodels import APIPurgeJob
+from app.services import AsyncPurgeService
+from app.dependencies import get_async_purge_service
+
+
+class PurgeRouter:
+    router = APIRouter()
+
+    @router.get("/get-purge-job/{job_id}", response_model=APIPurgeJob)
+    async def get_purge_job(
+        job_id: UUID,
+        service: AsyncPurgeService = Depends(get_async_purge_service)
+    ):
+        """Progress of a background delete, rows per table counted at its start against the rows deleted so far"""
+        job = await service.get_purge_job(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="Purge job not found")
+        return job
@@ -0,0 +1,70 @@
+import json
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Iterable, Optional, Tuple, Union
+from fastapi import WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from app.routers.json_response import orjson_dumps
+
+
+async def _async_lines(items: AsyncIterable[BaseModel]):
+    async for item in items:
+        yield item.model_dump_json() + "\n"
+
+
+def ndjson_response(items: Union[Iterable[BaseModel], AsyncIterable[BaseModel]]) -> StreamingResponse:
+    """Stream pydantic models as newline-delimited JSON, one line per item"""
+    if hasattr(items, "__aiter__"):
+        lines = _async_lines(items)
+    else:
+        lines = (item.model_dump_json() + "\n" for item in items)
+    return StreamingResponse(lines, media_type="application/x-ndjson")
+
+
+async def _payload_lines(payloads: AsyncIterable[Dict[str, Any]]):
+    async for payload in payloads:
+        yield orjson_dumps(payload) + b"\n"
+
+
+def ndjson_payload_response(payloads: AsyncIterable[Dict[str, Any]]) -> StreamingResponse:
+    """Stream row payloads (see mappers.row_mapping) as newline-delimited JSON, rendered by orjson"""
+    return StreamingResponse(_payload_lines(payloads), media_type="application/x-ndjson")
+
+
+async def _sse_events(events: AsyncIterable[Optional[Tuple[str, BaseModel]]], event_type: str):
+    async for event in events:
+        if event is None:
+            yield ": keepalive\n\n"
+            continue
+        event_id, item = event
+        yield f"id: {event_id}\nevent: {event_type}\ndata: {item.model_dump_json()}\n\n"
+
+
+def sse_response(events: AsyncIterable[Optional[Tuple[str, BaseModel]]], event_type: str = "message") -> StreamingResponse:
+    """
+    Server-sent events from (id, model) pairs, None sends a keepalive comment. Browsers reconnect
+    on their own and send the last id back in the Last-Event-ID header
+    """
+    return StreamingResponse(
+        _sse_events(events, event_type),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}  # No proxy buffering (nginx)
+    )
+
+
+async def websocket_stream(websocket: WebSocket, events: AsyncIterator[Optional[Tuple[str, BaseModel]]]) -> None:
+    """
+    The WebSocket counterpart of sse_response: {"type": "change", "id": ..., "data": {...}} messages
+    and {"type": "keepalive"}, until the client disconnects. Clients resume with ?cursor=<last id>
+    """
+    try:
+        async for event in events:
+            if event is None:
+                await websocket.send_text('{"type": "keepalive"}')
+                continue
+            event_id, item = event
+            await websocket.send_text(f'{{"type": "change", "id": {json.dumps(event_id)}, "data": {item.model_dump_json()}}}')
+    except WebSocketDisconnect:
+        pass
+    finally:
+        await events.aclose()  # Unsubscribes right away instead of when the generator is collected
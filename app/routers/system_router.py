@@ -1,16 +1,67 @@
-from fastapi import APIRouter, Depends
+from typing import Any, Dict, List, Optional
+from uuid import UUID
 
-from app.apimodels import APISystem, APISystemResponse
-from app.services import SystemService
-from app.dependencies import get_system_service
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request, Response
+
+from app.apimodels import APIPage, APISystem, APISystemResponse, APISystemBatchResponse, APIDeleteResponse
+from app.services import AsyncSystemService, AsyncPurgeService
+from app.dependencies import get_async_system_service, get_async_purge_service
+from app.routers.conditional import not_modified, validator_headers
+from app.routers.json_response import ORJSONResponse
+from app.routers.streaming import ndjson_response
 
 
 class SystemRouter:
     router = APIRouter()
 
     @router.post("/add-system", response_model=APISystemResponse)
-    def post_add_system(
+    async def post_add_system(
         api_system: APISystem,
-        service: SystemService = Depends(get_system_service)
+        service: AsyncSystemService = Depends(get_async_system_service)
+    ):
+        return await service.add_system(api_system)
+
+    @router.post("/add-systems", response_model=APISystemBatchResponse)
+    async def post_add_systems(
+        payloads: List[Dict[str, Any]] = Body(...),
+        service: AsyncSystemService = Depends(get_async_system_service)
+    ):
+        # Rows are validated one by one in the service so a bad row does not reject the batch
+        return await service.add_systems(payloads)
+
+    @router.get("/list-systems", response_model=APIPage[APISystemResponse])
+    async def get_list_systems(
+        request: Request,
+        limit: int = Query(100, ge=1, le=1000),
+        cursor: Optional[str] = None,
+        service: AsyncSystemService = Depends(get_async_system_service)
+    ):
+        version = await service.get_systems_version()
+        cached = not_modified(request, version)
+        if cached is not None:
+            return cached
+        try:
+            return ORJSONResponse(await service.list_systems(limit, cursor), headers=validator_headers(request, version))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    @router.get("/export-systems")
+    async def get_export_systems(
+        chunk_size: int = Query(1000, ge=1, le=10000),
+        service: AsyncSystemService = Depends(get_async_system_service)
+    ):
+        return ndjson_response(service.export_systems(chunk_size))
+
+    @router.delete("/delete-system/{system_id}", response_model=APIDeleteResponse)
+    async def delete_system(
+        system_id: UUID,
+        response: Response,
+        service: AsyncPurgeService = Depends(get_async_purge_service)
     ):
-        return service.add_system(api_system)
+        """Delete a system with its parties, characters, inventories and item templates"""
+        result = await service.delete("system", system_id)
+        if result is None:
+            raise HTTPException(status_code=404, detail="System not found")
+        if not result.deleted:
+            response.status_code = 202  # Too big for one request, follow result.purge_job at /purge
+        return result
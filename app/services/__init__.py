@@ -1,5 +1,24 @@
-from .system_service import SystemService
+from .async_system_service import AsyncSystemService
+from .async_item_template_service import AsyncItemTemplateService
+from .async_inventory_service import AsyncInventoryService
+from .async_party_service import AsyncPartyService
+from .async_player_character_service import AsyncPlayerCharacterService
+from .async_change_log_service import AsyncChangeLogService
+from .async_change_stream_service import AsyncChangeStreamService
+from .async_crud_service import AsyncCrudService
+from .async_batch_service import AsyncBatchService, BATCH_OPERATIONS
+from .async_purge_service import AsyncPurgeService
 
 __all__ = [
-    "SystemService"
-]
\ No newline at end of file
+    "AsyncSystemService",
+    "AsyncItemTemplateService",
+    "AsyncInventoryService",
+    "AsyncPartyService",
+    "AsyncPlayerCharacterService",
+    "AsyncChangeLogService",
+    "AsyncChangeStreamService",
+    "AsyncCrudService",
+    "AsyncBatchService",
+    "BATCH_OPERATIONS",
+    "AsyncPurgeService"
+]
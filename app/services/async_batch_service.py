@@ -0,0 +1,229 @@
+import logging
+import re
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional, Tuple
+from uuid import UUID
+
+from pydantic import TypeAdapter
+from sqlalchemy.exc import DBAPIError, SQLAlchemyError
+
+from app.apimodels import (
+    APISystem,
+    APIItemTemplate,
+    APIItemTemplateResponse,
+    APIInventoryItem,
+    APIInventoryItemUpdate,
+    APIQuantityAdjustment,
+    APIInventoryTransfer,
+    APIBatchOperation,
+    APIBatchOperationResult,
+    APIBatchResponse
+)
+from app.cache import TemplateCatalogCache
+from app.changelog import ChangeLogRecorder
+from app.registry import RequestScope
+from app.services.async_system_service import AsyncSystemService
+from app.services.async_item_template_service import AsyncItemTemplateService
+from app.services.async_inventory_service import AsyncInventoryService
+
+logger = logging.getLogger(__name__)
+
+# "$<index or ref>.<key or list index>..."
+_REFERENCE = re.compile(r"^\$([A-Za-z0-9_-]+)((?:\.[A-Za-z0-9_-]+)*)$")
+_UUID = TypeAdapter(UUID)
+_JSON = TypeAdapter(Any)
+
+
+class BatchOperation(NamedTuple):
+    """A service call a batch step can make, mirroring its route"""
+    service_type: type
+    method: str
+    params: Tuple[str, ...]  # Path parameters (UUIDs), passed first in this order
+    body: Optional[TypeAdapter]  # Request body, passed after the parameters
+    with_user: bool  # The user id is passed last
+    not_found: str  # Error when the service returns None/False
+
+
+BATCH_OPERATIONS: Dict[str, BatchOperation] = {
+    "add-system": BatchOperation(AsyncSystemService, "add_system", (), TypeAdapter(APISystem), False, ""),
+    "add-item-template": BatchOperation(
+        AsyncItemTemplateService, "add_item_template", (), TypeAdapter(APIItemTemplate), False, ""
+    ),
+    "update-item-template": BatchOperation(
+        AsyncItemTemplateService, "update_item_template", ("item_template_id",), TypeAdapter(APIItemTemplate), False,
+        "Item template not found"
+    ),
+    "add-item": BatchOperation(
+        AsyncInventoryService, "add_item", ("inventory_id",), TypeAdapter(APIInventoryItem), True, "Inventory not found"
+    ),
+    "adjust-quantities": BatchOperation(
+        AsyncInventoryService, "adjust_quantities", ("inventory_id",), TypeAdapter(List[APIQuantityAdjustment]), True,
+        "Inventory not found"
+    ),
+    "transfer-items": BatchOperation(
+        AsyncInventoryService, "transfer_items", (), TypeAdapter(APIInventoryTransfer), True, "Inventory not found"
+    ),
+    "update-item": BatchOperation(
+        AsyncInventoryService, "update_item", ("inventory_item_id",), TypeAdapter(APIInventoryItemUpdate), True,
+        "Inventory item not found"
+    ),
+    "remove-item": BatchOperation(
+        AsyncInventoryService, "remove_item", ("inventory_item_id",), None, True, "Inventory item not found"
+    ),
+}
+
+
+class _BufferedChangeLogRecorder:
+    """Holds the change log entries of a batch back until its transaction has committed"""
+
+    def __init__(self, recorder: ChangeLogRecorder):
+        self.recorder = recorder
+        self.entries: List[Tuple[tuple, dict]] = []
+
+    async def record(self, *args: Any, **kwargs: Any) -> None:
+        self.entries.append((args, kwargs))
+
+    async def flush(self) -> None:
+        for args, kwargs in self.entries:
+            await self.recorder.record(*args, **kwargs)
+
+
+class _DeferredCatalogCache:
+    """
+    Catalog cache of a batch: reads bypass it, as they may see templates the batch has not
+    committed yet, and invalidations wait for the commit
+    """
+
+    def __init__(self, cache: TemplateCatalogCache):
+        self.cache = cache
+        self.invalidations: List[Tuple[UUID, datetime]] = []
+
+    async def get_catalog(
+        self,
+        system_id: UUID,
+        party_id: Optional[UUID],
+        load_version: Callable[[], Awaitable[Optional[datetime]]],
+        load_catalog: Callable[[], Awaitable[List[APIItemTemplateResponse]]],
+    ) -> List[APIItemTemplateResponse]:
+        return await load_catalog()
+
+    async def invalidate(self, system_id: UUID, updated_at: datetime) -> None:
+        self.invalidations.append((system_id, updated_at))
+
+    def stats(self) -> Dict[str, Any]:
+        return self.cache.stats()
+
+    async def flush(self) -> None:
+        for system_id, updated_at in self.invalidations:
+            await self.cache.invalidate(system_id, updated_at)
+
+
+def resolve_references(value: Any, results: Dict[str, Any]) -> Any:
+    """Replace "$<step>.<path>" strings, also nested in dicts and lists, by values of earlier results"""
+    if isinstance(value, dict):
+        return {key: resolve_references(item, results) for key, item in value.items()}
+    if isinstance(value, list):
+        return [resolve_references(item, results) for item in value]
+    if not isinstance(value, str):
+        return value
+    match = _REFERENCE.match(value)
+    if match is None:
+        return value
+    step, path = match.group(1), match.group(2)
+    if step not in results:
+        raise ValueError(f"Reference {value!r}: no earlier step {step!r}")
+    resolved = results[step]
+    for part in path.split(".")[1:]:
+        if isinstance(resolved, dict) and part in resolved:
+            resolved = resolved[part]
+        elif isinstance(resolved, list) and part.isdigit() and int(part) < len(resolved):
+            resolved = resolved[int(part)]
+        else:
+            raise ValueError(f"Reference {value!r}: result of step {step!r} has no {part!r}")
+    return resolved
+
+
+class AsyncBatchService:
+    """
+    Runs an ordered list of service calls in the request session as one transaction: the
+    repositories' commits only flush, and the batch commits once after its last step or rolls
+    back everything when a step fails. Change log entries and catalog cache invalidations are
+    held back until the commit
+    """
+
+    def __init__(self, scope: RequestScope):
+        self.scope = scope
+
+    async def run(self, operations: List[APIBatchOperation], user_id: str) -> APIBatchResponse:
+        session = self.scope.session
+        # Services of their own, wired to the deferring recorder and cache instead of the shared ones
+        batch_scope = self.scope.registry.scope(session)
+        recorder = _BufferedChangeLogRecorder(self.scope.get(ChangeLogRecorder))
+        catalog_cache = _DeferredCatalogCache(self.scope.get(TemplateCatalogCache))
+        batch_scope.provide(ChangeLogRecorder, recorder)
+        batch_scope.provide(TemplateCatalogCache, catalog_cache)
+
+        results: List[APIBatchOperationResult] = []
+        outputs: Dict[str, Any] = {}  # JSON results by step index and ref, for references
+        failed = False
+        session.defer_commits()
+        try:
+            for index, operation in enumerate(operations):
+                if failed:
+                    results.append(APIBatchOperationResult(index=index, ref=operation.ref, status="skipped"))
+                    continue
+                try:
+                    if operation.ref is not None and operation.ref in outputs:
+                        raise ValueError(f"ref {operation.ref!r} is already used by an earlier step")
+                    output = _JSON.dump_python(await self._call(batch_scope, operation, outputs, user_id), mode="json")
+                except (ValueError, SQLAlchemyError) as e:
+                    failed = True
+                    results.append(APIBatchOperationResult(
+                        index=index, ref=operation.ref, status="failed", error=self._error_message(e)
+                    ))
+                    continue
+                outputs[str(index)] = output
+                if operation.ref is not None:
+                    outputs[operation.ref] = output
+                results.append(APIBatchOperationResult(index=index, ref=operation.ref, status="ok", result=output))
+        except BaseException:
+            await session.rollback()
+            raise
+        if failed:
+            await session.rollback()
+            return APIBatchResponse(committed=False, results=results)
+
+        await session.commit_deferred()
+        await recorder.flush()
+        await catalog_cache.flush()
+        return APIBatchResponse(committed=True, results=results)
+
+    @staticmethod
+    async def _call(scope: RequestScope, operation: APIBatchOperation, outputs: Dict[str, Any], user_id: str) -> Any:
+        spec = BATCH_OPERATIONS.get(operation.op)
+        if spec is None:
+            raise ValueError(f"Unknown operation {operation.op!r}, expected one of {sorted(BATCH_OPERATIONS)}")
+        params = resolve_references(operation.params, outputs)
+        args: List[Any] = []
+        for name in spec.params:
+            if name not in params:
+                raise ValueError(f"Missing parameter {name!r}")
+            args.append(_UUID.validate_python(params[name]))
+        if spec.body is not None:
+            args.append(spec.body.validate_python(resolve_references(operation.body, outputs)))
+        if spec.with_user:
+            args.append(user_id)
+        result = await getattr(scope.get(spec.service_type), spec.method)(*args)
+        if result is None or result is False:
+            raise ValueError(spec.not_found)
+        return result
+
+    @staticmethod
+    def _error_message(error: Exception) -> str:
+        if isinstance(error, DBAPIError):
+            # The driver's message, without the statement and parameters
+            return f"Database error: {error.orig}"
+        if isinstance(error, SQLAlchemyError):
+            logger.exception("Batch step failed")
+            return f"Database error: {type(error).__name__}"
+        return str(error)
@@ -0,0 +1,30 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from app.apimodels import APIPage, APIChangeLogResponse
+from app.mappers import ChangeLogMapper
+from app.repositories import AsyncChangeLogRepository
+
+
+class AsyncChangeLogService:
+    def __init__(self, repository: AsyncChangeLogRepository):
+        self.repository = repository
+
+    async def get_history(
+        self,
+        player_character_id: Optional[UUID] = None,
+        inventory_id: Optional[UUID] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> APIPage[APIChangeLogResponse]:
+        """History in a time window, an empty page when there is none (also for unknown ids)"""
+        change_logs, next_cursor = await self.repository.get_history(
+            player_character_id, inventory_id, since, until, limit, cursor
+        )
+        return APIPage[APIChangeLogResponse](
+            items=ChangeLogMapper.change_logs_to_api_change_log_responses(change_logs),
+            next_cursor=next_cursor
+        )
@@ -0,0 +1,132 @@
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Deque, Optional, Set, Tuple
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.apimodels import APIChangeLogResponse
+from app.changestream import ChangeStreamHub
+from app.mappers import ChangeLogMapper
+from app.repositories import AsyncChangeLogRepository, AsyncPartyRepository, AsyncPlayerCharacterRepository
+from app.repositories.pagination import encode_cursor, decode_cursor
+from app.settings import ChangeStreamSettings
+
+# (cursor of the entry, entry), or None when the stream was idle for keepalive_seconds
+StreamMessage = Optional[Tuple[str, APIChangeLogResponse]]
+
+
+def _position(change: APIChangeLogResponse) -> Tuple[datetime, UUID]:
+    created_at = change.created_at if change.created_at.tzinfo else change.created_at.replace(tzinfo=timezone.utc)
+    return created_at, change.id
+
+
+class _RecentIds:
+    """Ids of the last delivered entries, to skip an entry both replayed and received live"""
+
+    def __init__(self, size: int):
+        self._order: Deque[UUID] = deque(maxlen=size)
+        self._ids: Set[UUID] = set()
+
+    def add(self, id: UUID) -> None:
+        if len(self._order) == self._order.maxlen:
+            self._ids.discard(self._order[0])
+        self._order.append(id)
+        self._ids.add(id)
+
+    def __contains__(self, id: UUID) -> bool:
+        return id in self._ids
+
+
+class AsyncChangeStreamService:
+    """
+    Live change log streams of a party or a character.
+
+    Streams are long-lived, so they do not hold a request session: the database is only used,
+    each time with a short session of its own, to replay entries after a resume cursor or after
+    the subscriber lagged behind its buffer. Delivery is at-least-once around those replays,
+    clients skip entry ids they already have
+    """
+
+    def __init__(self, session_factory: async_sessionmaker, hub: ChangeStreamHub, settings: ChangeStreamSettings):
+        self.session_factory = session_factory
+        self.hub = hub
+        self.settings = settings
+
+    @staticmethod
+    def resume_position(cursor: Optional[str]) -> Optional[Tuple[datetime, UUID]]:
+        """Decode the cursor of the last entry a client received, raises ValueError when it is malformed"""
+        if not cursor:
+            return None
+        created_at, id = decode_cursor(cursor)
+        return (created_at if created_at.tzinfo else created_at.replace(tzinfo=timezone.utc)), id
+
+    async def target_exists(self, party_id: Optional[UUID] = None, player_character_id: Optional[UUID] = None) -> bool:
+        async with self.session_factory() as session:
+            if party_id is not None:
+                return await AsyncPartyRepository(session).get(party_id) is not None
+            return await AsyncPlayerCharacterRepository(session).get(player_character_id) is not None
+
+    async def stream(
+        self,
+        position: Optional[Tuple[datetime, UUID]] = None,
+        party_id: Optional[UUID] = None,
+        player_character_id: Optional[UUID] = None
+    ) -> AsyncIterator[StreamMessage]:
+        """
+        Entries after position (a decoded cursor) from the database, then live ones as they commit.
+        Without a position the stream starts with the next committed entry
+        """
+        # Subscribe before replaying, so nothing committed during the replay is missed
+        subscription = self.hub.subscribe(party_id=party_id, player_character_id=player_character_id)
+        recent = _RecentIds(self.settings.buffer_size * 4)
+        if position is not None:
+            recent.add(position[1])  # The client has the entry of its cursor
+        latest = position or (datetime.now(timezone.utc), UUID(int=0))
+        replay_from = position
+        try:
+            while True:
+                if replay_from is not None:
+                    async for change in self._replay(replay_from[0], party_id, player_character_id):
+                        if change.id not in recent:
+                            recent.add(change.id)
+                            latest = max(latest, _position(change))
+                            yield encode_cursor(change.created_at, change.id), change
+                    replay_from = None
+
+                change_event = await subscription.get(self.settings.keepalive_seconds)
+                if subscription.lagged:
+                    subscription.resume()
+                    replay_from = latest
+                    continue
+                if change_event is None:
+                    yield None
+                    continue
+                change = change_event.change
+                if change.id not in recent:
+                    recent.add(change.id)
+                    latest = max(latest, _position(change))
+                    yield encode_cursor(change.created_at, change.id), change
+        finally:
+            self.hub.unsubscribe(subscription)
+
+    async def _replay(
+        self, after: datetime, party_id: Optional[UUID], player_character_id: Optional[UUID]
+    ) -> AsyncIterator[APIChangeLogResponse]:
+        # Starts resume_grace_seconds early: write-behind entries are committed after their created_at
+        since = after - timedelta(seconds=self.settings.resume_grace_seconds)
+        cursor = None
+        while True:
+            async with self.session_factory() as session:
+                change_logs, cursor = await AsyncChangeLogRepository(session).get_history(
+                    player_character_id=player_character_id,
+                    party_id=party_id,
+                    since=since,
+                    limit=self.settings.replay_page_size,
+                    cursor=cursor
+                )
+                changes = ChangeLogMapper.change_logs_to_api_change_log_responses(change_logs)
+            for change in changes:
+                yield change
+            if cursor is None:
+                return
@@ -0,0 +1,59 @@
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy.orm import InstrumentedAttribute
+
+from app.mappers.row_mapping import rows_to_payloads
+from app.repositories import AsyncBaseRepository
+
+
+class AsyncCrudService:
+    """
+    Generic list/get of one model's columns as row payloads. Only the requested fields are
+    selected, so large columns (descriptions, JSONB tags) are neither fetched nor serialized
+    unless a client asks for them
+    """
+
+    def __init__(self, repository: AsyncBaseRepository):
+        self.repository = repository
+        self.field_names = tuple(column.key for column in repository.model.__table__.columns)
+
+    def select_columns(self, fields: Optional[str]) -> Tuple[InstrumentedAttribute, ...]:
+        """Columns for a comma separated fields parameter, all of them when it is empty"""
+        names = [name.strip() for name in fields.split(",") if name.strip()] if fields else []
+        if not names:
+            names = list(self.field_names)
+        unknown = [name for name in names if name not in self.field_names]
+        if unknown:
+            raise ValueError(f"Unknown fields {unknown}, expected any of {list(self.field_names)}")
+        return tuple(getattr(self.repository.model, name) for name in dict.fromkeys(names))
+
+    async def list_rows(self, fields: Optional[str], limit: int, cursor: Optional[str] = None) -> Dict[str, Any]:
+        """APIPage-shaped payload of the selected fields in keyset order"""
+        columns = self.select_columns(fields)
+        rows, next_cursor = await self.repository.get_page_rows(columns, limit, cursor)
+        return {"items": self._payloads(rows, columns), "next_cursor": next_cursor}
+
+    def export_rows(self, fields: Optional[str], chunk_size: int) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Payloads of the selected fields of every record in keyset order, fetched in chunks from a
+        server-side cursor. Unknown fields raise here, before anything is streamed
+        """
+        columns = self.select_columns(fields)
+        keys = [column.key for column in columns]
+
+        async def payloads() -> AsyncIterator[Dict[str, Any]]:
+            async for row in self.repository.stream_rows(columns, chunk_size):
+                yield dict(zip(keys, row))
+        return payloads()
+
+    async def get_row(self, id: UUID, fields: Optional[str]) -> Optional[Dict[str, Any]]:
+        columns = self.select_columns(fields)
+        row = await self.repository.get_row(id, columns)
+        if row is None:
+            return None
+        return self._payloads([row], columns)[0]
+
+    @staticmethod
+    def _payloads(rows: Sequence[Any], columns: Sequence[InstrumentedAttribute]) -> List[Dict[str, Any]]:
+        return rows_to_payloads(rows, [column.key for column in columns])
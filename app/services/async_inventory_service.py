@@ -0,0 +1,222 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from app.apimodels import (
+    APIAggregateTotals,
+    APIInventoryItem,
+    APIInventoryItemUpdate,
+    APIInventoryItemResponse,
+    APIQuantityAdjustment,
+    APIInventoryTransfer,
+    APIInventoryItemQuantity,
+    APIInventoryAsOfResponse
+)
+from app.changelog import ChangeLogRecorder
+from app.changelog.inventory_snapshots import fold_deltas
+from app.mappers import InventoryMapper, AggregateMapper
+from app.repositories import (
+    AsyncInventoryRepository,
+    AsyncInventoryItemRepository,
+    AsyncInventoryAggregateRepository,
+    AsyncInventorySnapshotRepository
+)
+from app.repositories.versioning import ResourceVersion
+from app.services.async_item_template_service import AsyncItemTemplateService
+
+
+class AsyncInventoryService:
+    def __init__(
+        self,
+        repository: AsyncInventoryRepository,
+        inventory_item_repository: AsyncInventoryItemRepository,
+        aggregate_repository: AsyncInventoryAggregateRepository,
+        item_template_service: AsyncItemTemplateService,
+        change_log_recorder: ChangeLogRecorder,
+        snapshot_repository: AsyncInventorySnapshotRepository
+    ):
+        self.repository = repository
+        self.inventory_item_repository = inventory_item_repository
+        self.aggregate_repository = aggregate_repository
+        self.item_template_service = item_template_service
+        self.change_log_recorder = change_log_recorder
+        self.snapshot_repository = snapshot_repository
+
+    async def get_inventory(self, inventory_id: UUID) -> Optional[Dict[str, Any]]:
+        """APIInventoryResponse-shaped payload, built from item rows without a Pydantic model per item"""
+        scoped = await self.repository.get_with_scope(inventory_id)
+        if scoped is None:
+            return None
+        inventory, system_id, party_id = scoped
+        rows = await self.inventory_item_repository.get_rows_by_inventory(
+            inventory_id, InventoryMapper.api_item_response_columns
+        )
+        # Templates come from the cached catalog instead of a join on item_templates
+        templates = await self.item_template_service.get_catalog_by_id(
+            system_id, party_id, [row.item_template_id for row in rows]
+        )
+        return InventoryMapper.inventory_rows_to_payload(inventory, rows, templates)
+
+    async def get_inventory_version(self, inventory_id: UUID) -> Optional[ResourceVersion]:
+        return await self.repository.get_version(inventory_id)
+
+    async def get_totals(self, inventory_id: UUID) -> Optional[APIAggregateTotals]:
+        """Encumbrance and wealth from the maintained aggregate, a single-row lookup"""
+        aggregate = await self.aggregate_repository.get_by_inventory(inventory_id)
+        if aggregate is None and await self.repository.get(inventory_id) is None:
+            return None
+        return AggregateMapper.aggregate_to_api_aggregate_totals(aggregate)
+
+    async def get_inventory_as_of(self, inventory_id: UUID, at: datetime) -> Optional[APIInventoryAsOfResponse]:
+        """
+        What the inventory held at a moment: the nearest snapshot at or before it plus the deltas
+        logged after that, so the cost does not grow with the length of the history. Raises
+        ValueError when the entries needed have been archived or predate the structured deltas
+        """
+        scoped = await self.repository.get_with_scope(inventory_id)
+        if scoped is None:
+            return None
+        inventory, system_id, party_id = scoped
+        if at.tzinfo is None:
+            at = at.replace(tzinfo=timezone.utc)
+        horizon = await self.snapshot_repository.get_horizon_after(inventory_id, at)
+        if horizon is not None:
+            raise ValueError(f"The history of inventory {inventory_id} before {horizon.isoformat()} is not available")
+        snapshot = await self.snapshot_repository.get_nearest(inventory_id, at)
+        deltas = await self.snapshot_repository.get_deltas(inventory_id, None if snapshot is None else snapshot.taken_at, at)
+        items = fold_deltas({} if snapshot is None else snapshot.items, deltas)
+        templates = await self.item_template_service.get_catalog_by_id(
+            system_id, party_id, [UUID(item_template_id) for item_template_id in items]
+        )
+        return InventoryMapper.snapshot_items_to_api_inventory_as_of_response(
+            inventory, at, None if snapshot is None else snapshot.taken_at, len(deltas), items, templates
+        )
+
+    async def add_item(
+        self, inventory_id: UUID, api_inventory_item: APIInventoryItem, user_id: str
+    ) -> Optional[APIInventoryItemResponse]:
+        inventory = await self.repository.get(inventory_id)
+        if inventory is None:
+            return None
+        # Adding a template the inventory already holds increases the quantity of that item
+        [inventory_item] = await self.inventory_item_repository.apply_quantity_deltas(
+            {(inventory_id, api_inventory_item.item_template_id): api_inventory_item.quantity}
+        )
+        await self.change_log_recorder.record(
+            user_id,
+            "ADD_ITEM",
+            f"Added {api_inventory_item.quantity} x item template {inventory_item.item_template_id}",
+            player_character_id=inventory.player_character_id,
+            inventory_id=inventory_id,
+            inventory_item_id=inventory_item.id,
+            item_template_id=inventory_item.item_template_id,
+            quantity_delta=api_inventory_item.quantity,
+        )
+        return InventoryMapper.inventory_item_to_api_inventory_item_response(inventory_item, {})
+
+    async def adjust_quantities(
+        self, inventory_id: UUID, adjustments: List[APIQuantityAdjustment], user_id: str
+    ) -> Optional[List[APIInventoryItemQuantity]]:
+        """
+        Add or take out several templates at once, atomically in the database rather than by
+        reading and writing back the quantities. Raises ValueError when there is not enough of one
+        """
+        inventory = await self.repository.get(inventory_id)
+        if inventory is None:
+            return None
+        deltas: Dict[Tuple[UUID, UUID], int] = {}
+        for adjustment in adjustments:
+            key = (inventory_id, adjustment.item_template_id)
+            deltas[key] = deltas.get(key, 0) + adjustment.quantity_delta
+        rows = await self.inventory_item_repository.apply_quantity_deltas(deltas)
+        for row in rows:
+            delta = deltas[(row.inventory_id, row.item_template_id)]
+            await self.change_log_recorder.record(
+                user_id,
+                "UPDATE_ITEM" if row.quantity else "REMOVE_ITEM",
+                f"Changed quantity of item template {row.item_template_id} by {delta:+d} to {row.quantity}",
+                player_character_id=inventory.player_character_id,
+                inventory_id=inventory_id,
+                inventory_item_id=row.id if row.quantity else None,
+                item_template_id=row.item_template_id,
+                quantity_delta=delta,
+            )
+        return InventoryMapper.quantity_rows_to_api_inventory_item_quantities(rows)
+
+    async def transfer_items(
+        self, api_inventory_transfer: APIInventoryTransfer, user_id: str
+    ) -> Optional[List[APIInventoryItemQuantity]]:
+        """
+        Move items between inventories in one transaction, a trade being moves in both directions.
+        Returns None when an inventory does not exist, raises ValueError when a source does not
+        hold enough of a template; nothing is moved in either case
+        """
+        transfers = api_inventory_transfer.transfers
+        inventory_ids = {transfer.from_inventory_id for transfer in transfers} | {transfer.to_inventory_id for transfer in transfers}
+        if await self.repository.get_existing_ids(inventory_ids) != inventory_ids:
+            return None
+        deltas: Dict[Tuple[UUID, UUID], int] = {}
+        for transfer in transfers:
+            if transfer.from_inventory_id == transfer.to_inventory_id:
+                raise ValueError(f"Cannot transfer item template {transfer.item_template_id} to the inventory it is in")
+            source = (transfer.from_inventory_id, transfer.item_template_id)
+            destination = (transfer.to_inventory_id, transfer.item_template_id)
+            deltas[source] = deltas.get(source, 0) - transfer.quantity
+            deltas[destination] = deltas.get(destination, 0) + transfer.quantity
+        rows = await self.inventory_item_repository.apply_quantity_deltas(deltas)
+        item_ids = {(row.inventory_id, row.item_template_id): row.id for row in rows if row.quantity}
+        for transfer in transfers:
+            for inventory_id, quantity_delta, description in (
+                (transfer.from_inventory_id, -transfer.quantity, f"Gave {transfer.quantity} x item template {transfer.item_template_id} to inventory {transfer.to_inventory_id}"),
+                (transfer.to_inventory_id, transfer.quantity, f"Received {transfer.quantity} x item template {transfer.item_template_id} from inventory {transfer.from_inventory_id}"),
+            ):
+                await self.change_log_recorder.record(
+                    user_id,
+                    "TRANSFER_ITEM",
+                    description,
+                    inventory_id=inventory_id,
+                    inventory_item_id=item_ids.get((inventory_id, transfer.item_template_id)),
+                    item_template_id=transfer.item_template_id,
+                    quantity_delta=quantity_delta,
+                )
+        return InventoryMapper.quantity_rows_to_api_inventory_item_quantities(rows)
+
+    async def update_item(
+        self, inventory_item_id: UUID, api_inventory_item_update: APIInventoryItemUpdate, user_id: str
+    ) -> Optional[APIInventoryItemResponse]:
+        inventory_item = await self.inventory_item_repository.get(inventory_item_id)
+        if inventory_item is None:
+            return None
+        previous_quantity = inventory_item.quantity or 0  # quantity is nullable on legacy rows
+        inventory_item = await self.inventory_item_repository.update(inventory_item_id, api_inventory_item_update.model_dump())
+        if inventory_item is None:
+            return None
+        await self.change_log_recorder.record(
+            user_id,
+            "UPDATE_ITEM",
+            f"Set quantity of item template {inventory_item.item_template_id} to {inventory_item.quantity}",
+            inventory_id=inventory_item.inventory_id,
+            inventory_item_id=inventory_item.id,
+            item_template_id=inventory_item.item_template_id,
+            quantity_delta=inventory_item.quantity - previous_quantity,
+        )
+        return InventoryMapper.inventory_item_to_api_inventory_item_response(inventory_item, {})
+
+    async def remove_item(self, inventory_item_id: UUID, user_id: str) -> bool:
+        inventory_item = await self.inventory_item_repository.get(inventory_item_id)
+        if inventory_item is None:
+            return False
+        # quantity is nullable on legacy rows, those held nothing as far as the deltas are concerned
+        inventory_id, item_template_id, quantity = inventory_item.inventory_id, inventory_item.item_template_id, inventory_item.quantity or 0
+        if not await self.inventory_item_repository.delete(inventory_item_id):
+            return False
+        # The row is gone, so the entry cannot reference it and names it in the description instead
+        await self.change_log_recorder.record(
+            user_id,
+            "REMOVE_ITEM",
+            f"Removed inventory item {inventory_item_id} (item template {item_template_id})",
+            inventory_id=inventory_id,
+            item_template_id=item_template_id,
+            quantity_delta=-quantity,
+        )
+        return True
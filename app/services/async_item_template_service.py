@@ -0,0 +1,160 @@
+from typing import Any, AsyncIterable, AsyncIterator, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from pydantic import ValidationError
+
+from app.apimodels import (
+    APIItemTemplate,
+    APIItemTemplateResponse,
+    APIItemTemplateSearch,
+    APIItemTemplateImportRow,
+    APIItemTemplateImportReport,
+    APIImportRowError
+)
+from app.cache import TemplateCatalogCache
+from app.compendium import CompendiumRecord, read_compendium_chunks, compendium_header, encode_compendium_rows
+from app.dbmodels import ItemTemplate
+from app.mappers import ItemTemplateMapper
+from app.repositories import AsyncItemTemplateRepository
+
+IMPORT_CHUNK_SIZE = 1000
+IMPORT_MAX_ERRORS = 1000  # Row errors listed in an import report, the rest are only counted
+
+
+def validate_compendium_chunk(chunk: List[CompendiumRecord]) -> Tuple[List[Dict[str, Any]], List[APIImportRowError]]:
+    """Validate every record on its own, returning the staging rows of the valid ones and the errors of the others"""
+    staged: List[Dict[str, Any]] = []
+    errors: List[APIImportRowError] = []
+    for record in chunk:
+        if record.error is not None:
+            errors.append(APIImportRowError(line=record.line, errors=[record.error]))
+            continue
+        try:
+            import_row = APIItemTemplateImportRow.model_validate(record.fields)
+        except ValidationError as e:
+            errors.append(APIImportRowError(line=record.line, errors=[
+                f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" if error["loc"] else error["msg"]
+                for error in e.errors()
+            ]))
+            continue
+        staged.append(ItemTemplateMapper.import_row_to_staged_row(record.line, import_row))
+    return staged, errors
+
+
+class AsyncItemTemplateService:
+    def __init__(self, repository: AsyncItemTemplateRepository, catalog_cache: TemplateCatalogCache):
+        self.repository = repository
+        self.catalog_cache = catalog_cache
+
+    async def add_item_template(self, api_item_template: APIItemTemplate) -> APIItemTemplateResponse:
+        item_template: ItemTemplate = ItemTemplateMapper.api_item_template_to_item_template(api_item_template)
+        created_item_template = await self.repository.add_new_item_template(item_template)
+        await self.catalog_cache.invalidate(created_item_template.system_id, created_item_template.updated_at)
+        return ItemTemplateMapper.item_template_to_api_item_template_response(created_item_template)
+
+    async def update_item_template(
+        self, item_template_id: UUID, api_item_template: APIItemTemplate
+    ) -> Optional[APIItemTemplateResponse]:
+        existing = await self.repository.get(item_template_id)
+        if existing is None:
+            return None
+        old_system_id = existing.system_id
+        updated_item_template = await self.repository.update(item_template_id, api_item_template.model_dump())
+        await self.catalog_cache.invalidate(updated_item_template.system_id, updated_item_template.updated_at)
+        if old_system_id != updated_item_template.system_id:
+            await self.catalog_cache.invalidate(old_system_id, updated_item_template.updated_at)
+        return ItemTemplateMapper.item_template_to_api_item_template_response(updated_item_template)
+
+    async def get_catalog(self, system_id: UUID, party_id: Optional[UUID] = None) -> List[APIItemTemplateResponse]:
+        async def load_catalog() -> List[APIItemTemplateResponse]:
+            item_templates = await self.repository.get_catalog(system_id, party_id)
+            return ItemTemplateMapper.item_templates_to_api_item_template_responses(item_templates)
+
+        return await self.catalog_cache.get_catalog(
+            system_id,
+            party_id,
+            load_version=lambda: self.repository.get_catalog_version(system_id),
+            load_catalog=load_catalog
+        )
+
+    async def get_catalog_by_id(
+        self, system_id: UUID, party_id: Optional[UUID], item_template_ids: List[UUID]
+    ) -> Dict[UUID, APIItemTemplateResponse]:
+        """Resolve templates from the cached catalog, loading only ids the catalog does not cover"""
+        catalog = {template.id: template for template in await self.get_catalog(system_id, party_id)}
+        missing = {item_template_id for item_template_id in item_template_ids if item_template_id not in catalog}
+        if missing:
+            for item_template in await self.repository.get_many(missing):
+                catalog[item_template.id] = ItemTemplateMapper.item_template_to_api_item_template_response(item_template)
+        return catalog
+
+    async def search(self, search: APIItemTemplateSearch) -> Dict[str, Any]:
+        """APIPage[APIItemTemplateResponse]-shaped payload of the templates matching search"""
+        rows, next_cursor = await self.repository.search(
+            ItemTemplateMapper.api_response_columns,
+            system_id=search.system_id,
+            party_id=search.party_id,
+            text=search.q,
+            tags=search.tags,
+            types=search.type,
+            rarities=search.rarity,
+            min_weight=search.min_weight,
+            max_weight=search.max_weight,
+            min_value=search.min_value,
+            max_value=search.max_value,
+            limit=search.limit,
+            cursor=search.cursor
+        )
+        return {"items": ItemTemplateMapper.item_template_rows_to_payloads(rows), "next_cursor": next_cursor}
+
+    async def system_exists(self, system_id: UUID) -> bool:
+        return await self.repository.has_system(system_id)
+
+    async def import_compendium(
+        self, system_id: UUID, body: AsyncIterable[bytes], file_format: str
+    ) -> Optional[APIItemTemplateImportReport]:
+        """
+        Import a compendium file into the system-wide templates of a system, upserting by name.
+        The file is parsed and validated chunk by chunk while it is received and the valid rows are
+        staged, then merged in the same transaction; invalid rows are reported with their line.
+        Returns None when the system does not exist, raises ValueError for an unreadable file
+        """
+        if not await self.repository.has_system(system_id):
+            return None
+        await self.repository.begin_compendium_import()
+        rows = staged = failed = 0
+        errors: List[APIImportRowError] = []
+        async for chunk in read_compendium_chunks(body, file_format, IMPORT_CHUNK_SIZE):
+            staged_rows, chunk_errors = validate_compendium_chunk(chunk)
+            await self.repository.stage_compendium_rows(staged_rows)
+            rows += len(chunk)
+            staged += len(staged_rows)
+            failed += len(chunk_errors)
+            errors.extend(chunk_errors[:IMPORT_MAX_ERRORS - len(errors)])
+
+        inserted, updated, superseded = await self.repository.merge_compendium_import(system_id)
+        failed += len(superseded)
+        errors.extend(
+            APIImportRowError(line=line, errors=[f"A later row is also named '{name}', that row was imported instead"])
+            for line, name in superseded[:max(IMPORT_MAX_ERRORS - len(errors), 0)]
+        )
+        errors.sort(key=lambda error: error.line)
+        if inserted or updated:
+            await self.catalog_cache.invalidate(system_id, await self.repository.get_catalog_version(system_id))
+        return APIItemTemplateImportReport(
+            rows=rows,
+            inserted=inserted,
+            updated=updated,
+            unchanged=staged - len(superseded) - inserted - updated,
+            failed=failed,
+            errors=errors
+        )
+
+    async def export_compendium(self, system_id: UUID, file_format: str, chunk_size: int) -> AsyncIterator[bytes]:
+        """The system-wide templates of a system as an import file, encoded chunk by chunk as they are read"""
+        yield compendium_header(file_format)
+        async for rows in self.repository.stream_compendium(ItemTemplateMapper.compendium_columns, system_id, chunk_size):
+            yield encode_compendium_rows(rows, file_format)
+
+    def cache_stats(self) -> Dict[str, Any]:
+        return self.catalog_cache.stats()
@@ -0,0 +1,27 @@
+from typing import Optional
+from uuid import UUID
+
+from app.apimodels import APIAggregateTotals, APIPartyOverviewResponse
+from app.mappers import AggregateMapper, PartyMapper
+from app.repositories import AsyncPartyRepository, AsyncPartyAggregateRepository
+from app.repositories.versioning import ResourceVersion
+
+
+class AsyncPartyService:
+    def __init__(self, repository: AsyncPartyRepository, aggregate_repository: AsyncPartyAggregateRepository):
+        self.repository = repository
+        self.aggregate_repository = aggregate_repository
+
+    async def get_party_overview(self, party_id: UUID) -> Optional[APIPartyOverviewResponse]:
+        party = await self.repository.get(party_id, profile="party_overview")
+        if party is None:
+            return None
+        return PartyMapper.party_to_api_party_overview_response(party)
+
+    async def get_party_overview_version(self, party_id: UUID) -> Optional[ResourceVersion]:
+        return await self.repository.get_overview_version(party_id)
+
+    async def get_totals(self, party_id: UUID) -> APIAggregateTotals:
+        """Encumbrance and wealth of the whole party from the maintained aggregate"""
+        aggregate = await self.aggregate_repository.get_by_party(party_id)
+        return AggregateMapper.aggregate_to_api_aggregate_totals(aggregate)
@@ -0,0 +1,21 @@
+from typing import Optional
+from uuid import UUID
+
+from app.apimodels import APICharacterSheetResponse
+from app.mappers import PlayerCharacterMapper
+from app.repositories import AsyncPlayerCharacterRepository
+from app.repositories.versioning import ResourceVersion
+
+
+class AsyncPlayerCharacterService:
+    def __init__(self, repository: AsyncPlayerCharacterRepository):
+        self.repository = repository
+
+    async def get_character_sheet(self, player_character_id: UUID) -> Optional[APICharacterSheetResponse]:
+        player_character = await self.repository.get(player_character_id, profile="sheet")
+        if player_character is None:
+            return None
+        return PlayerCharacterMapper.player_character_to_api_character_sheet_response(player_character)
+
+    async def get_character_sheet_version(self, player_character_id: UUID) -> Optional[ResourceVersion]:
+        return await self.repository.get_sheet_version(player_character_id)
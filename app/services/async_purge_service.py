@@ -0,0 +1,50 @@
+from datetime import datetime, timezone
+from typing import Optional
+from uuid import UUID
+
+from app.apimodels import APIDeleteResponse, APIPurgeJob
+from app.cache import TemplateCatalogCache
+from app.purge import PurgeJobRunner
+from app.repositories import AsyncPurgeRepository, build_purge_plan
+from app.settings import PurgeSettings
+
+
+class AsyncPurgeService:
+    """
+    Deletes systems, parties, characters and item templates with everything below them. Up to
+    inline_limit rows go in the request: the items explicitly, as the aggregates of the inventories
+    and parties that stay have to follow, the rest through the ON DELETE CASCADE foreign keys of
+    the root row. Bigger subtrees are handed to a background purge job
+    """
+
+    def __init__(
+        self,
+        repository: AsyncPurgeRepository,
+        purge_jobs: PurgeJobRunner,
+        settings: PurgeSettings,
+        catalog_cache: TemplateCatalogCache
+    ):
+        self.repository = repository
+        self.purge_jobs = purge_jobs
+        self.settings = settings
+        self.catalog_cache = catalog_cache
+
+    async def delete(self, kind: str, root_id: UUID) -> Optional[APIDeleteResponse]:
+        """None when the row does not exist"""
+        plan = build_purge_plan(kind, root_id)
+        if not await self.repository.exists(plan):
+            return None
+        catalog_system_id = await self.repository.get_catalog_system_id(plan)
+        counts = await self.repository.count(plan, limit=self.settings.inline_limit)
+        if sum(counts.values()) > self.settings.inline_limit:
+            job = await self.purge_jobs.start(plan, catalog_system_id)
+            return APIDeleteResponse(deleted=False, deleted_rows={}, purge_job=APIPurgeJob(**job))
+
+        await self.repository.delete_now(plan)
+        if catalog_system_id is not None and counts.get("item_templates"):
+            await self.catalog_cache.invalidate(catalog_system_id, datetime.now(timezone.utc))
+        return APIDeleteResponse(deleted=True, deleted_rows=counts)
+
+    async def get_purge_job(self, job_id: UUID) -> Optional[APIPurgeJob]:
+        job = await self.purge_jobs.get(job_id)
+        return None if job is None else APIPurgeJob(**job)
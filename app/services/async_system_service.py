@@ -0,0 +1,43 @@
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from app.apimodels import APISystem, APISystemResponse, APISystemBatchResponse
+from app.dbmodels import System
+from app.mappers import SystemMapper
+from app.repositories import AsyncSystemRepository
+from app.repositories.versioning import ResourceVersion
+from app.services.system_batch import validate_system_payloads, drop_repeated_names, record_taken_names
+
+
+class AsyncSystemService:
+    def __init__(self, repository: AsyncSystemRepository):
+        self.repository = repository
+
+    async def add_system(self, api_system: APISystem) -> APISystemResponse:
+        system: System = SystemMapper.api_system_to_system(api_system)
+        created_system = await self.repository.add_new_system(system)
+        return SystemMapper.system_to_api_system_response(created_system)
+
+    async def add_systems(self, payloads: List[Dict[str, Any]]) -> APISystemBatchResponse:
+        """Validate every row on its own and insert the valid ones in one INSERT, which skips names already taken"""
+        valid, errors = validate_system_payloads(payloads)
+        to_create = drop_repeated_names(valid, errors)
+        # Names taken by other requests are left to the unique constraint, a check beforehand would race them
+        created_systems, skipped = await self.repository.add_new_systems(
+            SystemMapper.api_systems_to_systems([api_system for _, api_system in to_create])
+        )
+        return APISystemBatchResponse(
+            created=SystemMapper.systems_to_api_system_responses(created_systems),
+            errors=record_taken_names(to_create, skipped, errors)
+        )
+
+    async def list_systems(self, limit: int, cursor: Optional[str] = None) -> Dict[str, Any]:
+        """APIPage[APISystemResponse]-shaped payload, built from rows without a Pydantic model per system"""
+        rows, next_cursor = await self.repository.get_page_rows(SystemMapper.api_response_columns, limit, cursor)
+        return {"items": SystemMapper.system_rows_to_payloads(rows), "next_cursor": next_cursor}
+
+    async def get_systems_version(self) -> ResourceVersion:
+        return await self.repository.get_table_version()
+
+    async def export_systems(self, chunk_size: int) -> AsyncIterator[APISystemResponse]:
+        async for system in self.repository.stream_all(chunk_size):
+            yield SystemMapper.system_to_api_system_response(system)
@@ -0,0 +1,41 @@
+from typing import Any, Dict, List, Set, Tuple
+
+from pydantic import ValidationError
+
+from app.apimodels import APIBatchError, APISystem
+
+
+def validate_system_payloads(payloads: List[Dict[str, Any]]) -> Tuple[Dict[int, APISystem], List[APIBatchError]]:
+    """Validate every row on its own, returning the valid rows by index and the errors of the others"""
+    valid: Dict[int, APISystem] = {}
+    errors: List[APIBatchError] = []
+    for index, payload in enumerate(payloads):
+        try:
+            valid[index] = APISystem.model_validate(payload)
+        except ValidationError as e:
+            errors.append(APIBatchError(index=index, errors=[error["msg"] for error in e.errors()]))
+    return valid, errors
+
+
+def drop_repeated_names(valid: Dict[int, APISystem], errors: List[APIBatchError]) -> List[Tuple[int, APISystem]]:
+    """Drop rows whose name repeats an earlier row of the batch and record them as errors"""
+    to_create: List[Tuple[int, APISystem]] = []
+    names: Set[str] = set()
+    for index, api_system in valid.items():
+        if api_system.name in names:
+            errors.append(APIBatchError(index=index, errors=[f"System '{api_system.name}' already exists"]))
+            continue
+        names.add(api_system.name)
+        to_create.append((index, api_system))
+    return to_create
+
+
+def record_taken_names(
+    to_create: List[Tuple[int, APISystem]], skipped: List[int], errors: List[APIBatchError]
+) -> List[APIBatchError]:
+    """Record the rows the unique constraint on the name rejected, the errors sorted by row"""
+    for position in skipped:
+        index, api_system = to_create[position]
+        errors.append(APIBatchError(index=index, errors=[f"System '{api_system.name}' already exists"]))
+    errors.sort(key=lambda error: error.index)
+    return errors
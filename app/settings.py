@@ -0,0 +1,344 @@
+import os
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from dotenv import load_dotenv
+from sqlalchemy.engine import make_url
+
+load_dotenv()
+
+POOL_MODES = ("null", "queue", "transaction_pooler")
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return default if value is None else int(value)
+
+
+@dataclass(frozen=True)
+class DatabaseSettings:
+    """
+    Database connection and pool settings, read from the environment.
+
+    pool_mode:
+      - "null": no client-side pooling, every checkout opens a new connection
+      - "queue": keep up to pool_size (+ max_overflow) connections open and reuse them
+      - "transaction_pooler": queue pooling behind PgBouncer / the Supabase transaction
+        pooler, with server-side prepared statements disabled
+    """
+    user: Optional[str] = None
+    password: Optional[str] = None
+    host: Optional[str] = None
+    port: Optional[str] = None
+    dbname: Optional[str] = None
+    url: Optional[str] = None  # Full DATABASE_URL, takes precedence over the separate parts
+    pool_mode: str = "queue"
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_timeout: int = 30
+    pool_recycle: int = 1800
+    pool_pre_ping: bool = True
+    echo: bool = False
+
+    @classmethod
+    def from_env(cls) -> "DatabaseSettings":
+        settings = cls(
+            user=os.getenv("user"),
+            password=os.getenv("password"),
+            host=os.getenv("host"),
+            port=os.getenv("port"),
+            dbname=os.getenv("dbname"),
+            url=os.getenv("DATABASE_URL"),
+            pool_mode=os.getenv("db_pool_mode", cls.pool_mode).lower(),
+            pool_size=_env_int("db_pool_size", cls.pool_size),
+            max_overflow=_env_int("db_max_overflow", cls.max_overflow),
+            pool_timeout=_env_int("db_pool_timeout", cls.pool_timeout),
+            pool_recycle=_env_int("db_pool_recycle", cls.pool_recycle),
+            pool_pre_ping=_env_bool("db_pool_pre_ping", cls.pool_pre_ping),
+            echo=_env_bool("db_echo", cls.echo),
+        )
+        if settings.pool_mode not in POOL_MODES:
+            raise ValueError(f"db_pool_mode must be one of {POOL_MODES}, got {settings.pool_mode!r}")
+        return settings
+
+    @property
+    def sync_url(self) -> str:
+        if self.url:
+            return make_url(self.url).set(drivername="postgresql+psycopg2").render_as_string(hide_password=False)
+        return f"postgresql+psycopg2://{self.user}:{self.password}@{self.host}:{self.port}/{self.dbname}?sslmode=require"
+
+    @property
+    def async_url(self) -> str:
+        # asyncpg takes "ssl" instead of "sslmode"
+        url = make_url(self.sync_url).set(drivername="postgresql+asyncpg")
+        query = dict(url.query)
+        if "sslmode" in query:
+            query["ssl"] = query.pop("sslmode")
+        return url.set(query=query).render_as_string(hide_password=False)
+
+
+@dataclass(frozen=True)
+class CacheSettings:
+    """
+    Settings for the read-through caches.
+
+    backend: "memory" keeps an LRU per worker process, "redis" shares one cache between workers
+    """
+    backend: str = "memory"
+    ttl_seconds: float = 300.0
+    max_entries: int = 1024
+    redis_url: Optional[str] = None
+
+    @classmethod
+    def from_env(cls) -> "CacheSettings":
+        settings = cls(
+            backend=os.getenv("cache_backend", cls.backend).lower(),
+            ttl_seconds=float(os.getenv("cache_ttl_seconds", cls.ttl_seconds)),
+            max_entries=_env_int("cache_max_entries", cls.max_entries),
+            redis_url=os.getenv("redis_url"),
+        )
+        if settings.backend not in ("memory", "redis"):
+            raise ValueError(f"cache_backend must be 'memory' or 'redis', got {settings.backend!r}")
+        return settings
+
+
+@dataclass(frozen=True)
+class AggregateSettings:
+    """
+    How inventory/party aggregates are kept up to date.
+
+    mode: "orm" updates them from session flush events, "trigger" leaves it to the database
+    triggers (install them with `python -m app.aggregates install-triggers`), "off" disables both
+    """
+    mode: str = "orm"
+
+    @classmethod
+    def from_env(cls) -> "AggregateSettings":
+        settings = cls(mode=os.getenv("aggregate_mode", cls.mode).lower())
+        if settings.mode not in ("orm", "trigger", "off"):
+            raise ValueError(f"aggregate_mode must be 'orm', 'trigger' or 'off', got {settings.mode!r}")
+        return settings
+
+
+@dataclass(frozen=True)
+class ChangeLogSettings:
+    """
+    How change log entries are written.
+
+    mode: "write_behind" queues entries and inserts them in batches from a background task,
+          "sync" inserts every entry right away (tests, scripts)
+    overflow: what record() does when the queue is full, "block" waits for room (backpressure),
+              "drop" discards the entry and counts it
+    retention_days / archive_dir: defaults of the archive job (python -m app.changelog archive)
+    snapshot_every: quantity changes of an inventory after which the snapshot job takes a new
+                    snapshot of it, so an as-of lookup never replays many more than that
+    snapshot_interval: seconds between the snapshot runs of the application, 0 leaves them to
+                       python -m app.changelog snapshot-inventories
+    snapshot_settle_seconds: how far behind now snapshots are taken, so entries still queued by
+                             the write-behind recorder are not missed
+    """
+    mode: str = "write_behind"
+    batch_size: int = 500
+    flush_interval: float = 1.0
+    max_queue_size: int = 10000
+    overflow: str = "block"
+    retention_days: int = 90
+    archive_dir: str = "archive/change_logs"
+    snapshot_every: int = 100
+    snapshot_interval: float = 300.0
+    snapshot_settle_seconds: float = 60.0
+
+    @classmethod
+    def from_env(cls) -> "ChangeLogSettings":
+        settings = cls(
+            mode=os.getenv("change_log_mode", cls.mode).lower(),
+            batch_size=_env_int("change_log_batch_size", cls.batch_size),
+            flush_interval=float(os.getenv("change_log_flush_interval", cls.flush_interval)),
+            max_queue_size=_env_int("change_log_max_queue_size", cls.max_queue_size),
+            overflow=os.getenv("change_log_overflow", cls.overflow).lower(),
+            retention_days=_env_int("change_log_retention_days", cls.retention_days),
+            archive_dir=os.getenv("change_log_archive_dir", cls.archive_dir),
+            snapshot_every=_env_int("change_log_snapshot_every", cls.snapshot_every),
+            snapshot_interval=float(os.getenv("change_log_snapshot_interval", cls.snapshot_interval)),
+            snapshot_settle_seconds=float(os.getenv("change_log_snapshot_settle_seconds", cls.snapshot_settle_seconds)),
+        )
+        if settings.mode not in ("write_behind", "sync"):
+            raise ValueError(f"change_log_mode must be 'write_behind' or 'sync', got {settings.mode!r}")
+        if settings.overflow not in ("block", "drop"):
+            raise ValueError(f"change_log_overflow must be 'block' or 'drop', got {settings.overflow!r}")
+        if settings.snapshot_every < 1:
+            raise ValueError(f"change_log_snapshot_every must be at least 1, got {settings.snapshot_every}")
+        return settings
+
+
+@dataclass(frozen=True)
+class ChangeStreamSettings:
+    """
+    Live change log streams (/party/{id}/changes, /player-character/{id}/changes).
+
+    broker: "memory" delivers within this process only, "postgres" fans out to every worker with
+            LISTEN/NOTIFY on channel
+    listen_url: connection for LISTEN when the regular one goes through a transaction pooler,
+                which cannot hold a listening session
+    buffer_size: events buffered per subscriber; a subscriber that falls further behind is
+                 switched to replaying from the database instead of buffering more
+    keepalive_seconds: idle interval after which a comment keeps proxies from closing the stream
+    resume_grace_seconds: how far before the resume cursor replay starts, so entries of a
+                          write-behind batch committed after the reconnect are not skipped
+    """
+    broker: str = "memory"
+    channel: str = "change_logs"
+    listen_url: Optional[str] = None
+    buffer_size: int = 256
+    keepalive_seconds: float = 15.0
+    resume_grace_seconds: float = 5.0
+    replay_page_size: int = 500
+
+    @classmethod
+    def from_env(cls) -> "ChangeStreamSettings":
+        settings = cls(
+            broker=os.getenv("change_stream_broker", cls.broker).lower(),
+            channel=os.getenv("change_stream_channel", cls.channel),
+            listen_url=os.getenv("change_stream_listen_url"),
+            buffer_size=_env_int("change_stream_buffer_size", cls.buffer_size),
+            keepalive_seconds=float(os.getenv("change_stream_keepalive", cls.keepalive_seconds)),
+            resume_grace_seconds=float(os.getenv("change_stream_resume_grace", cls.resume_grace_seconds)),
+            replay_page_size=_env_int("change_stream_replay_page_size", cls.replay_page_size),
+        )
+        if settings.broker not in ("memory", "postgres"):
+            raise ValueError(f"change_stream_broker must be 'memory' or 'postgres', got {settings.broker!r}")
+        return settings
+
+
+@dataclass(frozen=True)
+class InstrumentationSettings:
+    """
+    Per-request SQL instrumentation.
+
+    enabled: record query count, DB time, connection acquire and hold time and the slowest statement of
+             every request (Server-Timing header and /metrics)
+    slow_query_ms: statements taking at least this long are logged, 0 disables the log
+    n_plus_one_threshold: log a request that runs the same statement this many times, 0 disables it
+    """
+    enabled: bool = True
+    server_timing: bool = True
+    slow_query_ms: float = 200.0
+    n_plus_one_threshold: int = 10
+
+    @classmethod
+    def from_env(cls) -> "InstrumentationSettings":
+        return cls(
+            enabled=_env_bool("sql_instrumentation", cls.enabled),
+            server_timing=_env_bool("sql_server_timing", cls.server_timing),
+            slow_query_ms=float(os.getenv("slow_query_ms", cls.slow_query_ms)),
+            n_plus_one_threshold=_env_int("n_plus_one_threshold", cls.n_plus_one_threshold),
+        )
+
+
+@dataclass(frozen=True)
+class StartupSettings:
+    """
+    What the application does on startup.
+
+    mode: "dev" tests the connection and creates missing tables with create_all,
+          "production" does neither: one query checks that the database is at the Alembic head
+          revision and startup fails when it is not (run 'alembic upgrade head' first)
+    schema_revision: the revision production mode expects, the head of alembic/versions when unset
+    """
+    mode: str = "dev"
+    schema_revision: Optional[str] = None
+
+    @classmethod
+    def from_env(cls) -> "StartupSettings":
+        settings = cls(
+            mode=os.getenv("startup_mode", cls.mode).lower(),
+            schema_revision=os.getenv("startup_schema_revision"),
+        )
+        if settings.mode not in ("dev", "production"):
+            raise ValueError(f"startup_mode must be 'dev' or 'production', got {settings.mode!r}")
+        return settings
+
+
+@dataclass(frozen=True)
+class ReplicaSettings:
+    """
+    Read replicas. GET requests read from a replica (round robin), everything else uses the primary.
+
+    urls: DATABASE_REPLICA_URLS, comma separated; no replicas routes everything to the primary
+    consistency: how a user (X-User-Id) reads their own writes after a commit:
+      - "window": their reads go to the primary for sticky_seconds
+      - "lsn": the primary's WAL position is remembered for sticky_seconds and a replica is only
+        used once it has replayed up to there
+    """
+    urls: Tuple[str, ...] = ()
+    consistency: str = "window"
+    sticky_seconds: float = 5.0
+
+    @classmethod
+    def from_env(cls) -> "ReplicaSettings":
+        settings = cls(
+            urls=tuple(url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()),
+            consistency=os.getenv("db_replica_consistency", cls.consistency).lower(),
+            sticky_seconds=float(os.getenv("db_replica_sticky_seconds", cls.sticky_seconds)),
+        )
+        if settings.consistency not in ("window", "lsn"):
+            raise ValueError(f"db_replica_consistency must be 'window' or 'lsn', got {settings.consistency!r}")
+        return settings
+
+
+@dataclass(frozen=True)
+class CoalescingSettings:
+    """
+    Single-flight coalescing of identical concurrent reads: GET requests with the same route and
+    parameters that arrive while one of them is querying share that query and its result.
+
+    key_scope: what else has to match for requests to share a result,
+      - "global": nothing, all clients share (a party screen opened by every player at once).
+        Requests reading from the primary and from a replica never share, so users pinned to
+        the primary by read-your-writes still see their writes
+      - "user": the user (X-User-Id) too, so nobody receives a result read for someone else
+      - "off": no coalescing
+    """
+    key_scope: str = "global"
+
+    @classmethod
+    def from_env(cls) -> "CoalescingSettings":
+        settings = cls(key_scope=os.getenv("coalescing_key_scope", cls.key_scope).lower())
+        if settings.key_scope not in ("global", "user", "off"):
+            raise ValueError(f"coalescing_key_scope must be 'global', 'user' or 'off', got {settings.key_scope!r}")
+        return settings
+
+
+@dataclass(frozen=True)
+class PurgeSettings:
+    """
+    Deletes of systems, parties, characters and item templates.
+
+    inline_limit: subtrees of up to this many rows are deleted in the request, bigger ones by a
+                  background purge job that deletes chunk_size rows per transaction, pausing
+                  pause_seconds between chunks so it does not crowd out the requests
+    job_ttl_seconds: how long the progress of a purge job can be looked up
+    """
+    inline_limit: int = 5000
+    chunk_size: int = 1000
+    pause_seconds: float = 0.0
+    job_ttl_seconds: float = 86400.0
+
+    @classmethod
+    def from_env(cls) -> "PurgeSettings":
+        settings = cls(
+            inline_limit=_env_int("purge_inline_limit", cls.inline_limit),
+            chunk_size=_env_int("purge_chunk_size", cls.chunk_size),
+            pause_seconds=float(os.getenv("purge_pause_seconds", cls.pause_seconds)),
+            job_ttl_seconds=float(os.getenv("purge_job_ttl_seconds", cls.job_ttl_seconds)),
+        )
+        if settings.chunk_size < 1:
+            raise ValueError(f"purge_chunk_size must be at least 1, got {settings.chunk_size}")
+        return settings
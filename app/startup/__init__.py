@@ -0,0 +1,16 @@
+from app.settings import StartupSettings
+from .startup_timings import StartupTimings
+from .schema_revision import schema_head, check_schema_revision
+
+startup_settings = StartupSettings.from_env()
+
+# Filled in by main.py while it imports and starts, served on /health/startup
+startup_timings = StartupTimings()
+
+__all__ = [
+    "StartupTimings",
+    "schema_head",
+    "check_schema_revision",
+    "startup_settings",
+    "startup_timings"
+]
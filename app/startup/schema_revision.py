@@ -0,0 +1,65 @@
+import ast
+from pathlib import Path
+from typing import Dict, Optional, Set
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+VERSIONS_DIRECTORY = Path(__file__).resolve().parents[2] / "alembic" / "versions"
+
+
+def _revision_identifiers(path: Path) -> Dict[str, object]:
+    """The revision and down_revision assignments of a revision file, without importing it"""
+    identifiers = {}
+    for node in ast.parse(path.read_text(encoding="utf-8")).body:
+        if isinstance(node, (ast.Assign, ast.AnnAssign)) and node.value is not None:
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            for target in targets:
+                if isinstance(target, ast.Name) and target.id in ("revision", "down_revision"):
+                    identifiers[target.id] = ast.literal_eval(node.value)
+    return identifiers
+
+
+def schema_head(directory: Path = VERSIONS_DIRECTORY) -> str:
+    """
+    The head revision of the migrations in directory.
+
+    Reads the revision identifiers straight from the files: alembic's ScriptDirectory imports
+    every revision module, which takes longer than the rest of a production startup.
+    """
+    revisions: Set[str] = set()
+    down_revisions: Set[str] = set()
+    for path in directory.glob("*.py"):
+        identifiers = _revision_identifiers(path)
+        if "revision" not in identifiers:
+            continue
+        revisions.add(identifiers["revision"])
+        down_revision = identifiers.get("down_revision")
+        if isinstance(down_revision, str):
+            down_revisions.add(down_revision)
+        elif down_revision:
+            down_revisions.update(down_revision)
+    heads = revisions - down_revisions
+    if len(heads) != 1:
+        raise RuntimeError(f"Expected one migration head in {directory}, found {sorted(heads)}")
+    return heads.pop()
+
+
+async def check_schema_revision(engine: AsyncEngine, expected: Optional[str] = None) -> str:
+    """
+    Check with a single query that the database is at the expected revision (the head by default)
+    and return it; raises RuntimeError when it is not, so the application refuses to start.
+    """
+    expected = expected or schema_head()
+    try:
+        async with engine.connect() as connection:
+            current = (await connection.execute(text("SELECT version_num FROM alembic_version"))).scalars().all()
+    except DBAPIError as e:
+        raise RuntimeError(f"Could not read the schema revision, has 'alembic upgrade head' run? ({e.orig})") from e
+    if current != [expected]:
+        raise RuntimeError(
+            f"Database schema is at revision {', '.join(current) or 'none'}, expected {expected}; "
+            f"run 'alembic upgrade head' before starting in production mode"
+        )
+    return expected
@@ -0,0 +1,36 @@
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+
+class StartupTimings:
+    """How long each import and startup phase of this process took, in the order they ran"""
+
+    def __init__(self):
+        self.phases: Dict[str, float] = {}
+        self.schema_revision: Optional[str] = None  # Set by the production schema check
+
+    def record(self, name: str, seconds: float) -> None:
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def total_seconds(self) -> float:
+        return sum(self.phases.values())
+
+    def summary(self) -> str:
+        breakdown = ", ".join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in self.phases.items())
+        return f"{self.total_seconds() * 1000:.0f} ms ({breakdown})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "total_ms": round(self.total_seconds() * 1000, 1),
+            "phases_ms": {name: round(seconds * 1000, 1) for name, seconds in self.phases.items()},
+            "schema_revision": self.schema_revision,
+        }
@@ -0,0 +1,45 @@
+"""
+Compare two load benchmark reports scenario by scenario.
+
+    python -m benchmarks.compare baseline.json candidate.json
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+_METRICS = ["throughput_rps", "p50_ms", "p95_ms", "p99_ms"]
+
+
+def _change(old: float, new: float) -> str:
+    if not old:
+        return "n/a"
+    return f"{(new - old) / old * 100:+.1f}%"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.compare")
+    parser.add_argument("baseline", type=Path)
+    parser.add_argument("candidate", type=Path)
+    args = parser.parse_args()
+
+    baseline = json.loads(args.baseline.read_text())
+    candidate = json.loads(args.candidate.read_text())
+    for key in ("scale", "seed", "database", "concurrency"):
+        if baseline["meta"].get(key) != candidate["meta"].get(key):
+            print(f"⚠️  Reports differ in {key}: {baseline['meta'].get(key)} vs {candidate['meta'].get(key)}")
+
+    print(f"{baseline['meta'].get('commit')} -> {candidate['meta'].get('commit')}")
+    print(f"{'scenario':<32}" + "".join(f"{metric:>24}" for metric in _METRICS))
+    for name, new in candidate["scenarios"].items():
+        old = baseline["scenarios"].get(name)
+        if old is None:
+            print(f"{name:<32}{'(new)':>24}")
+            continue
+        cells = [f"{old[metric]:.1f} -> {new[metric]:.1f} {_change(old[metric], new[metric])}" for metric in _METRICS]
+        print(f"{name:<32}" + "".join(f"{cell:>24}" for cell in cells))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,174 @@
+"""
+Deterministic synthetic campaign data for the benchmarks, written with bulk Core inserts.
+
+The same scale and seed always produce the same rows (ids included), so runs against
+different commits load identical data.
+"""
+import random
+import time
+import uuid
+from dataclasses import dataclass, field, asdict
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any, Dict, Iterator, List, Tuple
+from uuid import UUID
+
+from sqlalchemy import Connection, Table, insert
+
+from app.aggregates import rebuild_aggregates
+from app.dbmodels import System, Party, ItemTemplate, PlayerCharacter, Inventory, InventoryItem, ChangeLog
+
+_CHUNK_SIZE = 10000
+_RARITIES = ["common", "uncommon", "rare", "very rare", "legendary"]
+_TYPES = ["weapon", "armor", "potion", "tool", "gear", "treasure"]
+_TAGS = ["magic", "cursed", "consumable", "heavy", "two-handed", "silvered", "quest"]
+_ACTIONS = ["ADD_ITEM", "UPDATE_ITEM", "REMOVE_ITEM"]
+
+
+@dataclass(frozen=True)
+class CampaignScale:
+    systems: int = 2
+    templates_per_system: int = 200
+    parties_per_system: int = 5
+    characters_per_party: int = 5
+    items_per_inventory: int = 50
+    change_logs_per_character: int = 100
+
+    @property
+    def characters(self) -> int:
+        return self.systems * self.parties_per_system * self.characters_per_party
+
+
+SCALES = {
+    "small": CampaignScale(),
+    "medium": CampaignScale(systems=4, templates_per_system=1000, parties_per_system=25, characters_per_party=6,
+                            items_per_inventory=200, change_logs_per_character=500),
+    # 1.2M inventory items and 600k change log entries
+    "large": CampaignScale(systems=10, templates_per_system=5000, parties_per_system=20, characters_per_party=6,
+                           items_per_inventory=1000, change_logs_per_character=500),
+}
+
+
+@dataclass
+class Campaign:
+    """Ids of the generated rows the benchmark scenarios pick their targets from"""
+    systems: List[UUID] = field(default_factory=list)
+    parties: List[UUID] = field(default_factory=list)
+    templates: Dict[UUID, List[UUID]] = field(default_factory=dict)  # Per system
+    inventories: List[Tuple[UUID, UUID, UUID]] = field(default_factory=list)  # (inventory, character, system)
+    row_counts: Dict[str, int] = field(default_factory=dict)
+    seconds: float = 0.0
+
+
+class _Generator:
+    def __init__(self, connection: Connection, seed: int):
+        self.connection = connection
+        self.random = random.Random(seed)
+        self.now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        self.row_counts: Dict[str, int] = {}
+
+    def uuid(self) -> UUID:
+        return uuid.UUID(int=self.random.getrandbits(128), version=4)
+
+    def timestamp(self, days_back: int = 90) -> datetime:
+        return self.now - timedelta(seconds=self.random.randrange(days_back * 86400))
+
+    def insert(self, table: Table, rows: Iterator[Dict[str, Any]]) -> None:
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) == _CHUNK_SIZE:
+                self._flush(table, chunk)
+                chunk = []
+        if chunk:
+            self._flush(table, chunk)
+
+    def _flush(self, table: Table, chunk: List[Dict[str, Any]]) -> None:
+        self.connection.execute(insert(table), chunk)
+        self.row_counts[table.name] = self.row_counts.get(table.name, 0) + len(chunk)
+
+    def base_columns(self, days_back: int = 90) -> Dict[str, Any]:
+        created_at = self.timestamp(days_back)
+        return {"id": self.uuid(), "created_at": created_at, "updated_at": created_at}
+
+
+def generate_campaign(connection: Connection, scale: CampaignScale, seed: int = 42) -> Campaign:
+    """Insert a campaign of the given scale and rebuild the aggregates; run inside a transaction"""
+    started = time.perf_counter()
+    generator = _Generator(connection, seed)
+    campaign = Campaign()
+
+    systems = [{**generator.base_columns(), "name": f"System {i}", "description": f"Synthetic system {i}"}
+               for i in range(scale.systems)]
+    generator.insert(System.__table__, iter(systems))
+    campaign.systems = [system["id"] for system in systems]
+
+    for system_id in campaign.systems:
+        templates = [
+            {
+                **generator.base_columns(),
+                "name": f"Item {i}",
+                "description": f"A synthetic item ({i})",
+                "system_id": system_id,
+                "party_id": None,
+                "weight": Decimal(generator.random.randrange(0, 5000)) / 100,
+                "value": Decimal(generator.random.randrange(0, 100000)) / 100,
+                "rarity": generator.random.choice(_RARITIES),
+                "type": generator.random.choice(_TYPES),
+                "tags": generator.random.sample(_TAGS, generator.random.randrange(0, 3)),
+            }
+            for i in range(scale.templates_per_system)
+        ]
+        generator.insert(ItemTemplate.__table__, iter(templates))
+        campaign.templates[system_id] = [template["id"] for template in templates]
+
+    parties, characters, inventories = [], [], []
+    for system_id in campaign.systems:
+        for p in range(scale.parties_per_system):
+            party_id = generator.uuid()
+            parties.append({**generator.base_columns(), "id": party_id, "name": f"Party {p}", "system_id": system_id})
+            for c in range(scale.characters_per_party):
+                character_id, inventory_id = generator.uuid(), generator.uuid()
+                characters.append({
+                    **generator.base_columns(), "id": character_id, "user_id": f"user-{p}-{c}",
+                    "name": f"Character {p}-{c}", "system_id": system_id, "party_id": party_id,
+                })
+                inventories.append({**generator.base_columns(), "id": inventory_id, "player_character_id": character_id})
+                campaign.inventories.append((inventory_id, character_id, system_id))
+    generator.insert(Party.__table__, iter(parties))
+    generator.insert(PlayerCharacter.__table__, iter(characters))
+    generator.insert(Inventory.__table__, iter(inventories))
+    campaign.parties = [party["id"] for party in parties]
+
+    def inventory_items() -> Iterator[Dict[str, Any]]:
+        for inventory_id, _, system_id in campaign.inventories:
+            templates = campaign.templates[system_id]
+            # Distinct templates, an inventory holds one item per template
+            for item_template_id in generator.random.sample(templates, min(scale.items_per_inventory, len(templates))):
+                yield {
+                    **generator.base_columns(), "inventory_id": inventory_id,
+                    "item_template_id": item_template_id,
+                    "quantity": generator.random.randrange(1, 20),
+                }
+
+    def change_logs() -> Iterator[Dict[str, Any]]:
+        for inventory_id, character_id, _ in campaign.inventories:
+            for _ in range(scale.change_logs_per_character):
+                action = generator.random.choice(_ACTIONS)
+                yield {
+                    **generator.base_columns(), "user_id": "benchmark", "player_character_id": character_id,
+                    "inventory_id": inventory_id, "inventory_item_id": None, "action": action,
+                    "description": f"Synthetic {action.lower()}",
+                }
+
+    generator.insert(InventoryItem.__table__, inventory_items())
+    generator.insert(ChangeLog.__table__, change_logs())
+    rebuild_aggregates(connection)
+
+    campaign.row_counts = generator.row_counts
+    campaign.seconds = time.perf_counter() - started
+    return campaign
+
+
+def describe_scale(scale: CampaignScale) -> Dict[str, int]:
+    return asdict(scale)
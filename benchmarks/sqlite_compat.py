@@ -0,0 +1,8 @@
+"""Lets the PostgreSQL-specific column types be created on SQLite, for benchmarks without a database server"""
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+
+
+@compiles(JSONB, "sqlite")
+def _jsonb_on_sqlite(type_, compiler, **kw) -> str:
+    return "JSON"
@@ -1,31 +0,0 @@
-from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
-import os
-from dotenv import load_dotenv
-
-load_dotenv()
-
-# Use DATABASE_URL for connection pooling (recommended for production)
-DATABASE_URL = os.getenv("DATABASE_URL")
-
-# Create SQLAlchemy engine with connection pooling
-engine = create_engine(
-    DATABASE_URL,
-    pool_size=5,            # Number of connections to keep in pool
-    max_overflow=10,        # Max overflow connections
-    pool_timeout=30,        # Seconds to wait for a connection
-    pool_recycle=1800,      # Recycle connections after 30 minutes
-    echo=False              # Set to True for SQL logging
-)
-
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-Base = declarative_base()
-
-# Dependency to get DB session
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
\ No newline at end of file
@@ -1,42 +1,156 @@
+import time
+_import_started = time.perf_counter()
+
 from fastapi import FastAPI, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi.responses import PlainTextResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
-from app.db import engine, get_db, Base, test_connection
-from app.dbmodels import System  # Import dbmodels to register them with Base.metadata
-from typing import List
-import os
+_framework_imported = time.perf_counter()
+
+from app.db import (
+    get_engine, get_async_engine, created_engines, on_engine_created, get_async_db, read_your_writes, Base,
+    test_connection
+)
+from app.pooling import pool_statistics
+from app.aggregates import register_aggregate_hooks
+from app.cache import single_flight, coalescing_settings
+from app.changelog import change_log_recorder, inventory_snapshot_scheduler
+from app.changestream import change_broker, change_stream_hub
+from app.purge import purge_jobs
+from app.instrumentation import sql_instrumentation, SQLInstrumentationMiddleware
+from app.settings import AggregateSettings
+from app.startup import startup_settings, startup_timings, check_schema_revision
+
+from app.routers import (
+    SystemRouter, ItemTemplateRouter, InventoryRouter, PartyRouter, PlayerCharacterRouter, BatchRouter, PurgeRouter,
+    CrudRouter, crud_models, crud_prefix
+)
 
-from app.routers import SystemRouter
+# For a per-module breakdown of the imports: python -X importtime -c "import main"
+startup_timings.record("import:framework", _framework_imported - _import_started)
+startup_timings.record("import:app", time.perf_counter() - _framework_imported)
+_app_started = time.perf_counter()
 
 
 # Create tables (only for development)
 # In production, use Alembic migrations
 def create_tables():
     """Create all tables in the database"""
-    Base.metadata.create_all(bind=engine)
+    Base.metadata.create_all(bind=get_engine())
 
 app = FastAPI()
 
+# Keep inventory/party totals up to date from ORM flushes unless the database triggers do it
+if AggregateSettings.from_env().mode == "orm":
+    register_aggregate_hooks()
+
+# Query count, DB time and connection wait per request (Server-Timing header, /metrics)
+if sql_instrumentation.settings.enabled:
+    on_engine_created(sql_instrumentation.instrument)
+    app.add_middleware(SQLInstrumentationMiddleware, instrumentation=sql_instrumentation)
+
 # Health check endpoint
 @app.get("/health")
-async def health_check(db: Session = Depends(get_db)):
+async def health_check(db: AsyncSession = Depends(get_async_db)):
     try:
         # Test database connection
-        db.execute(text("SELECT 1"))
+        await db.execute(text("SELECT 1"))
         return {"status": "healthy", "database": "connected"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
 
+# Connection pool statistics
+@app.get("/health/pool")
+async def pool_stats():
+    # Only the engines this process has created, in production mode that is just the async one
+    return {name: pool_statistics(engine) for name, engine in created_engines().items()}
+
+# Prometheus metrics
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    pools = {name: pool_statistics(engine) for name, engine in created_engines().items()}
+    return PlainTextResponse(sql_instrumentation.metrics.render(pools), media_type="text/plain; version=0.0.4")
+
+# Read replica routing: sessions per target and writes that made a user sticky to the primary
+@app.get("/health/replicas")
+async def replica_stats():
+    return read_your_writes.stats()
+
+# Single-flight reads: how many requests shared another request's query
+@app.get("/health/coalescing")
+async def coalescing_stats():
+    return {"key_scope": coalescing_settings.key_scope, **single_flight.stats()}
+
+# Change log write-behind queue
+@app.get("/health/change-log")
+async def change_log_stats():
+    return {**change_log_recorder.stats(), "snapshots": inventory_snapshot_scheduler.stats()}
+
+# Live change streams of this process
+@app.get("/health/change-stream")
+async def change_stream_stats():
+    return change_stream_hub.stats()
+
+# Background deletes of this process
+@app.get("/health/purge")
+async def purge_stats():
+    return purge_jobs.stats()
+
+# Import and startup phase durations of this process
+@app.get("/health/startup")
+async def startup_stats():
+    return {"mode": startup_settings.mode, **startup_timings.to_dict()}
+
 # Startup event
 @app.on_event("startup")
-def startup():
-    """Create database tables on startup"""
-    # Test connection first
-    if test_connection():
-        print("Creating database tables...")
-        create_tables()
-        print("✅ Database tables created successfully!")
-    else:
-        print("⚠️  Warning: Database connection failed. Tables may not be created.")
-
-app.include_router(SystemRouter.router, prefix="/system", tags=["systems"])
\ No newline at end of file
+async def startup():
+    """Create database tables on startup (dev), check the schema revision instead (production)"""
+    if startup_settings.mode == "production":
+        # One query on the async pool, the sync engine is never created
+        with startup_timings.phase("startup:schema_check"):
+            startup_timings.schema_revision = await check_schema_revision(
+                get_async_engine(), startup_settings.schema_revision
+            )
+        print(f"✅ Database schema is at revision {startup_timings.schema_revision}")
+        return
+
+    with startup_timings.phase("startup:create_tables"):
+        # Test connection first
+        if test_connection():
+            print("Creating database tables...")
+            create_tables()
+            print("✅ Database tables created successfully!")
+        else:
+            print("⚠️  Warning: Database connection failed. Tables may not be created.")
+
+@app.on_event("startup")
+async def start_change_log_recorder():
+    with startup_timings.phase("startup:change_stream"):
+        await change_broker.start(change_stream_hub)
+    with startup_timings.phase("startup:change_log"):
+        await change_log_recorder.start()
+        await inventory_snapshot_scheduler.start()
+    print(f"✅ Started in {startup_timings.summary()}")
+
+# Shutdown event
+@app.on_event("shutdown")
+async def shutdown():
+    """Write the queued change log entries before the process exits"""
+    await purge_jobs.stop()  # Deleting the same rows again resumes them
+    await inventory_snapshot_scheduler.stop()
+    await change_log_recorder.stop()
+    await change_broker.stop()
+
+app.include_router(SystemRouter.router, prefix="/system", tags=["systems"])
+app.include_router(ItemTemplateRouter.router, prefix="/item-template", tags=["item templates"])
+app.include_router(InventoryRouter.router, prefix="/inventory", tags=["inventories"])
+app.include_router(PartyRouter.router, prefix="/party", tags=["parties"])
+app.include_router(PlayerCharacterRouter.router, prefix="/player-character", tags=["player characters"])
+app.include_router(BatchRouter.router, prefix="/batch", tags=["batch"])
+app.include_router(PurgeRouter.router, prefix="/purge", tags=["purge"])
+
+# Generic column-level list/get of every model: /crud/parties/list?fields=id,name, /crud/parties/get/{id}
+for model in crud_models():
+    app.include_router(CrudRouter(model).router, prefix="/crud" + crud_prefix(model), tags=["crud"])
+
+startup_timings.record("app", time.perf_counter() - _app_started)
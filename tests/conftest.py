@@ -0,0 +1,41 @@
+import os
+
+# app.db reads the connection settings at import, nothing connects to them
+for name, value in (("user", "test"), ("password", "test"), ("host", "localhost"), ("port", "5432"), ("dbname", "test")):
+    os.environ.setdefault(name, value)
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.ext.compiler import compiles
+
+from app.db import Base
+from app.replica_routing import RoutingAsyncSession
+
+
+@compiles(JSONB, "sqlite")
+def _jsonb_on_sqlite(type_, compiler, **kw):
+    return "JSON"
+
+
+@pytest.fixture
+def database(tmp_path):
+    """Sessions of the app's class on a fresh SQLite database with enforced foreign keys"""
+    pytest.importorskip("aiosqlite")
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _enable_foreign_keys(connection, record):
+        connection.execute("PRAGMA foreign_keys=ON")
+
+    yield async_sessionmaker(engine, class_=RoutingAsyncSession, expire_on_commit=False, autoflush=False), engine
+
+
+@pytest.fixture
+def aggregate_hooks():
+    """The aggregate flush hooks main registers at startup, for this test only"""
+    from app.aggregates import register_aggregate_hooks, unregister_aggregate_hooks
+    register_aggregate_hooks()
+    yield
+    unregister_aggregate_hooks()
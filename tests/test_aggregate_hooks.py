@@ -0,0 +1,43 @@
+import asyncio
+from decimal import Decimal
+
+from sqlalchemy import select
+
+from app.db import Base
+from app.dbmodels import Inventory, InventoryAggregate, InventoryItem, ItemTemplate, PlayerCharacter, System
+
+
+def test_new_item_of_a_template_changed_in_the_same_flush_is_counted_once(database, aggregate_hooks):
+    session_factory, engine = database
+
+    async def scenario():
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+        async with session_factory() as session:
+            system = System(name="System", description="")
+            session.add(system)
+            await session.flush()
+            player_character = PlayerCharacter(user_id="user", name="Character", system_id=system.id)
+            item_template = ItemTemplate(name="Rope", system_id=system.id, weight=Decimal("1.00"), value=Decimal("2.00"))
+            session.add_all([player_character, item_template])
+            await session.flush()
+            inventory = Inventory(player_character_id=player_character.id)
+            session.add(inventory)
+            await session.commit()
+
+            # One flush: a new item of the template and a new weight/value for the template
+            session.add(InventoryItem(inventory_id=inventory.id, item_template_id=item_template.id, quantity=3))
+            item_template.weight = Decimal("5.00")
+            item_template.value = Decimal("7.00")
+            await session.commit()
+
+            aggregate = await session.scalar(
+                select(InventoryAggregate).where(InventoryAggregate.inventory_id == inventory.id)
+            )
+        await engine.dispose()
+        return aggregate
+
+    aggregate = asyncio.run(scenario())
+    assert aggregate.item_count == 3
+    assert aggregate.total_weight == Decimal("15.00")
+    assert aggregate.total_value == Decimal("21.00")
@@ -0,0 +1,121 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import func, select
+
+from app.cache import InMemoryLRUCache, TemplateCatalogCache
+from app.changelog import ChangeLogRecorder
+from app.db import Base
+from app.dbmodels import ChangeLog, Inventory, InventoryItem, ItemTemplate, PlayerCharacter, System
+from app.dependencies import get_request_scope, service_registry
+from app.routers import BatchRouter
+from app.services.async_batch_service import resolve_references
+from app.settings import ChangeLogSettings
+
+
+def test_resolve_references_in_nested_dicts_and_lists():
+    results = {"0": {"id": "a", "items": [{"id": "b"}]}, "sword": {"id": "c"}}
+    value = {"ids": ["$0.id", "$sword.id", {"item": "$0.items.0.id"}], "plain": "$ not a reference", "number": 3}
+
+    assert resolve_references(value, results) == {
+        "ids": ["a", "c", {"item": "b"}], "plain": "$ not a reference", "number": 3
+    }
+    assert resolve_references("$0", results) == results["0"]
+
+
+@pytest.mark.parametrize("reference, error", [
+    ("$1.id", "no earlier step '1'"),
+    ("$0.name", "has no 'name'"),
+    ("$0.items.1.id", "has no '1'"),
+    ("$0.id.more", "has no 'more'"),
+])
+def test_resolve_references_rejects_unknown_steps_and_paths(reference, error):
+    with pytest.raises(ValueError, match=error):
+        resolve_references({"nested": [reference]}, {"0": {"id": "a", "items": [{"id": "b"}]}})
+
+
+async def _create_inventory(session_factory, engine):
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    async with session_factory() as session:
+        system = System(name="System", description="")
+        session.add(system)
+        await session.flush()
+        player_character = PlayerCharacter(user_id="user", name="Character", system_id=system.id)
+        session.add(player_character)
+        await session.flush()
+        inventory = Inventory(player_character_id=player_character.id)
+        session.add(inventory)
+        await session.commit()
+    return system.id, inventory.id
+
+
+def _operations(system_id, inventory_id, remove):
+    """Create a template, add 2 of it to the inventory by reference and take remove of them out"""
+    return [
+        {"op": "add-item-template", "ref": "lantern", "body": {"name": "Lantern", "system_id": str(system_id)}},
+        {"op": "add-item", "params": {"inventory_id": str(inventory_id)},
+         "body": {"item_template_id": "$lantern.id", "quantity": 2}},
+        {"op": "adjust-quantities", "params": {"inventory_id": str(inventory_id)},
+         "body": [{"item_template_id": "$lantern.id", "quantity_delta": -remove}]},
+        {"op": "add-item", "params": {"inventory_id": "$1.inventory_id"},
+         "body": {"item_template_id": "$0.id", "quantity": 1}},
+    ]
+
+
+def _post_batch(database, remove):
+    """POST /batch through the router, returning the response, what was written and the cache invalidations"""
+    session_factory, engine = database
+    recorder = ChangeLogRecorder(session_factory, ChangeLogSettings(mode="sync"))
+    catalog_cache = TemplateCatalogCache(InMemoryLRUCache())
+
+    async def request_scope():
+        async with session_factory() as session:
+            scope = service_registry.scope(session)
+            scope.provide(ChangeLogRecorder, recorder)
+            scope.provide(TemplateCatalogCache, catalog_cache)
+            yield scope
+
+    app = FastAPI()
+    app.include_router(BatchRouter.router, prefix="/batch")
+    app.dependency_overrides[get_request_scope] = request_scope
+
+    async def scenario():
+        system_id, inventory_id = await _create_inventory(session_factory, engine)
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            response = await client.post("/batch", json={"operations": _operations(system_id, inventory_id, remove)})
+        async with session_factory() as session:
+            written = {
+                model.__tablename__: await session.scalar(select(func.count()).select_from(model))
+                for model in (ItemTemplate, InventoryItem, ChangeLog)
+            }
+        await engine.dispose()
+        return response, written
+
+    response, written = asyncio.run(scenario())
+    return response, written, catalog_cache.invalidations
+
+
+def test_failed_step_rolls_back_the_batch_without_logging_or_invalidating(database):
+    response, written, invalidations = _post_batch(database, remove=5)
+
+    assert response.status_code == 400
+    body = response.json()
+    assert body["committed"] is False
+    assert [result["status"] for result in body["results"]] == ["ok", "ok", "failed", "skipped"]
+    assert "cannot remove 5" in body["results"][2]["error"]
+    assert written == {"item_templates": 0, "inventory_items": 0, "change_logs": 0}
+    assert invalidations == 0
+
+
+def test_batch_commits_once_then_logs_and_invalidates(database):
+    response, written, invalidations = _post_batch(database, remove=1)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["committed"] is True
+    assert body["results"][3]["result"]["quantity"] == 2
+    assert written == {"item_templates": 1, "inventory_items": 1, "change_logs": 3}
+    assert invalidations == 1
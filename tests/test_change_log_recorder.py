@@ -0,0 +1,57 @@
+import asyncio
+import uuid
+
+from sqlalchemy import select
+
+from app.changelog import ChangeLogRecorder
+from app.db import Base
+from app.dbmodels import ChangeLog, Inventory, PlayerCharacter, System
+from app.repositories import AsyncPurgeRepository, build_purge_plan
+from app.settings import ChangeLogSettings
+
+
+async def _create_characters(session_factory, engine):
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    async with session_factory() as session:
+        system = System(name="System", description="")
+        session.add(system)
+        await session.flush()
+        inventories = []
+        for name in ("purged", "kept"):
+            player_character = PlayerCharacter(user_id="user", name=name, system_id=system.id)
+            session.add(player_character)
+            await session.flush()
+            inventory = Inventory(player_character_id=player_character.id)
+            session.add(inventory)
+            await session.flush()
+            inventories.append((player_character.id, inventory.id))
+        await session.commit()
+    return inventories
+
+
+def test_queued_entries_of_a_purged_inventory_do_not_fail_the_batch(database):
+    session_factory, engine = database
+
+    async def scenario():
+        (purged_character_id, purged_inventory_id), (_, kept_inventory_id) = await _create_characters(session_factory, engine)
+        recorder = ChangeLogRecorder(session_factory, ChangeLogSettings(mode="write_behind", flush_interval=60.0))
+        await recorder.start()
+        await recorder.record("user", "UPDATE_ITEM", inventory_id=purged_inventory_id, inventory_item_id=uuid.uuid4())
+        await recorder.record("user", "UPDATE_ITEM", inventory_id=kept_inventory_id, inventory_item_id=uuid.uuid4())
+
+        # The purge commits while both entries are still queued
+        async with session_factory() as session:
+            await AsyncPurgeRepository(session).delete_now(build_purge_plan("player-character", purged_character_id))
+        await recorder.stop()
+
+        async with session_factory() as session:
+            written = list(await session.scalars(select(ChangeLog)))
+        await engine.dispose()
+        return recorder.stats(), written, kept_inventory_id
+
+    stats, written, kept_inventory_id = asyncio.run(scenario())
+    assert stats["failed"] == 0
+    assert stats["orphaned"] == 1
+    assert stats["written"] == 1
+    assert [(entry.inventory_id, entry.inventory_item_id) for entry in written] == [(kept_inventory_id, None)]
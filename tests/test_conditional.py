@@ -0,0 +1,23 @@
+from datetime import datetime, timezone
+
+from starlette.requests import Request
+
+from app.repositories.versioning import ResourceVersion
+from app.routers.conditional import not_modified
+
+
+def _request(if_modified_since: str) -> Request:
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "path": "/system/list-systems",
+        "query_string": b"",
+        "headers": [(b"if-modified-since", if_modified_since.encode())],
+    })
+
+
+def test_if_modified_since_in_the_unknown_zone_is_read_as_utc():
+    version = ResourceVersion(updated_at=datetime(2015, 10, 21, 7, 28, tzinfo=timezone.utc), rows=1)
+
+    assert not_modified(_request("Wed, 21 Oct 2015 07:28:00 -0000"), version).status_code == 304
+    assert not_modified(_request("Wed, 21 Oct 2015 07:27:59 -0000"), version) is None
@@ -0,0 +1,109 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import httpx
+from fastapi import FastAPI
+
+from app.cache import InMemoryLRUCache, TemplateCatalogCache
+from app.changelog.inventory_snapshots import fold_deltas, take_horizon_snapshots, take_inventory_snapshots
+from app.db import Base
+from app.dbmodels import ChangeLog, Inventory, ItemTemplate, PlayerCharacter, System
+from app.dependencies import get_request_scope, service_registry
+from app.routers import InventoryRouter
+
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _at(hours: float) -> datetime:
+    return START + timedelta(hours=hours)
+
+
+def test_fold_deltas_applies_them_in_order_and_drops_emptied_items():
+    rope, torch = uuid.uuid4(), uuid.uuid4()
+
+    assert fold_deltas({str(rope): 2}, [(rope, -2), (torch, 3), (torch, -1)]) == {str(torch): 2}
+    assert fold_deltas({str(rope): 2}, []) == {str(rope): 2}
+
+
+async def _create_history(session_factory, engine):
+    """An inventory that got 3 ropes at 1h, gave 1 away at 2h and got 5 more at 4h"""
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    async with session_factory() as session:
+        system = System(name="System", description="")
+        session.add(system)
+        await session.flush()
+        player_character = PlayerCharacter(user_id="user", name="Character", system_id=system.id)
+        rope = ItemTemplate(name="Rope", system_id=system.id)
+        session.add_all([player_character, rope])
+        await session.flush()
+        inventory = Inventory(player_character_id=player_character.id)
+        session.add(inventory)
+        await session.flush()
+        session.add_all([
+            ChangeLog(user_id="user", action="UPDATE_ITEM", inventory_id=inventory.id, item_template_id=rope.id,
+                      quantity_delta=quantity_delta, created_at=_at(hours))
+            for hours, quantity_delta in ((1, 3), (2, -1), (4, 5))
+        ])
+        await session.commit()
+    return inventory.id, rope.id
+
+
+def _get_as_of(database, take_snapshots, *at):
+    """Take snapshots with take_snapshots(connection), then GET /inventory/{id}/as-of at each moment"""
+    session_factory, engine = database
+
+    async def request_scope():
+        async with session_factory() as session:
+            scope = service_registry.scope(session)
+            scope.provide(TemplateCatalogCache, TemplateCatalogCache(InMemoryLRUCache()))
+            yield scope
+
+    app = FastAPI()
+    app.include_router(InventoryRouter.router, prefix="/inventory")
+    app.dependency_overrides[get_request_scope] = request_scope
+
+    async def scenario():
+        inventory_id, rope_id = await _create_history(session_factory, engine)
+        async with session_factory() as session:
+            await session.run_sync(lambda sync_session: take_snapshots(sync_session.connection()))
+            await session.commit()
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            responses = [
+                await client.get(f"/inventory/{inventory_id}/as-of", params={"at": moment.isoformat()})
+                for moment in at
+            ]
+        await engine.dispose()
+        return responses, str(rope_id)
+
+    return asyncio.run(scenario())
+
+
+def test_as_of_replays_the_deltas_after_the_nearest_snapshot(database):
+    (before, after), rope_id = _get_as_of(
+        database, lambda connection: take_inventory_snapshots(connection, _at(3), 0, "compaction"), _at(1.5), _at(5)
+    )
+
+    # Before the snapshot: replayed from the creation of the inventory
+    assert before.status_code == 200
+    assert before.json()["snapshot_taken_at"] is None
+    assert before.json()["replayed_changes"] == 1
+    assert [(item["item_template_id"], item["quantity"]) for item in before.json()["items"]] == [(rope_id, 3)]
+
+    # After it: the snapshot (3 - 1 ropes) plus the one delta logged since
+    assert after.status_code == 200
+    assert datetime.fromisoformat(after.json()["snapshot_taken_at"]).replace(tzinfo=timezone.utc) == _at(3)
+    assert after.json()["replayed_changes"] == 1
+    assert [(item["item_template_id"], item["quantity"]) for item in after.json()["items"]] == [(rope_id, 7)]
+
+
+def test_as_of_before_a_horizon_is_rejected(database):
+    (before, after), rope_id = _get_as_of(
+        database, lambda connection: take_horizon_snapshots(connection, _at(3)), _at(2), _at(3)
+    )
+
+    assert before.status_code == 400
+    assert "is not available" in before.json()["detail"]
+    assert after.status_code == 200
+    assert [(item["item_template_id"], item["quantity"]) for item in after.json()["items"]] == [(rope_id, 2)]
@@ -0,0 +1,105 @@
+import asyncio
+
+import pytest
+from sqlalchemy import insert, select
+
+from app.db import Base
+from app.dbmodels import Inventory, InventoryItem, ItemTemplate, PlayerCharacter, System
+from app.repositories import AsyncInventoryItemRepository
+
+
+async def _create_inventories(session_factory, engine):
+    """Two inventories and two item templates, the first inventory holding 2 of the first template"""
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    async with session_factory() as session:
+        system = System(name="System", description="")
+        session.add(system)
+        await session.flush()
+        player_character = PlayerCharacter(user_id="user", name="Character", system_id=system.id)
+        templates = [ItemTemplate(name=name, system_id=system.id) for name in ("Rope", "Torch")]
+        session.add_all([player_character, *templates])
+        await session.flush()
+        inventories = [Inventory(player_character_id=player_character.id) for _ in range(2)]
+        session.add_all(inventories)
+        await session.flush()
+        session.add(InventoryItem(inventory_id=inventories[0].id, item_template_id=templates[0].id, quantity=2))
+        await session.commit()
+    return [inventory.id for inventory in inventories], [template.id for template in templates]
+
+
+async def _quantities(session_factory):
+    async with session_factory() as session:
+        rows = await session.execute(
+            select(InventoryItem.inventory_id, InventoryItem.item_template_id, InventoryItem.quantity)
+        )
+        return {(inventory_id, item_template_id): quantity for inventory_id, item_template_id, quantity in rows}
+
+
+def _run(database, scenario):
+    session_factory, engine = database
+
+    async def run():
+        try:
+            inventory_ids, template_ids = await _create_inventories(session_factory, engine)
+            return await scenario(session_factory, inventory_ids, template_ids)
+        finally:
+            await engine.dispose()
+    return asyncio.run(run())
+
+
+def test_adding_to_an_existing_item_increases_its_quantity(database):
+    async def scenario(session_factory, inventory_ids, template_ids):
+        async with session_factory() as session:
+            [row] = await AsyncInventoryItemRepository(session).apply_quantity_deltas({(inventory_ids[0], template_ids[0]): 3})
+        return row, await _quantities(session_factory), inventory_ids, template_ids
+
+    row, quantities, inventory_ids, template_ids = _run(database, scenario)
+    assert row.quantity == 5
+    assert quantities == {(inventory_ids[0], template_ids[0]): 5}
+
+
+def test_overdraw_raises_and_writes_nothing(database):
+    async def scenario(session_factory, inventory_ids, template_ids):
+        async with session_factory() as session:
+            with pytest.raises(ValueError, match="cannot remove 3"):
+                await AsyncInventoryItemRepository(session).apply_quantity_deltas({
+                    (inventory_ids[0], template_ids[1]): 4,
+                    (inventory_ids[0], template_ids[0]): -3,
+                })
+        return await _quantities(session_factory), inventory_ids, template_ids
+
+    quantities, inventory_ids, template_ids = _run(database, scenario)
+    assert quantities == {(inventory_ids[0], template_ids[0]): 2}
+
+
+def test_transfer_that_empties_the_source_deletes_its_item(database):
+    async def scenario(session_factory, inventory_ids, template_ids):
+        async with session_factory() as session:
+            rows = await AsyncInventoryItemRepository(session).apply_quantity_deltas({
+                (inventory_ids[0], template_ids[0]): -2,
+                (inventory_ids[1], template_ids[0]): 2,
+            })
+        return rows, await _quantities(session_factory), inventory_ids, template_ids
+
+    rows, quantities, inventory_ids, template_ids = _run(database, scenario)
+    returned = {(row.inventory_id, row.item_template_id): row.quantity for row in rows}
+    assert returned == {(inventory_ids[0], template_ids[0]): 0, (inventory_ids[1], template_ids[0]): 2}
+    assert quantities == {(inventory_ids[1], template_ids[0]): 2}
+
+
+def test_legacy_item_with_a_null_quantity_counts_as_empty(database):
+    async def scenario(session_factory, inventory_ids, template_ids):
+        async with session_factory() as session:
+            await session.execute(insert(InventoryItem).values(
+                inventory_id=inventory_ids[1], item_template_id=template_ids[1], quantity=None
+            ))
+            await session.commit()
+            repository = AsyncInventoryItemRepository(session)
+            with pytest.raises(ValueError, match="has 0 of item template"):
+                await repository.apply_quantity_deltas({(inventory_ids[1], template_ids[1]): -1})
+            await repository.apply_quantity_deltas({(inventory_ids[1], template_ids[1]): 2})
+        return await _quantities(session_factory), inventory_ids, template_ids
+
+    quantities, inventory_ids, template_ids = _run(database, scenario)
+    assert quantities[(inventory_ids[1], template_ids[1])] == 2
@@ -0,0 +1,60 @@
+import asyncio
+
+from sqlalchemy import insert, select
+
+from app.cache import InMemoryLRUCache, TemplateCatalogCache
+from app.changelog import ChangeLogRecorder
+from app.db import Base
+from app.dbmodels import ChangeLog, Inventory, InventoryItem, ItemTemplate, PlayerCharacter, System
+from app.dependencies import service_registry
+from app.services import AsyncInventoryService
+from app.settings import ChangeLogSettings
+
+
+async def _create_inventory(session_factory, engine):
+    """An empty inventory and an item template of its system"""
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    async with session_factory() as session:
+        system = System(name="System", description="")
+        session.add(system)
+        await session.flush()
+        player_character = PlayerCharacter(user_id="user", name="Character", system_id=system.id)
+        item_template = ItemTemplate(name="Rope", system_id=system.id)
+        session.add_all([player_character, item_template])
+        await session.flush()
+        inventory = Inventory(player_character_id=player_character.id)
+        session.add(inventory)
+        await session.commit()
+    return inventory.id, item_template.id
+
+
+def _inventory_service(session, session_factory) -> AsyncInventoryService:
+    """The service as the registry builds it, recording synchronously and caching in memory"""
+    scope = service_registry.scope(session)
+    scope.provide(ChangeLogRecorder, ChangeLogRecorder(session_factory, ChangeLogSettings(mode="sync")))
+    scope.provide(TemplateCatalogCache, TemplateCatalogCache(InMemoryLRUCache()))
+    return scope.get(AsyncInventoryService)
+
+
+def test_removing_a_legacy_item_with_a_null_quantity_logs_a_zero_delta(database):
+    session_factory, engine = database
+
+    async def scenario():
+        inventory_id, item_template_id = await _create_inventory(session_factory, engine)
+        async with session_factory() as session:
+            inventory_item_id = await session.scalar(
+                insert(InventoryItem)
+                .values(inventory_id=inventory_id, item_template_id=item_template_id, quantity=None)
+                .returning(InventoryItem.id)
+            )
+            await session.commit()
+            removed = await _inventory_service(session, session_factory).remove_item(inventory_item_id, "user")
+        async with session_factory() as session:
+            entries = list(await session.scalars(select(ChangeLog)))
+        await engine.dispose()
+        return removed, entries
+
+    removed, entries = asyncio.run(scenario())
+    assert removed
+    assert [(entry.action, entry.quantity_delta) for entry in entries] == [("REMOVE_ITEM", 0)]
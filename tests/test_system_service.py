@@ -0,0 +1,58 @@
+import asyncio
+import uuid
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app.db import Base
+from app.dbmodels import ItemTemplate, System
+from app.repositories import AsyncBaseRepository, AsyncSystemRepository
+from app.services import AsyncSystemService
+
+
+async def _create_schema(engine):
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+
+
+def test_add_systems_skips_taken_and_repeated_names(database):
+    session_factory, engine = database
+
+    async def scenario():
+        await _create_schema(engine)
+        async with session_factory() as session:
+            session.add(System(name="Taken", description=""))
+            await session.commit()
+        async with session_factory() as session:
+            response = await AsyncSystemService(AsyncSystemRepository(session)).add_systems([
+                {"name": "Taken", "description": ""},
+                {"name": "New", "description": "first"},
+                {"name": "New", "description": "repeated"},
+                {"description": "no name"},
+                {"name": "Other", "description": ""},
+            ])
+        await engine.dispose()
+        return response
+
+    response = asyncio.run(scenario())
+    assert [(system.name, system.description) for system in response.created] == [("New", "first"), ("Other", "")]
+    assert [error.index for error in response.errors] == [0, 2, 3]
+    assert response.errors[0].errors == ["System 'Taken' already exists"]
+    assert response.errors[1].errors == ["System 'New' already exists"]
+
+
+def test_create_many_skipping_conflicts_raises_other_integrity_errors(database):
+    session_factory, engine = database
+
+    async def scenario():
+        await _create_schema(engine)
+        async with session_factory() as session:
+            await AsyncBaseRepository(ItemTemplate, session).create_many_skipping_conflicts(
+                [{"name": "Rope", "system_id": uuid.uuid4()}], ["id"]
+            )
+
+    try:
+        with pytest.raises(IntegrityError):
+            asyncio.run(scenario())
+    finally:
+        asyncio.run(engine.dispose())
@@ -0,0 +1,27 @@
+import asyncio
+import uuid
+from datetime import datetime, timezone
+
+from app.cache import InMemoryLRUCache, TemplateCatalogCache
+
+
+def test_invalidation_during_a_version_load_is_not_overwritten():
+    cache = TemplateCatalogCache(InMemoryLRUCache())
+    system_id = uuid.uuid4()
+    before = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    after = datetime(2026, 1, 2, tzinfo=timezone.utc)
+
+    async def scenario():
+        async def load_version_racing_a_write():
+            # A template write commits and invalidates while the old max(updated_at) is in flight
+            await cache.invalidate(system_id, after)
+            return before
+
+        async def load_catalog():
+            return []
+
+        await cache.get_catalog(system_id, None, load_version_racing_a_write, load_catalog)
+        return await cache.backend.get(f"item-templates:version:{system_id}")
+
+    marker = asyncio.run(scenario())
+    assert marker.startswith(after.isoformat())